@@ -7,6 +7,7 @@ sys.path.insert(0, str(project_root))
 
 from src.agents.orchestrator import Orchestrator
 from src.models.user_input import UserProfile, MonthlySpending
+from src.utils.log import configure_logging
 
 def get_float_input(prompt, default=0):
     """Get float input with default value"""
@@ -34,11 +35,15 @@ def get_choice_input(prompt, choices):
             print("Please enter a valid number.")
 
 def main():
+    configure_logging()
     print("\n" + "=" * 60)
     print("Welcome to CardIQ!")
     print("AI-Powered Credit Card Recommendation System")
     print("=" * 60 + "\n")
     
+    # Start loading retrieval resources in the background while the user types
+    orchestrator = Orchestrator(warm_up=True)
+    
     print("Let's understand your monthly spending habits.\n")
     
     # Get spending inputs
@@ -68,11 +73,8 @@ def main():
     max_fee_input = input("Maximum annual fee you're willing to pay (e.g., 100, 500): ").strip()
     max_annual_fee = int(max_fee_input) if max_fee_input else None
 
-    # Get available rewards types from the card database
-    from src.data.card_loader import CardLoader
-    loader = CardLoader()
-    all_cards = loader.load_cards()
-    available_types = sorted(set(card['rewards_type'] for card in all_cards))
+    # Get available rewards types from the shared card catalog
+    available_types = list(orchestrator.catalog.rewards_types)
 
     print(f"Preferred rewards type (options: {', '.join(available_types)})")
     rewards_type_input = input("  Enter your choice (or press Enter to skip): ").strip()
@@ -131,11 +133,13 @@ def main():
     
     # Get recommendations
     print("\nGenerating personalized recommendations...\n")
-    orchestrator = Orchestrator()
     
     try:
-        result = orchestrator.get_quick_recommendation(user_profile)
-        print(result)
+        # Ranked cards print right away; each narrative prints as it's ready
+        result = orchestrator.get_quick_recommendation(
+            user_profile,
+            on_text=lambda text: print(text, end="", flush=True)
+        )
         
         # Save to file
         output_path = Path("outputs/recommendations/recommendation.txt")
@@ -8,10 +8,14 @@ sys.path.insert(0, str(project_root))
 
 from src.agents.orchestrator import Orchestrator
 from src.models.user_input import UserProfile, MonthlySpending
+from src.utils.log import configure_logging
 
 def main():
     """Run CardIQ recommendation system"""
     
+    # Pipeline progress is logged at INFO (LOG_LEVEL=WARNING hides it)
+    configure_logging()
+    
     print("\n" + "=" * 60)
     print("Welcome to CardIQ!")
     print("AI-Powered Credit Card Recommendation System")
@@ -41,13 +45,16 @@ def main():
     print(f"  • Other: ${user_profile.monthly_spending.other}")
     print(f"  • Credit Score: {user_profile.credit_score}")
     
-    # Initialize orchestrator
-    orchestrator = Orchestrator()
+    # Initialize orchestrator (retrieval warms up while the spending analysis runs)
+    orchestrator = Orchestrator(warm_up=True)
     
     # Get recommendations
     try:
-        result = orchestrator.get_quick_recommendation(user_profile)
-        print(result)
+        # Ranked cards print right away; each narrative prints as it's ready
+        result = orchestrator.get_quick_recommendation(
+            user_profile,
+            on_text=lambda text: print(text, end="", flush=True)
+        )
         
         # Optionally save to file
         output_path = Path("outputs/recommendations/recommendation.txt")
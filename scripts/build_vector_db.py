@@ -1,4 +1,6 @@
 """Build FAISS vector database from card JSON"""
+import argparse
+import json
 import sys
 from pathlib import Path
 
@@ -7,63 +9,100 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from src.data.card_loader import CardLoader
-from src.data.text_chunker import CardTextChunker
-from src.rag.embeddings import EmbeddingGenerator
+from src.rag.index_builder import VectorDBBuilder
 from src.rag.vector_store import VectorStore
-from src.config import CARDS_JSON_PATH, VECTOR_DB_PATH
+from src.utils.log import configure_logging
+from src.config import (
+    CARDS_JSON_PATH,
+    VECTOR_DB_PATH,
+    VECTOR_DB_BUILD_WORKERS,
+    VECTOR_DB_BUILD_BATCH_SIZE
+)
 
-def build_vector_db():
+STAGE_LABELS = {
+    "chunking": "Read + chunk",
+    "embedding": "Embed",
+    "indexing": "FAISS",
+    "metadata": "Metadata",
+    "lexical": "BM25"
+}
+
+def build_vector_db(
+    cards_path: Path = CARDS_JSON_PATH,
+    output_path: Path = VECTOR_DB_PATH,
+    workers: int = VECTOR_DB_BUILD_WORKERS,
+    batch_size: int = VECTOR_DB_BUILD_BATCH_SIZE,
+    run_test_query: bool = True
+) -> dict:
     """Build and save vector database"""
     print("=" * 60)
     print("Building CardIQ Vector Database")
     print("=" * 60)
-    
-    # Step 1: Load cards
-    print("\n[1/4] Loading credit cards...")
-    loader = CardLoader(CARDS_JSON_PATH)
-    cards = loader.load_cards()
-    print(f"✅ Loaded {len(cards)} cards")
-    
-    # Step 2: Create text chunks
-    print("\n[2/4] Creating text chunks...")
-    chunker = CardTextChunker()
-    chunks = chunker.create_chunks(cards)
-    print(f"✅ Created {len(chunks)} text chunks")
-    
-    # Print sample chunk
-    print("\n📝 Sample chunk:")
-    print(f"Card: {chunks[0]['card_name']}")
-    print(f"Text: {chunks[0]['text'][:200]}...")
-    
-    # Step 3: Generate embeddings
-    print("\n[3/4] Generating embeddings...")
-    embedder = EmbeddingGenerator()
-    embeddings = embedder.embed_chunks(chunks)
-    print(f"✅ Generated embeddings with shape {embeddings.shape}")
-    
-    # Step 4: Build and save FAISS index
-    print("\n[4/4] Building FAISS index...")
-    vector_store = VectorStore()
-    vector_store.build_index(embeddings, chunks)
-    vector_store.save(VECTOR_DB_PATH)
-    
+    print(f"Cards:  {cards_path}")
+    print(f"Output: {output_path}")
+    print(f"Embedding workers: {workers}, batch size: {batch_size}")
+
+    # Cards stream through chunking -> embedding (worker pool) -> FAISS, metadata and BM25
+    print("\n🔨 Streaming cards through chunking, embedding and indexing...")
+    builder = VectorDBBuilder(output_path, workers=workers, batch_size=batch_size)
+    stats = builder.build(CardLoader(cards_path).iter_cards())
+
+    print(f"\n✅ Indexed {stats['num_chunks']:,} chunks (dimension {stats['dimension']}) "
+          f"in {stats['seconds']:.1f}s ({stats['chunks_per_second']:,.0f} chunks/s)")
+    print(f"\n📊 Stage throughput ({stats['workers']} embedding workers; embed time is summed across workers):")
+    for stage, stage_stats in stats["stages"].items():
+        print(f"  {STAGE_LABELS[stage]:<14} {stage_stats['seconds']:>9.2f}s  "
+              f"{stage_stats['items_per_second']:>12,.0f} chunks/s")
+
     print("\n" + "=" * 60)
-    print(f"✅ Vector database successfully saved to {VECTOR_DB_PATH}")
+    print(f"✅ Vector database successfully saved to {output_path}")
     print("=" * 60)
-    
-    # Test the index
-    print("\n🧪 Testing vector search...")
-    test_query = "cards with airport lounge access"
-    print(f"Query: '{test_query}'")
-    
-    query_embedding = embedder.embed_text(test_query)
-    results = vector_store.search(query_embedding, k=3)
-    
-    print(f"\nTop 3 results:")
-    for i, (chunk, distance) in enumerate(results, 1):
-        print(f"  {i}. {chunk['card_name']} (distance: {distance:.4f})")
-    
+
+    if run_test_query:
+        # Test the index
+        print("\n🧪 Testing vector search...")
+        test_query = "cards with airport lounge access"
+        print(f"Query: '{test_query}'")
+
+        vector_store = VectorStore()
+        vector_store.load(output_path)
+        query_embedding = builder.embedder.embed_text(test_query)
+        results = vector_store.search(query_embedding, k=3)
+
+        print(f"\nTop 3 results:")
+        for i, (chunk, distance) in enumerate(results, 1):
+            print(f"  {i}. {chunk['card_name']} (distance: {distance:.4f})")
+
     print("\n✅ All done! Vector database is ready to use.")
+    return stats
+
+def main():
+    """Parse arguments and build the vector database"""
+    parser = argparse.ArgumentParser(description="Build the CardIQ FAISS + BM25 vector database")
+    parser.add_argument("--cards", type=Path, default=CARDS_JSON_PATH, help="Card file (.json, .jsonl or .ndjson)")
+    parser.add_argument("-o", "--output", type=Path, default=VECTOR_DB_PATH, help="Vector DB directory")
+    parser.add_argument("--workers", type=int, default=VECTOR_DB_BUILD_WORKERS,
+                        help="Embedding worker processes (0 = embed in this process)")
+    parser.add_argument("--batch-size", type=int, default=VECTOR_DB_BUILD_BATCH_SIZE, help="Chunks per embedding batch")
+    parser.add_argument("--stats-json", type=Path, help="Also write build stats to this JSON file")
+    parser.add_argument("--no-test-query", action="store_true", help="Skip the test search after building")
+    args = parser.parse_args()
+
+    if not args.cards.exists():
+        print(f"❌ Card file not found: {args.cards}")
+        return 1
+    try:
+        stats = build_vector_db(args.cards, args.output, args.workers, args.batch_size,
+                                run_test_query=not args.no_test_query)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+
+    if args.stats_json:
+        args.stats_json.write_text(json.dumps(stats, indent=2))
+        print(f"📝 Build stats written to {args.stats_json}")
+    return 0
 
 if __name__ == "__main__":
-    build_vector_db()
+    configure_logging()
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""Check retrieval parity and encode throughput of the torch and ONNX embedding backends"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+from src.data.card_loader import CardLoader
+from src.data.text_chunker import CardTextChunker
+from src.rag.embeddings import EmbeddingGenerator
+from src.rag.vector_store import VectorStore
+from src.utils.log import configure_logging
+from src.config import EMBEDDING_ONNX_PATH
+
+DEFAULT_QUERIES = [
+    "no foreign transaction fee",
+    "Priority Pass lounge access",
+    "best card for dining rewards",
+    "cash back on groceries",
+    "no annual fee card",
+    "hotel points and elite status",
+    "airline miles and free checked bags",
+    "gas station rewards",
+    "streaming services cash back",
+    "business card flat rate rewards",
+    "travel insurance and rental car coverage",
+    "rotating quarterly categories",
+]
+
+def top_k_ids(store: VectorStore, embeddings: np.ndarray, k: int):
+    return [[chunk['card_id'] for chunk, _ in results] for results in store.search_many(embeddings, k=k)]
+
+def measure_throughput(embedder: EmbeddingGenerator, texts, repeats: int) -> float:
+    """Return encoded texts per second"""
+    embedder.embed_queries(texts[:8])  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeats):
+        embedder.embed_queries(texts)
+    return (len(texts) * repeats) / (time.perf_counter() - start)
+
+def parity(reference, candidate, k: int):
+    """Mean top-k overlap and share of queries with an identical ranking"""
+    overlaps = [len(set(r) & set(c)) / k for r, c in zip(reference, candidate)]
+    exact = [r == c for r, c in zip(reference, candidate)]
+    return float(np.mean(overlaps)), float(np.mean(exact))
+
+def check_backends(onnx_path: Path, k: int, repeats: int, min_overlap: float) -> int:
+    print("=" * 60)
+    print("Embedding Backend Parity Check")
+    print("=" * 60)
+
+    cards = CardLoader().load_cards()
+    chunks = CardTextChunker().create_chunks(cards)
+    texts = [chunk['text'] for chunk in chunks]
+    k = min(k, len(chunks))
+
+    float_embedder = EmbeddingGenerator(backend="torch")
+    onnx_embedder = EmbeddingGenerator(backend="onnx", onnx_path=onnx_path)
+
+    # Index built with each backend's chunk embeddings
+    float_store = VectorStore()
+    float_store.build_index(float_embedder.embed_queries(texts), chunks)
+    onnx_store = VectorStore()
+    onnx_store.build_index(onnx_embedder.embed_queries(texts), chunks)
+
+    float_queries = float_embedder.embed_queries(DEFAULT_QUERIES)
+    onnx_queries = onnx_embedder.embed_queries(DEFAULT_QUERIES)
+
+    reference = top_k_ids(float_store, float_queries, k)
+    onnx_on_float_index = top_k_ids(float_store, onnx_queries, k)
+    onnx_on_onnx_index = top_k_ids(onnx_store, onnx_queries, k)
+
+    overlap_a, exact_a = parity(reference, onnx_on_float_index, k)
+    overlap_b, exact_b = parity(reference, onnx_on_onnx_index, k)
+
+    print(f"\nParity vs float model over {len(DEFAULT_QUERIES)} queries (top-{k}):")
+    print(f"  • ONNX queries, float index: overlap {overlap_a:.1%}, identical ranking {exact_a:.1%}")
+    print(f"  • ONNX queries, ONNX index:  overlap {overlap_b:.1%}, identical ranking {exact_b:.1%}")
+
+    print(f"\nEncode throughput ({len(texts)} chunks x {repeats}):")
+    for name, embedder in (("torch float32", float_embedder), ("onnx int8", onnx_embedder)):
+        print(f"  • {name}: {measure_throughput(embedder, texts, repeats):,.1f} texts/s")
+
+    if min(overlap_a, overlap_b) < min_overlap:
+        print(f"\n❌ Top-{k} overlap below {min_overlap:.0%}")
+        return 1
+    print(f"\n✅ ONNX backend matches the float model (overlap >= {min_overlap:.0%})")
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--onnx-path", type=Path, default=EMBEDDING_ONNX_PATH)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--min-overlap", type=float, default=0.9)
+    args = parser.parse_args()
+    configure_logging()
+    sys.exit(check_backends(args.onnx_path, args.k, args.repeats, args.min_overlap))
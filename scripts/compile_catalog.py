@@ -0,0 +1,52 @@
+"""Validate the card JSON once and compile it to the binary catalog format"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.data.card_loader import CardLoader
+from src.data.compiled_catalog import compile_catalog, CompiledCardCatalog
+from src.config import CARDS_JSON_PATH, COMPILED_CATALOG_PATH, CATALOG_COMPILE_CHUNK_SIZE
+
+def main():
+    """Compile and save the catalog"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--input", type=Path, default=CARDS_JSON_PATH,
+                        help="Card JSON array or NDJSON (.ndjson/.jsonl) feed")
+    parser.add_argument("--output", type=Path, default=COMPILED_CATALOG_PATH)
+    parser.add_argument("--chunk-size", type=int, default=CATALOG_COMPILE_CHUNK_SIZE,
+                        help="Cards validated and written at a time")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Compiling CardIQ Card Catalog")
+    print("=" * 60)
+
+    # Cards are streamed from the file, validated and written chunk by chunk
+    print(f"\nStreaming, validating against CreditCard and compiling {args.input}...")
+    start = time.perf_counter()
+    try:
+        compile_catalog(
+            CardLoader(args.input).iter_cards(),
+            args.output,
+            source_path=args.input,
+            chunk_size=args.chunk_size
+        )
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    print(f"✅ Compiled catalog saved to {args.output} ({time.perf_counter() - start:.1f} s)")
+
+    # Check load time of the artifact
+    start = time.perf_counter()
+    catalog = CompiledCardCatalog(args.output)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"\n🧪 Compiled catalog with {len(catalog):,} cards loads in {elapsed:.1f} ms")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""Export the embedding model to ONNX and quantize it to int8 for CPU inference"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.config import EMBEDDING_MODEL, EMBEDDING_ONNX_PATH
+from src.rag.onnx_embedder import ONNX_MODEL_FILE, CONFIG_FILE
+
+FLOAT_MODEL_FILE = "model_fp32.onnx"
+
+def export_onnx_embedder(model_name: str, output_dir: Path):
+    """Export the SentenceTransformer's transformer to ONNX and quantize it"""
+    import torch
+    from sentence_transformers import SentenceTransformer
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+
+    print("=" * 60)
+    print("Exporting Embedding Model to ONNX (int8)")
+    print("=" * 60)
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    # Step 1: Load the float model
+    print(f"\n[1/3] Loading {model_name}...")
+    st_model = SentenceTransformer(model_name, device="cpu")
+    transformer = st_model[0].auto_model
+    tokenizer = st_model.tokenizer
+    transformer.eval()
+
+    # Pooling/normalization are reproduced in NumPy by OnnxSentenceEncoder
+    module_names = [type(module).__name__ for module in st_model]
+    config = {
+        "source_model": model_name,
+        "dimension": st_model.get_sentence_embedding_dimension(),
+        "max_seq_length": st_model.max_seq_length,
+        "pooling": "mean",
+        "normalize": "Normalize" in module_names
+    }
+
+    # Step 2: Export the transformer with dynamic batch and sequence axes
+    print("\n[2/3] Exporting to ONNX...")
+    sample = tokenizer(["example sentence"], return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+    float_path = output_dir / FLOAT_MODEL_FILE
+    with torch.no_grad():
+        torch.onnx.export(
+            transformer,
+            tuple(sample[name] for name in input_names),
+            str(float_path),
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=14
+        )
+    print(f"✅ Float model exported to {float_path}")
+
+    # Step 3: Dynamic int8 quantization of the weights
+    print("\n[3/3] Quantizing to int8...")
+    int8_path = output_dir / ONNX_MODEL_FILE
+    quantize_dynamic(str(float_path), str(int8_path), weight_type=QuantType.QInt8)
+    float_path.unlink()
+
+    tokenizer.save_pretrained(str(output_dir))
+    with open(output_dir / CONFIG_FILE, 'w', encoding='utf-8') as f:
+        json.dump(config, f, indent=2)
+
+    print(f"✅ Quantized model saved to {int8_path}")
+    print("\nSet EMBEDDING_BACKEND=onnx to use it, and run "
+          "scripts/check_embedding_backends.py to verify retrieval parity.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model", default=EMBEDDING_MODEL, help="SentenceTransformer model to export")
+    parser.add_argument("--output", type=Path, default=EMBEDDING_ONNX_PATH, help="Output directory")
+    args = parser.parse_args()
+    export_onnx_embedder(args.model, args.output)
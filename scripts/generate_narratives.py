@@ -0,0 +1,68 @@
+"""Pre-generate card narratives for every card x spending archetype"""
+import argparse
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.agents.narrative_store import NarrativeStore
+from src.batch.narratives import NarrativeJob, GENERATION_MODES
+from src.utils.log import configure_logging
+from src.config import NARRATIVE_STORE_PATH, NARRATIVE_REQUESTS_PER_MINUTE
+
+def main():
+    """Parse arguments and run the generation job"""
+    parser = argparse.ArgumentParser(description="Pre-generate CardIQ narratives per card and spending archetype")
+    parser.add_argument("--store", type=Path, default=NARRATIVE_STORE_PATH, help="Narrative store (SQLite file)")
+    parser.add_argument("--mode", choices=GENERATION_MODES, default="auto",
+                        help="Message Batches API, direct rate-limited calls, or batches when available")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent requests in direct mode")
+    parser.add_argument("--rpm", type=float, default=NARRATIVE_REQUESTS_PER_MINUTE,
+                        help="Requests (or batch submissions) per minute")
+    parser.add_argument("--top-k", type=int, help="Only each archetype's top K cards (default: every card)")
+    parser.add_argument("--cards", help="Comma-separated card_ids to generate for (default: all)")
+    parser.add_argument("--no-wait", action="store_true",
+                        help="Submit batches and exit; run again later to collect results")
+    parser.add_argument("--dry-run", action="store_true", help="Only count what would be generated")
+    parser.add_argument("--stub", action="store_true", help="Use the offline StubClaudeClient (no API calls)")
+    args = parser.parse_args()
+
+    client = None
+    if args.stub:
+        from src.api.stub_client import StubClaudeClient
+        client = StubClaudeClient()
+
+    print("=" * 60)
+    print("CardIQ Narrative Generation")
+    print("=" * 60)
+    print(f"Store: {args.store}\n")
+
+    store = NarrativeStore(args.store)
+    job = NarrativeJob(
+        store,
+        claude_client=client,
+        card_ids=args.cards.split(",") if args.cards else None,
+        top_k=args.top_k,
+        mode=args.mode,
+        workers=args.workers,
+        requests_per_minute=args.rpm
+    )
+    print(f"Model: {job.choice.model}, {len(job.archetypes)} archetypes")
+
+    if args.dry_run:
+        tasks, skipped = job.plan()
+        print(f"\n🗂️  {len(tasks):,} narratives to generate, {skipped:,} already stored or in flight")
+        return 0
+
+    summary = job.run(wait=not args.no_wait)
+    print(f"\n✅ Generated {summary['generated']:,} narratives via {summary['mode']} in {summary['seconds']:.1f}s "
+          f"({summary['failed']:,} failed, {summary['stored_total']:,} in store)")
+    if summary['failed']:
+        print("↩️  Run again to retry failed narratives")
+    return 0
+
+if __name__ == "__main__":
+    configure_logging()
+    sys.exit(main())
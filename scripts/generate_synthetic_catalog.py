@@ -0,0 +1,30 @@
+"""Write a synthetic card catalog in the real schema (JSON array or NDJSON)"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.data.synthetic_catalog import write_synthetic_catalog
+
+def main():
+    """Parse arguments and write the catalog"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("num_cards", type=int, help="Number of cards to generate")
+    parser.add_argument("-o", "--output", type=Path, default=Path("data/synthetic/cards.ndjson"),
+                        help="Output path; .ndjson/.jsonl writes NDJSON, anything else a JSON array")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (same seed, same catalog)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    path = write_synthetic_catalog(args.output, args.num_cards, seed=args.seed)
+    elapsed = time.perf_counter() - start
+    size_mb = path.stat().st_size / 1e6
+    print(f"✅ Wrote {args.num_cards:,} synthetic cards to {path} ({size_mb:,.1f} MB, {elapsed:.1f} s)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
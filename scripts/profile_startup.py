@@ -0,0 +1,57 @@
+"""Break down the import time of CardIQ entry points per module"""
+import argparse
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.lazy import profile_imports
+
+# Entry point -> statement that imports what it needs at startup
+ENTRY_POINTS = {
+    "evaluate": "from src.agents.card_evaluator import CardEvaluatorAgent; from src.data.catalog import load_catalog",
+    "batch": "import src.batch",
+    "cli": "import main",
+    "service": "import src.service",
+    "build": "from src.rag.embeddings import EmbeddingGenerator; from src.rag.vector_store import VectorStore"
+}
+HEAVY_MODULES = ("anthropic", "faiss", "torch", "sentence_transformers", "onnxruntime", "transformers")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("entry_point", nargs="?", default="evaluate", choices=sorted(ENTRY_POINTS))
+    parser.add_argument("--statement", help="Profile this Python statement instead of an entry point")
+    parser.add_argument("--top", type=int, default=20, help="Modules to list")
+    parser.add_argument("--sort", choices=("cumulative", "self"), default="cumulative")
+    parser.add_argument("--budget-ms", type=float, help="Exit with status 1 if imports take longer than this")
+    args = parser.parse_args()
+
+    statement = args.statement or ENTRY_POINTS[args.entry_point]
+    print(f"Profiling: {statement}\n")
+    try:
+        records = profile_imports(statement)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        return 1
+
+    total_ms = sum(record["cumulative_ms"] for record in records if record["depth"] == 0)
+    project_ms = sum(record["self_ms"] for record in records if record["module"].split(".")[0] in ("src", "main"))
+    heavy = sorted({record["module"].split(".")[0] for record in records} & set(HEAVY_MODULES))
+
+    key = "cumulative_ms" if args.sort == "cumulative" else "self_ms"
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for record in sorted(records, key=lambda r: r[key], reverse=True)[:args.top]:
+        print(f"{record['cumulative_ms']:>14.1f} {record['self_ms']:>9.1f}  {'  ' * record['depth']}{record['module']}")
+
+    print(f"\n📊 {len(records)} modules imported in {total_ms:.0f} ms ({project_ms:.0f} ms in CardIQ's own modules)")
+    if heavy:
+        print(f"⚠️  Heavy dependencies imported at startup: {', '.join(heavy)}")
+    if args.budget_ms is not None and total_ms > args.budget_ms:
+        print(f"❌ Over the {args.budget_ms:.0f} ms budget")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+"""Benchmark CardIQ hot paths at several catalog sizes (offline, no API key needed)"""
+import argparse
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.benchmarks import TARGETS, DEFAULT_SIZES, run_suite, compare, load_results, save_results
+from src.benchmarks.suite import DEFAULT_THRESHOLD
+
+def print_result(result):
+    """One line per (target, size) as results come in"""
+    label = f"{result['target']:<34} {result['cards']:>8,} cards"
+    if "error" in result:
+        print(f"  ❌ {label}  {result['error']}")
+    else:
+        print(f"  {label}  median {result['median_ms']:>10.3f} ms  "
+              f"p95 {result['p95_ms']:>10.3f} ms  ({result['iterations']} runs)")
+
+def print_comparison(rows):
+    """Table of median times against the baseline"""
+    icons = {"regression": "🔴", "improvement": "🟢", "unchanged": "⚪", "new": "🆕", "error": "❌"}
+    print(f"\n{'':3}{'target':<34} {'cards':>8} {'baseline ms':>12} {'current ms':>12} {'change':>8}")
+    for row in rows:
+        baseline = f"{row['baseline_ms']:.3f}" if "baseline_ms" in row else "-"
+        current = f"{row['median_ms']:.3f}" if row.get("median_ms") is not None else "-"
+        change = f"{row['change']:+.1%}" if "change" in row else "-"
+        print(f"{icons[row['status']]:<3}{row['target']:<34} {row['cards']:>8,} {baseline:>12} {current:>12} {change:>8}")
+
+def main():
+    """Parse arguments, run the suite and optionally compare with a baseline"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES),
+                        help="Comma-separated catalog sizes (default: %(default)s)")
+    parser.add_argument("--targets", default=None,
+                        help=f"Comma-separated subset of: {', '.join(TARGETS)}")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per target and size")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed runs first")
+    parser.add_argument("--min-time", type=float, default=0.0,
+                        help="Keep running until this many seconds have been timed")
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0,
+                        help="Simulated latency of each stub LLM call")
+    parser.add_argument("-o", "--output", type=Path, help="Write results as JSON")
+    parser.add_argument("--baseline", type=Path, help="Earlier --output file to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Median change counted as a regression/improvement (default: %(default)s)")
+    parser.add_argument("--fail-on-regression", action="store_true",
+                        help="Exit with status 1 if any target regressed")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    targets = [name.strip() for name in args.targets.split(",")] if args.targets else None
+    baseline = load_results(args.baseline) if args.baseline else None
+
+    print("=" * 60)
+    print("CardIQ Benchmarks")
+    print("=" * 60)
+    results = run_suite(
+        sizes=sizes,
+        targets=targets,
+        repeat=args.repeat,
+        warmup=args.warmup,
+        min_time=args.min_time,
+        llm_latency=args.llm_latency_ms / 1000,
+        on_result=print_result
+    )
+
+    if args.output:
+        save_results(results, args.output)
+        print(f"\n💾 Results saved to {args.output}")
+
+    if baseline is not None:
+        rows = compare(results, baseline, threshold=args.threshold)
+        print_comparison(rows)
+        if args.fail_on_regression and any(row["status"] == "regression" for row in rows):
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+"""Score a CSV/JSONL file of user profiles and write NDJSON results"""
+import argparse
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.batch import BulkScorer
+from src.utils.log import configure_logging
+
+def main():
+    """Parse arguments and score the file"""
+    parser = argparse.ArgumentParser(description="Bulk-score CardIQ user profiles (no LLM calls)")
+    parser.add_argument("input", type=Path, help="Profiles as .csv (flat columns) or .jsonl")
+    parser.add_argument("-o", "--output", type=Path,
+                        help="NDJSON output path (default: <input>.scores.ndjson)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Rows per worker task")
+    parser.add_argument("--top-k", type=int, default=5, help="Cards to keep per profile")
+    parser.add_argument("--no-resume", action="store_true", help="Ignore any checkpoint and start over")
+    args = parser.parse_args()
+
+    if not args.input.exists():
+        print(f"❌ Input file not found: {args.input}")
+        return 1
+    output = args.output or args.input.with_name(args.input.stem + ".scores.ndjson")
+
+    print("=" * 60)
+    print("CardIQ Bulk Scoring")
+    print("=" * 60)
+    print(f"Input:  {args.input}")
+    print(f"Output: {output}\n")
+
+    scorer = BulkScorer(
+        args.input,
+        output,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        top_k=args.top_k
+    )
+    try:
+        summary = scorer.run(resume=not args.no_resume)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+
+    print(f"\n✅ Scored {summary['rows_scored']:,} rows in {summary['seconds']:.1f}s "
+          f"({summary['rows_total']:,} total, {summary['invalid_rows']:,} invalid)")
+    return 0
+
+if __name__ == "__main__":
+    configure_logging()
+    sys.exit(main())
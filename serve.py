@@ -0,0 +1,32 @@
+"""Run CardIQ as a long-running HTTP recommendation service"""
+import argparse
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from src.service import run_service
+from src.utils.log import configure_logging
+from src.config import SERVICE_HOST, SERVICE_PORT, SERVICE_WORKERS, SERVICE_LOG_LEVEL
+
+def main():
+    """Parse arguments and start the service"""
+    parser = argparse.ArgumentParser(description="CardIQ HTTP recommendation service")
+    parser.add_argument("--host", default=SERVICE_HOST)
+    parser.add_argument("--port", type=int, default=SERVICE_PORT)
+    parser.add_argument("--workers", type=int, default=SERVICE_WORKERS,
+                        help="Maximum requests processed concurrently")
+    parser.add_argument("--verbose", action="store_true", help="Log every HTTP request")
+    parser.add_argument("--log-level", default=SERVICE_LOG_LEVEL,
+                        help="Pipeline log level (INFO logs every stage of every request)")
+    args = parser.parse_args()
+
+    configure_logging(args.log_level)
+
+    run_service(host=args.host, port=args.port, workers=args.workers, verbose=args.verbose)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
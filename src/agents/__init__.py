@@ -1,14 +1,20 @@
-"""Agents module"""
-from .base_agent import BaseAgent
-from .spending_analyzer import SpendingAnalyzerAgent
-from .card_evaluator import CardEvaluatorAgent
-from .recommendation_synthesizer import RecommendationSynthesizerAgent
-from .orchestrator import Orchestrator
+"""Agents module
 
-__all__ = [
-    "BaseAgent",
-    "SpendingAnalyzerAgent",
-    "CardEvaluatorAgent",
-    "RecommendationSynthesizerAgent",
-    "Orchestrator"
-]
+Exports are imported on first access, so `from src.agents import
+CardEvaluatorAgent` doesn't load the synthesizer, retrieval or the
+orchestrator.
+"""
+from src.utils.lazy import lazy_exports
+
+_EXPORTS = {
+    "BaseAgent": ".base_agent",
+    "SpendingAnalyzerAgent": ".spending_analyzer",
+    "CardEvaluatorAgent": ".card_evaluator",
+    "RecommendationSynthesizerAgent": ".recommendation_synthesizer",
+    "RecommendationCache": ".recommendation_cache",
+    "NarrativeStore": ".narrative_store",
+    "Orchestrator": ".orchestrator"
+}
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+__all__ = list(_EXPORTS)
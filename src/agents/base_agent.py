@@ -1,14 +1,26 @@
 """Base agent class for all CardIQ agents"""
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Optional
 from src.api.claude_client import ClaudeClient
+from src.api.model_router import ModelRouter, get_model_router
+from src.utils.metrics import timed_stage
 
 class BaseAgent(ABC):
     """Abstract base class for all agents"""
     
-    def __init__(self, claude_client: ClaudeClient = None):
-        """Initialize agent with Claude client"""
-        self.claude_client = claude_client or ClaudeClient()
+    # Name used by the model routing policy
+    agent_name = "agent"
+    
+    def __init__(self, claude_client: ClaudeClient = None, router: ModelRouter = None):
+        """Initialize agent with Claude client (created on first LLM call if not given)"""
+        self._claude_client = claude_client
+        self.router = router or get_model_router()
+    
+    @property
+    def claude_client(self) -> ClaudeClient:
+        if self._claude_client is None:
+            self._claude_client = ClaudeClient()
+        return self._claude_client
     
     @abstractmethod
     def get_system_prompt(self) -> str:
@@ -20,19 +32,26 @@ class BaseAgent(ABC):
         """Process input and return output"""
         pass
     
-    def _call_llm(self, user_message: str, use_sonnet: bool = False, max_tokens: int = 2000) -> str:
-        """Call Claude API with appropriate model"""
-        system_prompt = self.get_system_prompt()
-        
-        if use_sonnet:
-            return self.claude_client.call_sonnet(
-                system_prompt=system_prompt,
+    def _call_llm(
+        self,
+        user_message: str,
+        rank: Optional[int] = None,
+        timeout: Optional[float] = None
+    ) -> str:
+        """Call Claude API with the model the routing policy picks for this agent (and rank)"""
+        choice = self.router.choose(self.agent_name, rank=rank)
+        stage = f"llm.{self.agent_name}"
+        with timed_stage(stage, name=f"{stage}.rank_{rank}" if rank else stage):
+            return self.claude_client.call(
+                model=choice.model,
+                system_prompt=self.get_system_prompt(),
                 user_message=user_message,
-                max_tokens=max_tokens
-            )
-        else:
-            return self.claude_client.call_haiku(
-                system_prompt=system_prompt,
-                user_message=user_message,
-                max_tokens=max_tokens
+                max_tokens=choice.max_tokens,
+                temperature=choice.temperature,
+                timeout=timeout
             )
+    
+    def _parse_timer(self, rank: Optional[int] = None):
+        """Context manager timing response parsing for this agent (and rank)"""
+        stage = f"parse.{self.agent_name}"
+        return timed_stage(stage, name=f"{stage}.rank_{rank}" if rank else stage)
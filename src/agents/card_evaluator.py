@@ -1,136 +1,198 @@
 """Card Evaluator Agent - Calculates financial value of cards"""
-import json
-from typing import List, Dict
+from typing import Dict, List, Optional
+import numpy as np
 from src.agents.base_agent import BaseAgent
-from src.models.agent_outputs import SpendingAnalysis, CardEvaluations, CardEvaluation
+from src.api.model_router import ModelRouter
+from src.models.agent_outputs import SpendingAnalysis
+from src.models.records import CardEvaluationRecord, CardEvaluationsRecord
 from src.prompts import CARD_EVALUATOR_SYSTEM_PROMPT
-from src.data.card_loader import CardLoader
-from src.utils.calculations import (
-    calculate_category_rewards,
-    calculate_total_annual_credits,
-    calculate_net_value
-)
+from src.data.catalog import CardCatalog, get_default_catalog
+from src.utils.calculations import calculate_category_rewards_batch
+from src.utils.projection import ValueProjection
+from src.utils.eligibility import ProfileConstraints
+from src.utils.microbatch import MicroBatcher
+from src.config import MICROBATCH_WINDOW_MS, MICROBATCH_MAX_SIZE, SIGNUP_BONUS_REACHABILITY
+
+# Upper bound on (profile, card) scores held in memory at once
+MAX_SCORES_PER_PASS = 2_000_000
 
 class CardEvaluatorAgent(BaseAgent):
     """Agent that evaluates and ranks credit cards"""
     
-    def __init__(self, claude_client=None):
-        super().__init__(claude_client)
-        self.card_loader = CardLoader()
+    agent_name = "card_evaluator"
+    
+    def __init__(
+        self,
+        claude_client=None,
+        catalog: CardCatalog = None,
+        batch_window_ms: float = MICROBATCH_WINDOW_MS,
+        projection: ValueProjection = None,
+        bonus_reachability: bool = SIGNUP_BONUS_REACHABILITY,
+        router: ModelRouter = None
+    ):
+        super().__init__(claude_client, router=router)
+        self.catalog = catalog or get_default_catalog()
+        # Horizon, discounting and ranking objective (see PROJECTION_* settings)
+        self.projection = projection or ValueProjection()
+        # When off, every signup bonus counts regardless of the profile's spend
+        self.bonus_reachability = bonus_reachability
+        
+        # Concurrent process() calls are scored together in one matrix product
+        self._batcher = None
+        if batch_window_ms > 0:
+            self._batcher = MicroBatcher(
+                self._process_batch,
+                window_ms=batch_window_ms,
+                max_batch_size=MICROBATCH_MAX_SIZE,
+                name="card-evaluator-batch"
+            )
     
     def get_system_prompt(self) -> str:
         return CARD_EVALUATOR_SYSTEM_PROMPT
     
-    def process(self, spending_analysis: SpendingAnalysis, user_profile) -> CardEvaluations:
-        """Evaluate all cards and return top ranked cards"""
-        
-        # Load all cards
-        all_cards = self.card_loader.load_cards()
-        
-        # Filter by user preferences if specified
-        eligible_cards = self._filter_cards(all_cards, user_profile)
-        
-        # Calculate value for each card
-        evaluations = []
-        for card in eligible_cards:
-            eval_result = self._evaluate_single_card(card, spending_analysis, user_profile)
-            evaluations.append(eval_result)
-
-        # Sort by blended score that balances short-term and long-term value
-        # This prevents high signup bonuses from always dominating recommendations
-        # Formula: (Year_1 * 0.3) + (Year_2 * 0.4) + (Year_3 * 0.3)
-        # This gives more weight to Year 2 (ongoing value without signup bonus)
-        evaluations.sort(key=lambda x: (x.net_value_year_1 * 0.3 +
-                                        x.net_value_year_2 * 0.4 +
-                                        x.net_value_year_3 * 0.3),
-                        reverse=True)
-
-        # Return top 5
-        top_cards = evaluations[:5]
-        
-        return CardEvaluations(
-            top_cards=top_cards,
-            total_cards_evaluated=len(evaluations)
-        )
+    @property
+    def batch_stats(self) -> Optional[Dict[str, float]]:
+        """Micro-batching metrics, or None when batching is disabled"""
+        return self._batcher.stats.snapshot() if self._batcher else None
     
-    def _filter_cards(self, cards: List[Dict], user_profile) -> List[Dict]:
-        """Filter cards based on user preferences"""
-        filtered = cards
-        
-        # Filter by max annual fee if specified
-        if user_profile.max_annual_fee is not None:
-            filtered = [c for c in filtered if c['annual_fee'] <= user_profile.max_annual_fee]
-        
-        # Filter by rewards type if specified
-        if user_profile.preferred_rewards_type:
-            filtered = [c for c in filtered if c['rewards_type'].lower() == user_profile.preferred_rewards_type.lower()]
-        
-        return filtered
+    def process(
+        self,
+        spending_analysis: SpendingAnalysis,
+        user_profile,
+        catalog: CardCatalog = None
+    ) -> CardEvaluationsRecord:
+        """Evaluate all cards and return top ranked cards
+        
+        catalog overrides the agent's catalog for this call (e.g. a pinned
+        snapshot). The result is a lightweight record; call to_model() for
+        the CardEvaluations model.
+        """
+        catalog = catalog or self.catalog
+        if self._batcher is not None:
+            return self._batcher.run((user_profile, catalog))
+        return self.evaluate_many([user_profile], catalog=catalog)[0]
     
-    def _evaluate_single_card(self, card: Dict, spending_analysis: SpendingAnalysis, user_profile) -> CardEvaluation:
-        """Calculate value for a single card"""
+    def _process_batch(self, items) -> List:
+        """Score queued (user_profile, catalog) items, one matrix product per catalog"""
+        results = [None] * len(items)
+        groups = {}
+        for i, (_, catalog) in enumerate(items):
+            groups.setdefault(id(catalog), []).append(i)
+        
+        for indices in groups.values():
+            catalog = items[indices[0]][1]
+            try:
+                evaluations = self.evaluate_many([items[i][0] for i in indices], catalog=catalog)
+            except Exception as e:
+                evaluations = [e] * len(indices)
+            for i, evaluation in zip(indices, evaluations):
+                results[i] = evaluation
+        return results
+    
+    def evaluate_many(
+        self,
+        user_profiles: List,
+        catalog: CardCatalog = None,
+        top_k: int = 5
+    ) -> List[CardEvaluationsRecord]:
+        """Evaluate all cards for several profiles at once
+        
+        Rewards for every (profile, card) pair come from one matrix product
+        (split into passes of at most MAX_SCORES_PER_PASS scores); each
+        profile's result matches a single process() call.
+        """
+        catalog = catalog or self.catalog
+        step = max(1, MAX_SCORES_PER_PASS // max(1, len(catalog)))
+        results = []
+        for start in range(0, len(user_profiles), step):
+            results.extend(self._evaluate_pass(user_profiles[start:start + step], catalog, top_k))
+        return results
+    
+    def _evaluate_pass(self, user_profiles: List, catalog: CardCatalog, top_k: int) -> List[CardEvaluationsRecord]:
+        """Score and rank one slice of profiles"""
+        columns = catalog.columns
+        
+        # Eligibility (credit tier, fee cap, rewards type, foreign fees) and
+        # signup bonus reachability for every (profile, card) pair at once
+        constraints = ProfileConstraints(user_profiles, columns.rewards_types)
+        eligible = constraints.eligible(columns)
+        bonus_reachable = constraints.bonus_reachable(columns, enabled=self.bonus_reachability)
+        
+        # Calculate value for every (profile, card) pair in one vectorized pass
+        values = self._evaluate_cards(columns, user_profiles, bonus_reachable)
+        
+        # Sort by the ranking objective (by default a blend of years 1-3 that
+        # keeps high signup bonuses from always dominating recommendations)
+        results = []
+        for p in range(len(user_profiles)):
+            eligible_rows = np.flatnonzero(eligible[p])
+            order = eligible_rows[np.argsort(-values['ranking_score'][p, eligible_rows], kind='stable')]
+            
+            # Return top 5 (by default)
+            top_cards = self._build_evaluations(catalog, order[:top_k], values, p)
+            results.append(CardEvaluationsRecord(top_cards, len(eligible_rows)))
+        
+        return results
+    
+    def _evaluate_cards(self, columns, user_profiles: List, bonus_reachable: np.ndarray) -> Dict[str, np.ndarray]:
+        """Calculate (profiles x cards) value arrays; unreachable signup bonuses count as $0"""
         
-        # Get monthly spending as dict
-        spending_dict = user_profile.monthly_spending.model_dump()
+        # Get monthly spending as dicts
+        spending_dicts = [profile.monthly_spending.model_dump() for profile in user_profiles]
         
         # Calculate annual rewards
-        annual_rewards = calculate_category_rewards(
-            monthly_spending=spending_dict,
-            card_rewards=card['rewards'],
-            point_value=card['point_value']
-        )
-        
-        # Get signup bonus value
-        signup_bonus_value = card['signup_bonus'].get('estimated_value') or 0
-        if signup_bonus_value is None:
-            signup_bonus_value = 0
-        # Convert to float if it's a string
-        signup_bonus_value = float(signup_bonus_value)
-        
-        # Calculate annual credits value
-        annual_credits_value = calculate_total_annual_credits(card.get('annual_credits', []))
-        
-        # Get annual fee
-        annual_fee = float(card['annual_fee'])
-        
-        # Calculate net values
-        net_value_year_1 = calculate_net_value(
-            annual_rewards=annual_rewards,
-            signup_bonus_value=signup_bonus_value,
-            annual_fee=annual_fee,
-            annual_credits_value=annual_credits_value,
-            year=1
+        annual_rewards = calculate_category_rewards_batch(
+            monthly_spendings=spending_dicts,
+            reward_rates=columns.reward_rates,
+            point_values=columns.point_value,
+            categories=columns.categories
         )
         
-        net_value_year_2 = calculate_net_value(
-            annual_rewards=annual_rewards,
-            signup_bonus_value=signup_bonus_value,
-            annual_fee=annual_fee,
-            annual_credits_value=annual_credits_value,
-            year=2
-        )
+        signup_bonus_value = np.where(bonus_reachable, columns.signup_bonus_value, 0.0)
         
-        net_value_year_3 = calculate_net_value(
-            annual_rewards=annual_rewards,
-            signup_bonus_value=signup_bonus_value,
-            annual_fee=annual_fee,
-            annual_credits_value=annual_credits_value,
-            year=3
+        # Score under the ranking objective (closed form, no per-year arrays)
+        ranking_score = self.projection.score(
+            annual_rewards,
+            signup_bonus_value,
+            columns.annual_fee,
+            columns.annual_credits_value,
+            columns.first_year_fee_waived
         )
         
-        # Calculate blended ranking score: Year 1 (30%) + Year 2 (40%) + Year 3 (30%)
-        # This balances signup bonuses with long-term value
-        blended_score = (net_value_year_1 * 0.3) + (net_value_year_2 * 0.4) + (net_value_year_3 * 0.3)
-
-        return CardEvaluation(
-            card_id=card['card_id'],
-            card_name=card['card_name'],
-            annual_rewards=round(annual_rewards, 2),
-            signup_bonus_value=round(signup_bonus_value, 2),
-            annual_fee=annual_fee,
-            annual_credits_value=round(annual_credits_value, 2),
-            net_value_year_1=round(net_value_year_1, 2),
-            net_value_year_2=round(net_value_year_2, 2),
-            net_value_year_3=round(net_value_year_3, 2),
-            ranking_score=round(blended_score, 2)  # Use blended score for ranking
-        )
+        return {
+            'annual_rewards': annual_rewards,
+            'signup_bonus_value': signup_bonus_value,
+            'bonus_reachable': bonus_reachable,
+            'ranking_score': ranking_score
+        }
+    
+    def _build_evaluations(self, catalog, rows: np.ndarray, values: Dict[str, np.ndarray], p: int) -> List[CardEvaluationRecord]:
+        """Create evaluation records, with projected yearly values, for the given rows scored for profile p"""
+        columns = catalog.columns
+        annual_rewards = values['annual_rewards'][p, rows]
+        signup_bonus_value = values['signup_bonus_value'][p, rows]
+        projected = self.projection.project(
+            annual_rewards,
+            signup_bonus_value,
+            columns.annual_fee[rows],
+            columns.annual_credits_value[rows],
+            columns.first_year_fee_waived[rows]
+        ).round(2)
+        horizon = self.projection.horizon_years
+        return [
+            CardEvaluationRecord(
+                card_id=catalog.string_at('card_id', row),
+                card_name=catalog.string_at('card_name', row),
+                annual_rewards=round(float(annual_rewards[i]), 2),
+                signup_bonus_value=round(float(signup_bonus_value[i]), 2),
+                annual_fee=float(columns.annual_fee[row]),
+                annual_credits_value=round(float(columns.annual_credits_value[row]), 2),
+                net_value_year_1=float(projected[i, 0]),
+                net_value_year_2=float(projected[i, 1]),
+                net_value_year_3=float(projected[i, 2]),
+                ranking_score=round(float(values['ranking_score'][p, row]), 2),
+                net_value_by_year=projected[i, :horizon].tolist(),
+                signup_bonus_reachable=bool(values['bonus_reachable'][p, row])
+            )
+            for i, row in enumerate(rows)
+        ]
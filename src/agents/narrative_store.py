@@ -0,0 +1,301 @@
+"""Pre-generated card narratives per spending archetype
+
+A spending archetype is a general spending shape: the user's top one or
+two categories (in order) and their total monthly spend band. Narratives
+for every card x archetype are generated offline (scripts/generate_narratives.py)
+into a local SQLite store, keyed by (card_id, archetype). The synthesizer
+serves them with the user's own numbers filled in and only calls the LLM
+for users who don't fit an archetype well (outliers) or store misses.
+"""
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from itertools import permutations
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from src.models.user_input import UserProfile, MonthlySpending
+from src.config import (
+    TOP_LEVEL_CATEGORIES,
+    NARRATIVE_STORE_ENABLED,
+    NARRATIVE_STORE_PATH,
+    NARRATIVE_SPEND_BANDS,
+    NARRATIVE_OUTLIER_MAX_DISTANCE
+)
+
+logger = logging.getLogger(__name__)
+
+# Representative share of spend in an archetype's first and second category;
+# the rest is spread evenly over the other categories
+PRIMARY_SHARE = 0.40
+SECONDARY_SHARE = 0.25
+# Bump when the generation prompt changes so old narratives count as stale
+NARRATIVE_PROMPT_VERSION = 2
+
+
+def card_fingerprint(card: Dict) -> str:
+    """Short hash of a card's data and the prompt version; a changed card makes its narratives stale"""
+    payload = json.dumps(card, sort_keys=True, default=str) + f"|v{NARRATIVE_PROMPT_VERSION}"
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class SpendingArchetype:
+    """Top one or two spending categories plus a total monthly spend band"""
+
+    __slots__ = ("categories", "band", "low", "high")
+
+    def __init__(self, categories: Sequence[str], band: int, bands: Sequence[float] = NARRATIVE_SPEND_BANDS):
+        if not 1 <= len(categories) <= 2:
+            raise ValueError(f"An archetype has one or two categories, got {list(categories)}")
+        if not 0 <= band < len(bands):
+            raise ValueError(f"Spend band {band} out of range for {len(bands)} band edges")
+        self.categories = tuple(categories)
+        self.band = band
+        self.low = 0.0 if band == 0 else float(bands[band - 1])
+        self.high = float(bands[band])
+
+    @property
+    def key(self) -> str:
+        """Store key, e.g. "dining>groceries@1500-4000" """
+        return f"{'>'.join(self.categories)}@{self.low:g}-{self.high:g}"
+
+    def __repr__(self) -> str:
+        return f"SpendingArchetype({self.key!r})"
+
+    def shares(self) -> Dict[str, float]:
+        """Representative share of spend per top-level category"""
+        if len(self.categories) == 1:
+            return {category: float(category == self.categories[0]) for category in TOP_LEVEL_CATEGORIES}
+        first, second = self.categories
+        rest = (1.0 - PRIMARY_SHARE - SECONDARY_SHARE) / (len(TOP_LEVEL_CATEGORIES) - 2)
+        return {
+            category: PRIMARY_SHARE if category == first else SECONDARY_SHARE if category == second else rest
+            for category in TOP_LEVEL_CATEGORIES
+        }
+
+    def profile(self) -> UserProfile:
+        """Representative profile: mid-band spend split by shares(), no card constraints"""
+        total = (self.low + self.high) / 2
+        spending = {category: round(total * share, 2) for category, share in self.shares().items()}
+        return UserProfile(monthly_spending=MonthlySpending(**spending), credit_score="excellent")
+
+
+def iter_archetypes(bands: Sequence[float] = NARRATIVE_SPEND_BANDS) -> Iterator[SpendingArchetype]:
+    """Every archetype: each single category and ordered category pair, in each spend band"""
+    category_sets = [(category,) for category in TOP_LEVEL_CATEGORIES]
+    category_sets += list(permutations(TOP_LEVEL_CATEGORIES, 2))
+    for band in range(len(bands)):
+        for categories in category_sets:
+            yield SpendingArchetype(categories, band, bands)
+
+
+def spending_shares(spending_analysis) -> Dict[str, float]:
+    """A SpendingAnalysis's top-level category shares, summing to 1 (all 0 without spending)"""
+    percentages = spending_analysis.category_percentages or {}
+    values = {category: max(float(percentages.get(category) or 0), 0.0) for category in TOP_LEVEL_CATEGORIES}
+    total = sum(values.values())
+    return {category: value / total if total else 0.0 for category, value in values.items()}
+
+
+def match_archetype(
+    spending_analysis,
+    bands: Sequence[float] = NARRATIVE_SPEND_BANDS,
+    max_distance: float = NARRATIVE_OUTLIER_MAX_DISTANCE
+) -> Optional[SpendingArchetype]:
+    """The archetype a user's spending fits, or None for outliers
+
+    The candidates are the user's top category alone and their top two
+    categories; the one whose shares are closest (L1) wins. Outliers have
+    no spending, spend at or above the last band edge, or shares more than
+    max_distance from both candidates.
+    """
+    total = spending_analysis.total_monthly_spend
+    shares = spending_shares(spending_analysis)
+    band = sum(total >= edge for edge in bands)
+    if total <= 0 or band >= len(bands):
+        return None
+
+    categories = [c for c in spending_analysis.top_categories if shares.get(c, 0) > 0][:2]
+    best, best_distance = None, max_distance
+    for size in range(1, len(categories) + 1):
+        archetype = SpendingArchetype(categories[:size], band, bands)
+        reference = archetype.shares()
+        distance = sum(abs(shares[category] - reference[category]) for category in TOP_LEVEL_CATEGORIES)
+        if distance <= best_distance:
+            best, best_distance = archetype, distance
+    return best
+
+
+class NarrativeStore:
+    """SQLite store of narratives keyed by (card_id, archetype)
+
+    Each narrative keeps the fingerprint of the card it was written for;
+    get() ignores narratives whose card has since changed. The same file
+    holds the generation job's Message Batches bookkeeping, so an
+    interrupted job resumes polling instead of resubmitting. WAL mode lets
+    running services read while a job writes.
+    """
+
+    def __init__(self, path: Path = NARRATIVE_STORE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS narratives (
+                    card_id TEXT NOT NULL,
+                    archetype TEXT NOT NULL,
+                    card_hash TEXT NOT NULL,
+                    narrative TEXT NOT NULL,
+                    model TEXT,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (card_id, archetype)
+                ) WITHOUT ROWID;
+                CREATE TABLE IF NOT EXISTS batches (
+                    batch_id TEXT PRIMARY KEY,
+                    model TEXT,
+                    submitted_at REAL NOT NULL,
+                    done INTEGER NOT NULL DEFAULT 0
+                );
+                CREATE TABLE IF NOT EXISTS batch_requests (
+                    batch_id TEXT NOT NULL,
+                    custom_id TEXT NOT NULL,
+                    card_id TEXT NOT NULL,
+                    archetype TEXT NOT NULL,
+                    card_hash TEXT NOT NULL,
+                    PRIMARY KEY (batch_id, custom_id)
+                ) WITHOUT ROWID;
+            """)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM narratives").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def get(self, card_id: str, archetype: str, card_hash: Optional[str] = None) -> Optional[Dict]:
+        """Narrative for a card and archetype, or None if missing or stale"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT card_hash, narrative FROM narratives WHERE card_id = ? AND archetype = ?",
+                (card_id, archetype)
+            ).fetchone()
+        if row is None or (card_hash is not None and row[0] != card_hash):
+            return None
+        return json.loads(row[1])
+
+    def put_many(self, rows: List[Tuple[str, str, str, Dict, Optional[str]]]):
+        """Insert or replace (card_id, archetype, card_hash, narrative, model) rows in one transaction"""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO narratives VALUES (?, ?, ?, ?, ?, ?)",
+                [(card_id, archetype, card_hash, json.dumps(narrative), model, now)
+                 for card_id, archetype, card_hash, narrative, model in rows]
+            )
+
+    def put(self, card_id: str, archetype: str, card_hash: str, narrative: Dict, model: Optional[str] = None):
+        self.put_many([(card_id, archetype, card_hash, narrative, model)])
+
+    def fingerprints(self) -> Dict[Tuple[str, str], str]:
+        """(card_id, archetype) -> card_hash for every stored narrative"""
+        with self._lock:
+            return {
+                (card_id, archetype): card_hash
+                for card_id, archetype, card_hash in self._conn.execute(
+                    "SELECT card_id, archetype, card_hash FROM narratives"
+                )
+            }
+
+    def add_batch(self, batch_id: str, model: str, requests: List[Tuple[str, str, str, str]]):
+        """Record a submitted batch and its (custom_id, card_id, archetype, card_hash) requests"""
+        with self._lock, self._conn:
+            self._conn.execute("INSERT INTO batches VALUES (?, ?, ?, 0)", (batch_id, model, time.time()))
+            self._conn.executemany(
+                "INSERT INTO batch_requests VALUES (?, ?, ?, ?, ?)",
+                [(batch_id, *request) for request in requests]
+            )
+
+    def open_batches(self) -> List[Tuple[str, str]]:
+        """(batch_id, model) of submitted batches whose results aren't stored yet"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT batch_id, model FROM batches WHERE done = 0 ORDER BY submitted_at"
+            ).fetchall()
+
+    def batch_requests(self, batch_id: str) -> Dict[str, Tuple[str, str, str]]:
+        """custom_id -> (card_id, archetype, card_hash) for a batch"""
+        with self._lock:
+            return {
+                custom_id: (card_id, archetype, card_hash)
+                for custom_id, card_id, archetype, card_hash in self._conn.execute(
+                    "SELECT custom_id, card_id, archetype, card_hash FROM batch_requests WHERE batch_id = ?",
+                    (batch_id,)
+                )
+            }
+
+    def in_flight(self) -> Dict[Tuple[str, str], str]:
+        """(card_id, archetype) -> card_hash for requests in open batches"""
+        with self._lock:
+            return {
+                (card_id, archetype): card_hash
+                for card_id, archetype, card_hash in self._conn.execute(
+                    "SELECT r.card_id, r.archetype, r.card_hash FROM batch_requests r "
+                    "JOIN batches b ON b.batch_id = r.batch_id WHERE b.done = 0"
+                )
+            }
+
+    def finish_batch(self, batch_id: str):
+        """Mark a batch's results as stored"""
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE batches SET done = 1 WHERE batch_id = ?", (batch_id,))
+
+
+# Seconds between checks for a store generated (or replaced) after startup
+STORE_RECHECK_SECONDS = 5.0
+
+_default_store: Optional[NarrativeStore] = None
+_default_store_inode: Optional[int] = -1
+_default_store_checked_at: Optional[float] = None
+_default_store_lock = threading.Lock()
+
+
+def get_default_narrative_store() -> Optional[NarrativeStore]:
+    """The process-wide store at NARRATIVE_STORE_PATH, or None if disabled or not generated
+
+    The file is checked again every STORE_RECHECK_SECONDS, so a store
+    generated (or replaced) while a service runs is used without a restart.
+    Narratives added to an open store are visible right away.
+    """
+    global _default_store, _default_store_inode, _default_store_checked_at
+    if not NARRATIVE_STORE_ENABLED:
+        return None
+    checked_at = _default_store_checked_at
+    if checked_at is not None and time.monotonic() - checked_at < STORE_RECHECK_SECONDS:
+        return _default_store
+
+    with _default_store_lock:
+        if _default_store_checked_at is not checked_at:
+            # Another thread just checked
+            return _default_store
+        try:
+            inode = NARRATIVE_STORE_PATH.stat().st_ino
+        except FileNotFoundError:
+            inode = None
+        if inode != _default_store_inode:
+            # The old connection is left to in-flight readers and closed when collected
+            if inode is None:
+                logger.info("No narrative store at %s, generating all narratives live", NARRATIVE_STORE_PATH)
+                _default_store = None
+            else:
+                logger.info("Using narrative store at %s", NARRATIVE_STORE_PATH)
+                _default_store = NarrativeStore(NARRATIVE_STORE_PATH)
+            _default_store_inode = inode
+        _default_store_checked_at = time.monotonic()
+    return _default_store
@@ -1,72 +1,396 @@
 """Orchestrator Agent - Coordinates all agents"""
+import logging
+import time
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
 from src.agents.base_agent import BaseAgent
 from src.agents.spending_analyzer import SpendingAnalyzerAgent
 from src.agents.card_evaluator import CardEvaluatorAgent
-from src.agents.recommendation_synthesizer import RecommendationSynthesizerAgent
+from src.agents.recommendation_synthesizer import RecommendationSynthesizerAgent, build_financial_summary
+from src.agents.recommendation_cache import RecommendationCache
 from src.models.user_input import UserProfile
-from src.models.agent_outputs import RecommendationOutput
+from src.models.agent_outputs import (
+    RecommendationOutput,
+    CardEvaluations,
+    PreliminaryResult,
+    RankedCardSummary
+)
+from src.models.records import as_card_evaluations
+from src.data.catalog import CardCatalog, get_default_catalog
+from src.rag.hot_reload import ResourceSnapshot, VersionedResources
+from src.rag.retriever import CardRetriever
 from src.prompts import ORCHESTRATOR_SYSTEM_PROMPT
+from src.api.claude_client import llm_single_flight
+from src.api.model_router import ModelRouter
+from src.utils.single_flight import SingleFlight
+from src.utils.deadline import Deadline, run_with_timeout
+from src.utils.metrics import RequestTimings, track_timings, timed_stage, record_stage, in_current_context
+from src.config import (
+    RAG_WARMUP,
+    RECOMMENDATION_CACHE_ENABLED,
+    SINGLE_FLIGHT_ENABLED,
+    REQUEST_DEADLINE_SECONDS,
+    SPENDING_ANALYSIS_BUDGET_SHARE,
+    SYNTHESIS_BUDGET_SHARE,
+    MICROBATCH_WINDOW_MS
+)
+
+logger = logging.getLogger(__name__)
 
 class Orchestrator(BaseAgent):
     """Main orchestrator that coordinates all agents"""
     
-    def __init__(self, claude_client=None):
-        super().__init__(claude_client)
+    agent_name = "orchestrator"
+    
+    def __init__(
+        self,
+        claude_client=None,
+        warm_up: bool = RAG_WARMUP,
+        catalog: CardCatalog = None,
+        resources: VersionedResources = None,
+        cache: Optional[RecommendationCache] = None,
+        retriever: CardRetriever = None,
+        batch_window_ms: float = MICROBATCH_WINDOW_MS,
+        router: ModelRouter = None
+    ):
+        super().__init__(claude_client, router=router)
+        
+        # Narratives are reused across users in the same spending bucket
+        self.cache = cache
+        if cache is None and RECOMMENDATION_CACHE_ENABLED:
+            self.cache = RecommendationCache()
+        # Identical concurrent requests wait on one computation
+        self.single_flight = SingleFlight() if SINGLE_FLIGHT_ENABLED else None
+        
+        # With hot-reloadable resources, each request pins the current snapshot;
+        # otherwise one shared catalog and retriever serve every request
+        self.resources = resources
+        if resources is not None:
+            initial = resources.current()
+            catalog, retriever = initial.catalog, initial.retriever
+        else:
+            catalog = catalog or get_default_catalog()
+            retriever = retriever or CardRetriever(catalog=catalog, batch_window_ms=batch_window_ms)
+        
+        # Initialize all agents (batch_window_ms > 0 micro-batches concurrent
+        # requests); they share the orchestrator's model router
+        self.spending_analyzer = SpendingAnalyzerAgent(claude_client, router=self.router)
+        self.card_evaluator = CardEvaluatorAgent(
+            claude_client, catalog=catalog, batch_window_ms=batch_window_ms, router=self.router
+        )
+        self.recommendation_synthesizer = RecommendationSynthesizerAgent(
+            claude_client, catalog=catalog, retriever=retriever, router=self.router
+        )
+        self._static_snapshot = ResourceSnapshot(
+            version="static",
+            catalog=catalog,
+            retriever=self.recommendation_synthesizer.retriever
+        )
         
-        # Initialize all agents
-        self.spending_analyzer = SpendingAnalyzerAgent(claude_client)
-        self.card_evaluator = CardEvaluatorAgent(claude_client)
-        self.recommendation_synthesizer = RecommendationSynthesizerAgent(claude_client)
+        if resources is not None and self.cache is not None:
+            resources.add_listener(lambda old, new: self.cache.clear())
+        
+        # Retrieval resources load lazily; optionally start loading them now
+        if warm_up:
+            self.snapshot().retriever.warm_up(background=True)
     
     def get_system_prompt(self) -> str:
         return ORCHESTRATOR_SYSTEM_PROMPT
     
-    def process(self, user_profile: UserProfile) -> RecommendationOutput:
+    def snapshot(self) -> ResourceSnapshot:
+        """Catalog and retriever a new request should use"""
+        if self.resources is not None:
+            return self.resources.current()
+        return self._static_snapshot
+    
+    @property
+    def catalog(self) -> CardCatalog:
+        """Current card catalog"""
+        return self.snapshot().catalog
+    
+    @property
+    def is_ready(self) -> bool:
+        """Whether retrieval resources are warm"""
+        return self.snapshot().retriever.is_ready
+    
+    def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        """Block until retrieval resources are warm (starts warm-up if needed)"""
+        return self.snapshot().retriever.wait_until_ready(timeout)
+    
+    def single_flight_stats(self) -> Dict[str, Optional[Dict[str, int]]]:
+        """Coalescing counters for whole requests and individual LLM calls"""
+        return {
+            "requests": self.single_flight.stats() if self.single_flight else None,
+            "llm_calls": llm_single_flight.stats()
+        }
+    
+    def batch_stats(self) -> Dict[str, Optional[Dict[str, float]]]:
+        """Micro-batching metrics for retrieval and card scoring"""
+        return {
+            "retrieval": self.snapshot().retriever.batch_stats,
+            "evaluation": self.card_evaluator.batch_stats
+        }
+    
+    def process(self, user_profile: UserProfile, budget: Optional[float] = None) -> RecommendationOutput:
         """
         Main workflow:
-        1. Analyze spending
-        2. Evaluate cards
+        1. Evaluate cards
+        2. Analyze spending
         3. Synthesize recommendations
+        
+        budget is the end-to-end latency budget in seconds (default
+        REQUEST_DEADLINE_SECONDS, 0 for none). LLM stages that run past their
+        share or return unusable output fall back to templates, and the
+        output is marked degraded. Concurrent calls with an identical
+        profile and budget share one run; each gets its own output.
         """
         
-        print("=" * 60)
-        print("CardIQ Recommendation System")
-        print("=" * 60)
-        
-        # Step 1: Analyze spending
-        print("\n[1/3] Analyzing spending patterns...")
-        spending_analysis = self.spending_analyzer.process(user_profile)
-        print(f"✓ Analysis complete:")
-        print(f"  - Total monthly spend: ${spending_analysis.total_monthly_spend:,.2f}")
-        print(f"  - Top categories: {', '.join(spending_analysis.top_categories)}")
-        print(f"  - Profile: {spending_analysis.spending_profile}")
-        
-        # Step 2: Evaluate cards
-        print("\n[2/3] Evaluating credit cards...")
-        card_evaluations = self.card_evaluator.process(spending_analysis, user_profile)
-        print(f"✓ Evaluated {card_evaluations.total_cards_evaluated} cards")
-        print(f"  Top 3 cards:")
-        for i, card_eval in enumerate(card_evaluations.top_cards[:3], 1):
-            print(f"    {i}. {card_eval.card_name} (Year 1 value: ${card_eval.net_value_year_1:,.2f})")
-        
-        # Step 3: Synthesize recommendations
-        print("\n[3/3] Creating personalized recommendations...")
-        recommendations = self.recommendation_synthesizer.process(
+        # Pin one catalog/index version for the whole request
+        snapshot = self.snapshot()
+        deadline = self._deadline(budget)
+        if self.single_flight is None:
+            return self._run_to_completion(user_profile, snapshot, deadline)
+        
+        # Only requests with the same budget share a run: a leader degraded by
+        # its own deadline says nothing about a caller with more time
+        key = (snapshot.version, deadline.total, user_profile.model_dump_json())
+        led = []
+        
+        def lead() -> RecommendationOutput:
+            led.append(True)
+            return self._run_to_completion(user_profile, snapshot, deadline)
+        
+        try:
+            # Waiters joining a slow leader give up at their own deadline
+            output = self.single_flight.do(key, lead, timeout=deadline.remaining())
+        except FuturesTimeoutError:
+            logger.warning("⚠️  Identical request still running past the deadline, using templates")
+            return self._template_output(
+                user_profile, snapshot, deadline, reason="Identical in-flight request timed out, used templates"
+            )
+        if led:
+            return output
+        # Waiters get their own copy, timed from their own start
+        shared = output.model_copy(deep=True)
+        shared.timings = self._finish_timings(RequestTimings(), deadline)
+        return shared
+    
+    def stream(self, user_profile: UserProfile, budget: Optional[float] = None) -> Iterator[Tuple[str, Any]]:
+        """Run the workflow progressively, yielding (event, payload) pairs
+        
+        1. ("preliminary", PreliminaryResult) once cards are scored, before any LLM call
+        2. ("recommendation", Recommendation) for each narrative as it completes
+        3. ("complete", RecommendationOutput) with everything in rank order
+        """
+        return self._stream(user_profile, self.snapshot(), self._deadline(budget))
+    
+    @staticmethod
+    def _deadline(budget: Optional[float]) -> Deadline:
+        budget = REQUEST_DEADLINE_SECONDS if budget is None else budget
+        return Deadline(budget if budget > 0 else None)
+    
+    def _run_to_completion(
+        self,
+        user_profile: UserProfile,
+        snapshot: ResourceSnapshot,
+        deadline: Deadline
+    ) -> RecommendationOutput:
+        for event, payload in self._stream(user_profile, snapshot, deadline):
+            if event == "complete":
+                return payload
+    
+    def _stream(
+        self,
+        user_profile: UserProfile,
+        snapshot: ResourceSnapshot,
+        deadline: Deadline
+    ) -> Iterator[Tuple[str, Any]]:
+        """Run the full workflow against one snapshot
+        
+        Stage timings go to the metrics registry and, per request, to the
+        output's timings. Each step runs inside track_timings() on its own;
+        the context is never held across a yield.
+        """
+        timings = RequestTimings()
+        
+        # Step 1: Evaluate cards (local math, ready in milliseconds)
+        logger.info("[1/3] Evaluating credit cards...")
+        with track_timings(timings), timed_stage("evaluation"):
+            spending_summary = self.spending_analyzer.summarize(user_profile)
+            card_evaluations = self.card_evaluator.process(
+                spending_summary, user_profile, catalog=snapshot.catalog
+            )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("✓ Evaluated %d cards", card_evaluations.total_cards_evaluated)
+            for i, card_eval in enumerate(card_evaluations.top_cards[:3], 1):
+                logger.info("    %d. %s (Year 1 value: $%s)", i, card_eval.card_name, f"{card_eval.net_value_year_1:,.2f}")
+        
+        yield "preliminary", PreliminaryResult(
+            spending_analysis=spending_summary,
+            card_evaluations=as_card_evaluations(card_evaluations),
+            top_cards=[
+                RankedCardSummary(
+                    rank=rank,
+                    card_id=evaluation.card_id,
+                    card_name=evaluation.card_name,
+                    financial_summary=build_financial_summary(evaluation)
+                )
+                for rank, evaluation in enumerate(card_evaluations.top_cards[:3], 1)
+            ]
+        )
+        
+        # Users in the same spending bucket with the same top cards share narratives
+        if self.cache is not None:
+            with track_timings(timings), timed_stage("cache_lookup"):
+                cache_key = self.cache.key_for(user_profile, version=snapshot.version)
+                cached = self.cache.lookup(cache_key, card_evaluations, spending_summary)
+            if cached is not None:
+                logger.info("♻️  Reusing cached recommendations for a matching spending profile")
+                for recommendation in cached.recommendations:
+                    yield "recommendation", recommendation
+                cached.timings = self._finish_timings(timings, deadline)
+                yield "complete", cached
+                return
+        
+        # Narratives pre-generated for the user's spending archetype
+        with track_timings(timings), timed_stage("narrative_store"):
+            stored = self.recommendation_synthesizer.stored_recommendations(
+                spending_summary, card_evaluations, catalog=snapshot.catalog
+            )
+        
+        # Step 2: Analyze spending (falls back to the local summary); the
+        # analysis only feeds live narratives, so skip it if none are needed
+        degraded_reasons = []
+        if len(stored) == len(card_evaluations.top_cards[:3]):
+            logger.info("[2/3] All narratives pre-generated, skipping spending analysis")
+            spending_analysis = spending_summary
+        else:
+            logger.info("[2/3] Analyzing spending patterns...")
+            budget = deadline.stage_budget(SPENDING_ANALYSIS_BUDGET_SHARE)
+            try:
+                with track_timings(timings), timed_stage("spending_analysis"):
+                    spending_analysis = run_with_timeout(
+                        in_current_context(lambda: self.spending_analyzer.process(user_profile, timeout=budget)),
+                        budget
+                    )
+            except FuturesTimeoutError:
+                spending_analysis = spending_summary
+                degraded_reasons.append("Spending analysis timed out, used local summary")
+            except Exception as e:
+                spending_analysis = spending_summary
+                degraded_reasons.append(f"Spending analysis unavailable ({type(e).__name__}), used local summary")
+            if degraded_reasons:
+                logger.warning("⚠️  %s", degraded_reasons[-1])
+        logger.info(
+            "✓ Analysis complete: $%s/month, top categories %s, profile %s",
+            f"{spending_analysis.total_monthly_spend:,.2f}",
+            ", ".join(spending_analysis.top_categories),
+            spending_analysis.spending_profile
+        )
+        
+        # Step 3: Synthesize recommendations (narratives arrive as they finish)
+        logger.info("[3/3] Creating personalized recommendations...")
+        recommendations = []
+        narratives = self.recommendation_synthesizer.iter_recommendations(
             spending_analysis=spending_analysis,
             card_evaluations=card_evaluations,
-            user_profile=user_profile
+            user_profile=user_profile,
+            catalog=snapshot.catalog,
+            retriever=snapshot.retriever,
+            timeout=deadline.stage_budget(SYNTHESIS_BUDGET_SHARE),
+            stored=stored
+        )
+        synthesis_seconds = 0.0
+        while True:
+            step_start = time.perf_counter()
+            with track_timings(timings):
+                recommendation = next(narratives, None)
+            synthesis_seconds += time.perf_counter() - step_start
+            if recommendation is None:
+                break
+            recommendations.append(recommendation)
+            yield "recommendation", recommendation
+        output = self.recommendation_synthesizer.finalize(
+            recommendations, spending_analysis, degraded_reasons=degraded_reasons
         )
-        print(f"✓ Generated {len(recommendations.recommendations)} detailed recommendations")
+        # Time spent producing narratives, not waiting on whoever consumes the stream
+        with track_timings(timings):
+            record_stage("synthesis", synthesis_seconds)
+        logger.info("✓ Generated %d detailed recommendations", len(output.recommendations))
         
-        print("\n" + "=" * 60)
-        print("Recommendation Generation Complete!")
-        print("=" * 60)
+        # Templated fallbacks are never cached
+        if self.cache is not None and not output.degraded:
+            self.cache.store(cache_key, output, spending_summary, card_evaluations)
         
-        return recommendations
+        output.timings = self._finish_timings(timings, deadline)
+        logger.info("Recommendation generation complete (%.0f ms)", output.timings["total"])
+        
+        yield "complete", output
     
-    def get_quick_recommendation(self, user_profile: UserProfile) -> str:
-        """Get a quick text recommendation (simplified)"""
-        recommendations = self.process(user_profile)
+    def _template_output(
+        self,
+        user_profile: UserProfile,
+        snapshot: ResourceSnapshot,
+        deadline: Deadline,
+        reason: str
+    ) -> RecommendationOutput:
+        """Recommendations without any LLM call: stored narratives, else templates"""
+        timings = RequestTimings()
+        with track_timings(timings), timed_stage("evaluation"):
+            spending_summary = self.spending_analyzer.summarize(user_profile)
+            card_evaluations = self.card_evaluator.process(
+                spending_summary, user_profile, catalog=snapshot.catalog
+            )
+        stored = self.recommendation_synthesizer.stored_recommendations(
+            spending_summary, card_evaluations, catalog=snapshot.catalog
+        )
+        recommendations = [
+            stored.get(rank) or self.recommendation_synthesizer.template_recommendation(
+                rank, spending_summary, evaluation, snapshot.catalog.get(evaluation.card_id), reason=reason
+            )
+            for rank, evaluation in enumerate(card_evaluations.top_cards[:3], 1)
+        ]
+        output = self.recommendation_synthesizer.finalize(recommendations, spending_summary)
+        output.timings = self._finish_timings(timings, deadline)
+        return output
+    
+    @staticmethod
+    def _finish_timings(timings: RequestTimings, deadline: Deadline) -> Dict[str, float]:
+        """Record the request's total time and return its per-stage breakdown (ms)"""
+        with track_timings(timings):
+            record_stage("total", time.monotonic() - deadline.started_at)
+        return timings.as_dict()
+    
+    def evaluate(self, user_profile: UserProfile) -> CardEvaluations:
+        """Score and rank cards only (no LLM calls)"""
+        snapshot = self.snapshot()
+        spending_analysis = self.spending_analyzer.summarize(user_profile)
+        return as_card_evaluations(
+            self.card_evaluator.process(spending_analysis, user_profile, catalog=snapshot.catalog)
+        )
+    
+    def get_quick_recommendation(
+        self,
+        user_profile: UserProfile,
+        on_text: Optional[Callable[[str], None]] = None
+    ) -> str:
+        """Get a quick text recommendation (simplified)
+        
+        If on_text is given, it is called with each piece of output as soon as
+        it's ready: the ranked cards first, then each card's narrative.
+        """
+        recommendations = None
+        for event, payload in self.stream(user_profile):
+            if event == "preliminary" and on_text:
+                on_text(self._format_preliminary(payload))
+            elif event == "recommendation" and on_text:
+                on_text(self._format_recommendation(payload))
+            elif event == "complete":
+                recommendations = payload
+        
+        portfolio = f"💡 PORTFOLIO STRATEGY:\n{recommendations.portfolio_strategy}\n"
+        if on_text:
+            on_text(portfolio)
         
         # Format as readable text
         output = "\n\n"
@@ -74,29 +398,47 @@ class Orchestrator(BaseAgent):
         output += "=" * 60 + "\n\n"
         
         for rec in recommendations.recommendations:
-            output += f"{'🥇' if rec.rank == 1 else '🥈' if rec.rank == 2 else '🥉'} RANK #{rec.rank}: {rec.card_name}\n"
-            output += "-" * 60 + "\n\n"
-            
-            output += f"WHY THIS CARD:\n{rec.why_this_card}\n\n"
-            
-            output += f"FINANCIAL SUMMARY:\n"
-            output += f"  • Year 1 Value: ${rec.financial_summary['year_1_value']:,.2f}\n"
-            output += f"  • Year 2 Value: ${rec.financial_summary['year_2_value']:,.2f}\n"
-            output += f"  • Year 3 Value: ${rec.financial_summary['year_3_value']:,.2f}\n"
-            output += f"  • Annual Fee: ${rec.financial_summary['annual_fee']:,.2f}\n\n"
-            
-            output += f"HOW TO MAXIMIZE:\n"
-            for tip in rec.how_to_maximize:
-                output += f"  ✓ {tip}\n"
-            output += "\n"
-            
-            output += f"WATCH OUT FOR:\n"
-            for warning in rec.watch_out_for:
-                output += f"  ⚠  {warning}\n"
-            output += "\n"
-            
-            output += "=" * 60 + "\n\n"
-        
-        output += f"💡 PORTFOLIO STRATEGY:\n{recommendations.portfolio_strategy}\n"
+            output += self._format_recommendation(rec)
+        
+        output += portfolio
+        
+        return output
+    
+    def _format_preliminary(self, preliminary: PreliminaryResult) -> str:
+        """Format the ranked cards shown before narratives are ready"""
+        output = "\n\n"
+        output += "🎯 YOUR TOP CARDS (details on the way...)\n"
+        output += "=" * 60 + "\n"
+        for card in preliminary.top_cards:
+            summary = card.financial_summary
+            output += f"  #{card.rank} {card.card_name}: "
+            output += f"Year 1 ${summary['year_1_value']:,.2f} · Year 2 ${summary['year_2_value']:,.2f} · "
+            output += f"Year 3 ${summary['year_3_value']:,.2f}\n"
+        output += "=" * 60 + "\n\n"
+        return output
+    
+    def _format_recommendation(self, rec) -> str:
+        """Format one recommendation block"""
+        output = f"{'🥇' if rec.rank == 1 else '🥈' if rec.rank == 2 else '🥉'} RANK #{rec.rank}: {rec.card_name}\n"
+        output += "-" * 60 + "\n\n"
+        
+        output += f"WHY THIS CARD:\n{rec.why_this_card}\n\n"
+        
+        output += f"FINANCIAL SUMMARY:\n"
+        output += f"  • Year 1 Value: ${rec.financial_summary['year_1_value']:,.2f}\n"
+        output += f"  • Year 2 Value: ${rec.financial_summary['year_2_value']:,.2f}\n"
+        output += f"  • Year 3 Value: ${rec.financial_summary['year_3_value']:,.2f}\n"
+        output += f"  • Annual Fee: ${rec.financial_summary['annual_fee']:,.2f}\n\n"
         
+        output += f"HOW TO MAXIMIZE:\n"
+        for tip in rec.how_to_maximize:
+            output += f"  ✓ {tip}\n"
+        output += "\n"
+        
+        output += f"WATCH OUT FOR:\n"
+        for warning in rec.watch_out_for:
+            output += f"  ⚠  {warning}\n"
+        output += "\n"
+        
+        output += "=" * 60 + "\n\n"
         return output
@@ -0,0 +1,179 @@
+"""Recommendation cache keyed by bucketed spending profiles"""
+import threading
+import time
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from src.models.user_input import UserProfile
+from src.models.agent_outputs import (
+    SpendingAnalysis,
+    CardEvaluations,
+    Recommendation,
+    RecommendationOutput
+)
+from src.agents.recommendation_synthesizer import build_financial_summary, build_long_term_projection
+from src.utils.metrics import metrics
+from src.config import RECOMMENDATION_CACHE_SIZE, RECOMMENDATION_CACHE_TTL, CACHE_SPENDING_BUCKETS
+
+CACHE_LOOKUPS = metrics.counter(
+    "cardiq_recommendation_cache_lookups_total",
+    "Recommendation cache lookups by result (hit, miss, differed)",
+    ("result",)
+)
+
+
+def profile_cache_key(
+    user_profile: UserProfile,
+    buckets: List[float] = CACHE_SPENDING_BUCKETS,
+    version: str = ""
+) -> Tuple:
+    """Normalized key: spending bucket per category, credit score, fee cap, rewards type and travel plans"""
+    spending = user_profile.monthly_spending.model_dump()
+    spending_key = tuple(
+        bisect_right(buckets, float(spending[category] or 0)) for category in sorted(spending)
+    )
+    rewards_type = (user_profile.preferred_rewards_type or "").lower() or None
+    return (
+        version, spending_key, user_profile.credit_score, user_profile.max_annual_fee, rewards_type,
+        bool(user_profile.planning_to_travel)
+    )
+
+
+def _bonus_reachability(evaluations) -> List[bool]:
+    return [getattr(evaluation, 'signup_bonus_reachable', True) for evaluation in evaluations]
+
+
+class _CacheEntry:
+    """Narratives generated for one profile bucket"""
+
+    def __init__(
+        self,
+        card_ids: List[str],
+        top_categories: List[str],
+        bonus_reachable: List[bool],
+        output: RecommendationOutput
+    ):
+        self.card_ids = card_ids
+        self.top_categories = top_categories
+        self.bonus_reachable = bonus_reachable
+        # Per-user numbers are rebuilt on every hit rather than cached
+        self.narratives = [
+            rec.model_dump(exclude={'financial_summary', 'long_term_projection'})
+            for rec in output.recommendations
+        ]
+        self.portfolio_strategy = output.portfolio_strategy
+        self.created_at = time.time()
+
+
+class RecommendationCache:
+    """LRU cache of LLM narratives shared by users with similar spending
+
+    An entry is reused only when the new user's own evaluation ranks the
+    same top cards, with the same signup bonuses reachable, and their top
+    spending categories match; otherwise the lookup counts as "differed"
+    and fresh narratives are generated. On a hit, financial_summary and
+    long_term_projection are always rebuilt from the user's real numbers.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = RECOMMENDATION_CACHE_SIZE,
+        ttl: float = RECOMMENDATION_CACHE_TTL,
+        buckets: List[float] = CACHE_SPENDING_BUCKETS
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.buckets = sorted(buckets)
+        self._entries: "OrderedDict[Tuple, _CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.hits = 0
+        self.misses = 0
+        self.differed = 0
+
+    def key_for(self, user_profile: UserProfile, version: str = "") -> Tuple:
+        """Cache key for a profile (version separates catalog versions)"""
+        return profile_cache_key(user_profile, self.buckets, version)
+
+    def lookup(
+        self,
+        key: Tuple,
+        card_evaluations: CardEvaluations,
+        spending_summary: SpendingAnalysis
+    ) -> Optional[RecommendationOutput]:
+        """Cached recommendations re-priced for this user, or None"""
+        top_cards = card_evaluations.top_cards[:3]
+        with self._lock:
+            self.lookups += 1
+            entry = self._entries.get(key)
+            if entry is not None and time.time() - entry.created_at > self.ttl:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                CACHE_LOOKUPS.inc(result="miss")
+                return None
+
+            # Narratives mention whether the bonus is reachable, so that must match too
+            if ([e.card_id for e in top_cards] != entry.card_ids
+                    or _bonus_reachability(top_cards) != entry.bonus_reachable
+                    or spending_summary.top_categories != entry.top_categories):
+                self.differed += 1
+                CACHE_LOOKUPS.inc(result="differed")
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+        CACHE_LOOKUPS.inc(result="hit")
+
+        recommendations = [
+            Recommendation(
+                **narrative,
+                financial_summary=build_financial_summary(evaluation),
+                long_term_projection=build_long_term_projection(evaluation)
+            )
+            for narrative, evaluation in zip(entry.narratives, top_cards)
+        ]
+        return RecommendationOutput(
+            recommendations=recommendations,
+            portfolio_strategy=entry.portfolio_strategy
+        )
+
+    def store(
+        self,
+        key: Tuple,
+        output: RecommendationOutput,
+        spending_summary: SpendingAnalysis,
+        card_evaluations: CardEvaluations
+    ):
+        """Cache freshly generated recommendations for a key"""
+        entry = _CacheEntry(
+            card_ids=[rec.card_id for rec in output.recommendations],
+            top_categories=list(spending_summary.top_categories),
+            bonus_reachable=_bonus_reachability(card_evaluations.top_cards[:len(output.recommendations)]),
+            output=output
+        )
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop all entries (e.g. after a catalog reload)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """Hit rate and how often a cached narrative would have differed"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'lookups': self.lookups,
+                'hits': self.hits,
+                'misses': self.misses,
+                'differed': self.differed,
+                'hit_rate': round(self.hits / self.lookups, 4) if self.lookups else 0.0,
+                'differed_rate': round(self.differed / (self.hits + self.differed), 4)
+                if self.hits + self.differed else 0.0
+            }
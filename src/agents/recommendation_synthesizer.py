@@ -1,65 +1,332 @@
 """Recommendation Synthesizer Agent - Creates personalized recommendations"""
 import json
-from typing import List
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+from typing import Dict, Iterator, List, Optional
 from src.agents.base_agent import BaseAgent
+from src.api.model_router import ModelRouter
 from src.models.agent_outputs import (
     SpendingAnalysis,
     CardEvaluations,
     RecommendationOutput,
-    Recommendation
+    Recommendation,
+    OptimizationStrategy
 )
 from src.prompts import RECOMMENDATION_SYNTHESIZER_SYSTEM_PROMPT
-from src.data.card_loader import CardLoader
+from src.data.catalog import CardCatalog, get_default_catalog
 from src.rag.retriever import CardRetriever
+from src.agents.narrative_store import (
+    NarrativeStore,
+    card_fingerprint,
+    match_archetype,
+    get_default_narrative_store
+)
+from src.utils.metrics import in_current_context, metrics
+
+logger = logging.getLogger(__name__)
+
+# Narrative fields that depend only on the card and spending shape (stored per archetype)
+NARRATIVE_FIELDS = ("why_this_card", "how_to_maximize", "watch_out_for", "optimization_strategy")
+
+NARRATIVE_STORE_LOOKUPS = metrics.counter(
+    "cardiq_narrative_store_lookups_total",
+    "Pre-generated narrative lookups by result (hit, miss, outlier)",
+    ("result",)
+)
+
+def build_long_term_projection(evaluation) -> Dict[str, str]:
+    """Long-term projection text from the user's own CardEvaluation"""
+    return {
+        'one_year': f"${evaluation.net_value_year_1:,.2f} net value",
+        'two_years': f"${evaluation.net_value_year_2:,.2f} cumulative net value",
+        'three_years': f"${evaluation.net_value_year_3:,.2f} cumulative net value"
+    }
+
+def unreachable_bonus_warning(card: dict) -> str:
+    """Warning for a signup bonus the user's spending won't reach"""
+    signup_bonus = card.get('signup_bonus') or {}
+    return (
+        f"Your current spending won't reach the ${signup_bonus.get('spend_requirement') or 0:,.0f} "
+        f"signup bonus requirement in time, so the bonus isn't counted"
+    )
+
+def build_financial_summary(evaluation) -> Dict[str, float]:
+    """Financial summary for a recommendation, from the user's own CardEvaluation"""
+    return {
+        'year_1_value': evaluation.net_value_year_1,
+        'year_2_value': evaluation.net_value_year_2,
+        'year_3_value': evaluation.net_value_year_3,
+        'annual_rewards': evaluation.annual_rewards,
+        'annual_fee': evaluation.annual_fee,
+        'signup_bonus': evaluation.signup_bonus_value
+    }
 
 class RecommendationSynthesizerAgent(BaseAgent):
     """Agent that creates personalized card recommendations"""
     
-    def __init__(self, claude_client=None):
-        super().__init__(claude_client)
-        self.card_loader = CardLoader()
-        # RAG retriever for getting card details
-        try:
-            self.retriever = CardRetriever()
-        except:
-            # If vector DB not built yet, just use card loader
-            self.retriever = None
+    agent_name = "recommendation_synthesizer"
+    
+    def __init__(
+        self,
+        claude_client=None,
+        catalog: CardCatalog = None,
+        retriever: CardRetriever = None,
+        narrative_store: NarrativeStore = None,
+        router: ModelRouter = None
+    ):
+        super().__init__(claude_client, router=router)
+        self.catalog = catalog or get_default_catalog()
+        # RAG retriever for getting card details; the model and index load on
+        # first use, and if the vector DB isn't built we just use the catalog
+        self.retriever = retriever or CardRetriever(catalog=self.catalog)
+        # Pre-generated narratives per card x spending archetype; without an
+        # explicit store the default one is looked up per request (see narrative_store)
+        self._narrative_store = narrative_store
+    
+    @property
+    def narrative_store(self) -> Optional[NarrativeStore]:
+        """The store given to the agent, else the default store if it has been generated"""
+        if self._narrative_store is not None:
+            return self._narrative_store
+        return get_default_narrative_store()
     
     def get_system_prompt(self) -> str:
         return RECOMMENDATION_SYNTHESIZER_SYSTEM_PROMPT
     
+    def warm_up(self):
+        """Start loading the RAG retriever in the background"""
+        if self.retriever:
+            self.retriever.warm_up(background=True)
+    
     def process(
         self,
         spending_analysis: SpendingAnalysis,
         card_evaluations: CardEvaluations,
-        user_profile
+        user_profile,
+        catalog: CardCatalog = None,
+        retriever: CardRetriever = None,
+        timeout: Optional[float] = None
     ) -> RecommendationOutput:
-        """Create personalized recommendations for top 3 cards"""
+        """Create personalized recommendations for top 3 cards
+        
+        catalog and retriever override the agent's own for this call (e.g. a
+        pinned snapshot).
+        """
+        recommendations = list(self.iter_recommendations(
+            spending_analysis, card_evaluations, user_profile,
+            catalog=catalog, retriever=retriever, timeout=timeout
+        ))
+        return self.finalize(recommendations, spending_analysis)
+    
+    def iter_recommendations(
+        self,
+        spending_analysis: SpendingAnalysis,
+        card_evaluations: CardEvaluations,
+        user_profile,
+        catalog: CardCatalog = None,
+        retriever: CardRetriever = None,
+        timeout: Optional[float] = None,
+        stored: Optional[Dict[int, Recommendation]] = None
+    ) -> Iterator[Recommendation]:
+        """Yield the top 3 recommendations as each narrative completes
+        
+        Narratives pre-generated for the user's spending archetype are
+        yielded first (stored, by rank, if already looked up). The rest
+        come from concurrent Sonnet calls, in completion order rather than
+        rank order. A narrative that fails, can't be parsed or isn't done
+        within timeout seconds is replaced by a template built from the
+        card data and its evaluation.
+        """
+        catalog = catalog or self.catalog
         
         # Get top 3 cards
         top_3_evaluations = card_evaluations.top_cards[:3]
+        if not top_3_evaluations:
+            return
+        
+        if stored is None:
+            stored = self.stored_recommendations(spending_analysis, card_evaluations, catalog=catalog)
+        for rank in sorted(stored):
+            yield stored[rank]
+        
+        # Get full card details for the narratives generated live
+        live = [
+            (rank, evaluation, catalog.get(evaluation.card_id))
+            for rank, evaluation in enumerate(top_3_evaluations, 1) if rank not in stored
+        ]
+        if not live:
+            return
+        
+        # Get additional context via RAG if available (one batched search);
+        # under a deadline, don't wait for the index to load
+        rag_contexts = self._get_rag_contexts(
+            [card for _, _, card in live], retriever=retriever, wait_for_load=timeout is None
+        )
+        
+        pool = ThreadPoolExecutor(max_workers=len(live), thread_name_prefix="card-narrative")
+        futures = {
+            pool.submit(
+                in_current_context(self._create_recommendation), rank, spending_analysis, evaluation, card, rag_context, timeout
+            ): (rank, evaluation, card)
+            for (rank, evaluation, card), rag_context in zip(live, rag_contexts)
+        }
+        pending = set(futures)
+        try:
+            for future in as_completed(futures, timeout=timeout):
+                pending.discard(future)
+                rank, evaluation, card = futures[future]
+                try:
+                    yield future.result()
+                except Exception as e:
+                    logger.warning("⚠️  Narrative for %s failed (%s), using template", card['card_name'], type(e).__name__)
+                    yield self.template_recommendation(
+                        rank, spending_analysis, evaluation, card,
+                        reason=f"{card['card_name']}: narrative unavailable ({type(e).__name__})"
+                    )
+        except FuturesTimeoutError:
+            for future in sorted(pending, key=lambda f: futures[f][0]):
+                rank, evaluation, card = futures[future]
+                logger.warning("⚠️  Narrative for %s ran past its time budget, using template", card['card_name'])
+                yield self.template_recommendation(
+                    rank, spending_analysis, evaluation, card,
+                    reason=f"{card['card_name']}: narrative timed out"
+                )
+        finally:
+            # Don't hold the request for calls that are no longer awaited
+            pool.shutdown(wait=False, cancel_futures=True)
+    
+    def finalize(
+        self,
+        recommendations: List[Recommendation],
+        spending_analysis: SpendingAnalysis,
+        degraded_reasons: List[str] = None
+    ) -> RecommendationOutput:
+        """Order recommendations by rank and add the portfolio strategy
+        
+        The output is marked degraded if any narrative is a template or
+        degraded_reasons lists other fallbacks (e.g. the spending analysis).
+        """
+        recommendations = sorted(recommendations, key=lambda rec: rec.rank)
+        reasons = list(degraded_reasons or []) + [
+            rec.degraded_reason for rec in recommendations if rec.degraded_reason
+        ]
+        
+        # Create portfolio strategy
+        portfolio_strategy = self._create_portfolio_strategy(recommendations, spending_analysis)
+        
+        return RecommendationOutput(
+            recommendations=recommendations,
+            portfolio_strategy=portfolio_strategy,
+            degraded=bool(reasons),
+            degraded_reasons=reasons
+        )
+    
+    def stored_recommendations(
+        self,
+        spending_analysis: SpendingAnalysis,
+        card_evaluations: CardEvaluations,
+        catalog: CardCatalog = None
+    ) -> Dict[int, Recommendation]:
+        """Pre-generated recommendations for the top 3 cards, by rank (misses are left out)
         
-        recommendations = []
+        Users whose spending doesn't fit an archetype get none, so all
+        their narratives are generated live.
+        """
+        top_3_evaluations = card_evaluations.top_cards[:3]
+        narrative_store = self.narrative_store
+        if narrative_store is None or not top_3_evaluations:
+            return {}
+        archetype = match_archetype(spending_analysis)
+        if archetype is None:
+            NARRATIVE_STORE_LOOKUPS.inc(len(top_3_evaluations), result="outlier")
+            return {}
         
+        catalog = catalog or self.catalog
+        stored = {}
         for rank, evaluation in enumerate(top_3_evaluations, 1):
-            # Get full card details
-            card = self.card_loader.get_card_by_id(evaluation.card_id)
-            
-            # Get additional context via RAG if available
-            rag_context = self._get_rag_context(card) if self.retriever else ""
-            
-            # Create user message
-            user_message = self._create_user_message(
-                rank=rank,
-                spending_analysis=spending_analysis,
-                evaluation=evaluation,
-                card=card,
-                rag_context=rag_context
-            )
-            
-            # Call Sonnet for high-quality explanations
-            response = self._call_llm(user_message, use_sonnet=True, max_tokens=3000)
-            
+            card = catalog.get(evaluation.card_id)
+            narrative = narrative_store.get(card['card_id'], archetype.key, card_fingerprint(card))
+            if narrative is None:
+                NARRATIVE_STORE_LOOKUPS.inc(result="miss")
+                continue
+            NARRATIVE_STORE_LOOKUPS.inc(result="hit")
+            stored[rank] = self.stored_recommendation(rank, evaluation, card, narrative)
+        return stored
+    
+    def stored_recommendation(self, rank: int, evaluation, card: dict, narrative: Dict) -> Recommendation:
+        """Recommendation from a stored narrative and the user's own evaluation"""
+        watch_out_for = list(narrative['watch_out_for'])
+        if not getattr(evaluation, 'signup_bonus_reachable', True):
+            watch_out_for.append(unreachable_bonus_warning(card))
+        return Recommendation(
+            rank=rank,
+            card_id=card['card_id'],
+            card_name=card['card_name'],
+            why_this_card=narrative['why_this_card'],
+            financial_summary=build_financial_summary(evaluation),
+            how_to_maximize=narrative['how_to_maximize'],
+            watch_out_for=watch_out_for,
+            optimization_strategy=narrative['optimization_strategy'],
+            long_term_projection=build_long_term_projection(evaluation)
+        )
+    
+    def create_archetype_message(self, spending_analysis: SpendingAnalysis, evaluation, card: dict) -> str:
+        """User message for a narrative shared by every user with this spending shape
+
+        evaluation should come from an evaluator with bonus reachability off,
+        so nothing in the prompt depends on one user's ability to earn the bonus.
+        """
+        message = self._create_user_message(
+            rank=None,
+            spending_analysis=spending_analysis,
+            evaluation=evaluation,
+            card=card,
+            rag_context=""
+        )
+        return message + (
+            "\n\nThis recommendation is reused for every user with this general spending shape. "
+            "Describe value qualitatively and don't quote dollar amounts for the user; "
+            "their own numbers are shown separately. Whether a user can meet the signup bonus "
+            "spend requirement depends on their own spending, so don't say whether they will."
+        )
+    
+    def parse_narrative(self, response: str) -> Dict:
+        """Stored narrative fields from an LLM response (raises ValueError if malformed)"""
+        data = self._parse_response(response)
+        missing = [field for field in NARRATIVE_FIELDS if field not in data]
+        if missing:
+            raise ValueError(f"Narrative is missing {missing}")
+        narrative = {field: data[field] for field in NARRATIVE_FIELDS}
+        narrative['optimization_strategy'] = OptimizationStrategy(**narrative['optimization_strategy']).model_dump()
+        if not isinstance(narrative['why_this_card'], str) or not all(
+            isinstance(narrative[field], list) for field in ("how_to_maximize", "watch_out_for")
+        ):
+            raise ValueError("Narrative fields have the wrong types")
+        return narrative
+    
+    def _create_recommendation(
+        self,
+        rank: int,
+        spending_analysis: SpendingAnalysis,
+        evaluation,
+        card: dict,
+        rag_context: str,
+        timeout: Optional[float] = None
+    ) -> Recommendation:
+        """Generate the narrative for one card"""
+        # Create user message
+        user_message = self._create_user_message(
+            rank=rank,
+            spending_analysis=spending_analysis,
+            evaluation=evaluation,
+            card=card,
+            rag_context=rag_context
+        )
+        
+        # Call the routed model for this rank (Sonnet by default for high-quality explanations)
+        response = self._call_llm(user_message, rank=rank, timeout=timeout)
+        
+        with self._parse_timer(rank):
             # Parse response
             recommendation_data = self._parse_response(response)
             
@@ -69,56 +336,121 @@ class RecommendationSynthesizerAgent(BaseAgent):
             recommendation_data['card_name'] = card['card_name']
             
             # Add financial summary
-            recommendation_data['financial_summary'] = {
-                'year_1_value': evaluation.net_value_year_1,
-                'year_2_value': evaluation.net_value_year_2,
-                'year_3_value': evaluation.net_value_year_3,
-                'annual_rewards': evaluation.annual_rewards,
-                'annual_fee': evaluation.annual_fee,
-                'signup_bonus': evaluation.signup_bonus_value
-            }
+            recommendation_data['financial_summary'] = build_financial_summary(evaluation)
             
-            recommendations.append(Recommendation(**recommendation_data))
+            return Recommendation(**recommendation_data)
+    
+    def template_recommendation(
+        self,
+        rank: int,
+        spending_analysis: SpendingAnalysis,
+        evaluation,
+        card: dict,
+        reason: str
+    ) -> Recommendation:
+        """Deterministic recommendation from card data and its evaluation (no LLM)"""
+        rewards = card.get('rewards', {})
+        top_categories = spending_analysis.top_categories
+        base_rate = rewards.get('other', 1)
+        bonus_categories = sorted(
+            (category for category in top_categories if rewards.get(category, 0) > base_rate),
+            key=lambda category: rewards[category],
+            reverse=True
+        )
         
-        # Create portfolio strategy
-        portfolio_strategy = self._create_portfolio_strategy(recommendations, spending_analysis)
+        why = (
+            f"For your spending, {card['card_name']} earns about ${evaluation.annual_rewards:,.2f} a year "
+            f"in rewards against a ${evaluation.annual_fee:,.0f} annual fee, for an estimated "
+            f"${evaluation.net_value_year_1:,.2f} in value in year one."
+        )
+        if bonus_categories:
+            why += f" It earns {rewards[bonus_categories[0]]}x on {bonus_categories[0]}, one of your top categories."
         
-        return RecommendationOutput(
-            recommendations=recommendations,
-            portfolio_strategy=portfolio_strategy
+        how_to_maximize = [
+            f"Use it for {category} purchases ({rewards[category]}x)" for category in bonus_categories
+        ]
+        signup_bonus = card.get('signup_bonus') or {}
+        if evaluation.signup_bonus_value > 0 and signup_bonus.get('spend_requirement'):
+            how_to_maximize.append(
+                f"Spend ${signup_bonus['spend_requirement']:,} in the first "
+                f"{signup_bonus.get('timeframe_months') or 3} months to earn the "
+                f"${evaluation.signup_bonus_value:,.0f} signup bonus"
+            )
+        for credit in card.get('annual_credits', [])[:2]:
+            how_to_maximize.append(f"Use the {credit['name']} (${credit['value']:,.0f}/year)")
+        if not how_to_maximize:
+            how_to_maximize.append(f"Use it as your everyday card at {base_rate}x on all purchases")
+        
+        watch_out_for = []
+        if evaluation.annual_fee > 0:
+            watch_out_for.append(f"${evaluation.annual_fee:,.0f} annual fee")
+        if card.get('foreign_transaction_fee'):
+            watch_out_for.append(f"{card['foreign_transaction_fee']}% foreign transaction fee")
+        if not getattr(evaluation, 'signup_bonus_reachable', True):
+            watch_out_for.append(unreachable_bonus_warning(card))
+        if not watch_out_for:
+            watch_out_for.append("Check the issuer's terms for rate caps and exclusions")
+        
+        return Recommendation(
+            rank=rank,
+            card_id=card['card_id'],
+            card_name=card['card_name'],
+            why_this_card=why,
+            financial_summary=build_financial_summary(evaluation),
+            how_to_maximize=how_to_maximize[:5],
+            watch_out_for=watch_out_for,
+            optimization_strategy=OptimizationStrategy(
+                use_this_card_for=bonus_categories or ["other"],
+                avoid_using_for=[]
+            ),
+            long_term_projection=build_long_term_projection(evaluation),
+            degraded_reason=reason
         )
     
     def _get_rag_context(self, card: dict) -> str:
         """Get additional context via RAG"""
-        if not self.retriever:
-            return ""
+        return self._get_rag_contexts([card])[0]
+    
+    def _get_rag_contexts(
+        self,
+        cards: List[dict],
+        retriever: CardRetriever = None,
+        wait_for_load: bool = True
+    ) -> List[str]:
+        """Get additional context via RAG for several cards in one search"""
+        retriever = retriever or self.retriever
+        contexts = [""] * len(cards)
+        if not retriever or not retriever.retry_due:
+            return contexts
+        if not wait_for_load and not retriever.is_ready:
+            retriever.warm_up(background=True)
+            return contexts
         
         try:
             # Search for cards with similar features
-            query = f"{card['card_name']} benefits features"
-            results = self.retriever.search(query, k=1)
-            if results:
-                return f"Additional context: {results[0].get('description', '')}"
+            queries = [f"{card['card_name']} benefits features" for card in cards]
+            for i, results in enumerate(retriever.search_many(queries, k=1)):
+                if results:
+                    contexts[i] = f"Additional context: {results[0].get('description', '')}"
         except:
             pass
         
-        return ""
+        return contexts
     
     def _create_user_message(
         self,
-        rank: int,
+        rank: Optional[int],
         spending_analysis: SpendingAnalysis,
         evaluation,
         card: dict,
         rag_context: str
     ) -> str:
-        """Create user message for LLM"""
-        
+        """Create user message for LLM (rank None leaves out the RANK line)"""
+        rank_line = f"RANK: #{rank}\n" if rank is not None else ""
         message = f"""Create a personalized recommendation for this credit card:
 
 CARD: {card['card_name']}
-RANK: #{rank}
-
+{rank_line}
 USER SPENDING PROFILE:
 - Total Monthly Spend: ${spending_analysis.total_monthly_spend:,.2f}
 - Top Categories: {', '.join(spending_analysis.top_categories)}
@@ -142,7 +474,7 @@ ANNUAL CREDITS:
 
 FINANCIAL VALUE:
 - Annual Rewards: ${evaluation.annual_rewards:,.2f}
-- Signup Bonus: ${evaluation.signup_bonus_value:,.2f}
+- Signup Bonus: ${evaluation.signup_bonus_value:,.2f}{'' if getattr(evaluation, 'signup_bonus_reachable', True) else " (spend requirement not reachable at the user's current spend)"}
 - Year 1 Net Value: ${evaluation.net_value_year_1:,.2f}
 - Year 2 Net Value: ${evaluation.net_value_year_2:,.2f}
 - Year 3 Net Value: ${evaluation.net_value_year_3:,.2f}
@@ -169,6 +501,8 @@ Output ONLY valid JSON."""
     def _create_portfolio_strategy(self, recommendations: List[Recommendation], spending_analysis: SpendingAnalysis) -> str:
         """Create overall portfolio strategy"""
         
+        if not recommendations:
+            return "No cards match your credit tier and preferences; try a higher fee cap or no rewards type preference."
         if len(recommendations) < 2:
             return f"Use {recommendations[0].card_name} as your primary card for all spending."
         
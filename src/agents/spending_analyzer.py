@@ -1,20 +1,23 @@
 """Spending Analyzer Agent - Analyzes user spending patterns"""
 import json
-from typing import Dict
+from typing import Dict, Optional
 from src.agents.base_agent import BaseAgent
 from src.models.user_input import UserProfile
 from src.models.agent_outputs import SpendingAnalysis
 from src.prompts import SPENDING_ANALYZER_SYSTEM_PROMPT
 from src.utils.calculations import calculate_spending_percentages
+from src.config import TOP_LEVEL_CATEGORIES
 
 class SpendingAnalyzerAgent(BaseAgent):
     """Agent that analyzes user spending patterns"""
     
+    agent_name = "spending_analyzer"
+    
     def get_system_prompt(self) -> str:
         return SPENDING_ANALYZER_SYSTEM_PROMPT
     
-    def process(self, user_profile: UserProfile) -> SpendingAnalysis:
-        """Analyze user spending and return insights"""
+    def process(self, user_profile: UserProfile, timeout: Optional[float] = None) -> SpendingAnalysis:
+        """Analyze user spending and return insights (timeout bounds the LLM call)"""
         
         # Prepare spending data
         spending_dict = user_profile.monthly_spending.model_dump()
@@ -22,14 +25,54 @@ class SpendingAnalyzerAgent(BaseAgent):
         # Create user message
         user_message = self._create_user_message(spending_dict, user_profile.credit_score)
         
-        # Call Haiku (fast and cheap for calculations)
-        response = self._call_llm(user_message, use_sonnet=False, max_tokens=1500)
+        # Call the routed model (Haiku by default: fast and cheap for calculations)
+        response = self._call_llm(user_message, timeout=timeout)
+        
+        # Parse JSON response into a SpendingAnalysis model
+        with self._parse_timer():
+            analysis_data = self._parse_response(response)
+            return SpendingAnalysis(**analysis_data)
+    
+    def summarize(self, user_profile: UserProfile) -> SpendingAnalysis:
+        """Compute a SpendingAnalysis locally, without calling the LLM
+        
+        Used where only the numbers matter (evaluation-only scoring) and the
+        narrative insights from Haiku aren't needed.
+        """
+        spending = user_profile.monthly_spending.model_dump()
+        top_level = {category: float(spending.get(category) or 0) for category in TOP_LEVEL_CATEGORIES}
+        
+        total_monthly = sum(top_level.values())
+        percentages = calculate_spending_percentages(top_level)
+        ranked = sorted(
+            (category for category, amount in top_level.items() if amount > 0),
+            key=lambda category: top_level[category],
+            reverse=True
+        )
+        top_categories = ranked[:3]
+        
+        if not top_categories:
+            spending_profile = "no_spending"
+        elif percentages[top_categories[0]] >= 40:
+            spending_profile = f"{top_categories[0]}_focused"
+        else:
+            spending_profile = "balanced_spender"
         
-        # Parse JSON response
-        analysis_data = self._parse_response(response)
+        insights = [f"Total spend is ${total_monthly:,.2f}/month (${total_monthly * 12:,.2f}/year)."]
+        if top_categories:
+            insights.append(
+                f"{top_categories[0].capitalize()} is the largest category at "
+                f"{percentages[top_categories[0]]}% of spending."
+            )
         
-        # Create and return SpendingAnalysis model
-        return SpendingAnalysis(**analysis_data)
+        return SpendingAnalysis(
+            total_monthly_spend=round(total_monthly, 2),
+            total_annual_spend=round(total_monthly * 12, 2),
+            top_categories=top_categories,
+            spending_profile=spending_profile,
+            insights=insights,
+            category_percentages=percentages
+        )
     
     def _create_user_message(self, spending: Dict[str, float], credit_score: str) -> str:
         """Create user message for LLM"""
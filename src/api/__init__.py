@@ -1,4 +1,17 @@
-"""API clients module"""
-from .claude_client import ClaudeClient
+"""API clients module
 
-__all__ = ["ClaudeClient"]
+Exports are imported on first access; the Anthropic SDK is only imported
+when a ClaudeClient is created.
+"""
+from src.utils.lazy import lazy_exports
+
+_EXPORTS = {
+    "ClaudeClient": ".claude_client",
+    "StubClaudeClient": ".stub_client",
+    "ModelRouter": ".model_router",
+    "ModelChoice": ".model_router",
+    "get_model_router": ".model_router"
+}
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+__all__ = list(_EXPORTS)
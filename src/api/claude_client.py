@@ -1,35 +1,119 @@
 """Claude API client wrapper"""
-from anthropic import Anthropic
-from src.config import ANTHROPIC_API_KEY, HAIKU_MODEL, SONNET_MODEL
+import time
+from typing import Optional
+from src.utils.single_flight import SingleFlight
+from src.utils.metrics import metrics
+from src.config import ANTHROPIC_API_KEY, HAIKU_MODEL, SONNET_MODEL, SINGLE_FLIGHT_ENABLED
+
+# Identical LLM calls in flight anywhere in the process share one API request
+llm_single_flight = SingleFlight()
+
+LLM_REQUEST_SECONDS = metrics.histogram(
+    "cardiq_llm_request_seconds",
+    "Latency of Anthropic API requests (coalesced callers count once)",
+    ("model",)
+)
+LLM_REQUESTS = metrics.counter("cardiq_llm_requests_total", "Anthropic API requests by outcome", ("model", "outcome"))
+LLM_TOKENS = metrics.counter("cardiq_llm_tokens_total", "Tokens billed by the Anthropic API", ("model", "kind"))
 
 class ClaudeClient:
     """Wrapper for Claude API calls"""
     
     def __init__(self, api_key: str = ANTHROPIC_API_KEY):
+        # Imported here so evaluation-only code never pays for the SDK import
+        from anthropic import Anthropic
         self.client = Anthropic(api_key=api_key)
         self.haiku_model = HAIKU_MODEL
         self.sonnet_model = SONNET_MODEL
     
-    def call_haiku(self, system_prompt: str, user_message: str, max_tokens: int = 2000) -> str:
+    @property
+    def message_batches(self):
+        """The SDK's Message Batches resource, or None on SDK versions without it"""
+        return getattr(self.client.messages, "batches", None)
+    
+    def call_haiku(
+        self,
+        system_prompt: str,
+        user_message: str,
+        max_tokens: int = 2000,
+        timeout: Optional[float] = None
+    ) -> str:
         """Call Claude Haiku (faster, cheaper)"""
-        message = self.client.messages.create(
-            model=self.haiku_model,
-            max_tokens=max_tokens,
-            system=system_prompt,
-            messages=[
-                {"role": "user", "content": user_message}
-            ]
-        )
-        return message.content[0].text
+        return self.call(self.haiku_model, system_prompt, user_message, max_tokens, timeout=timeout)
     
-    def call_sonnet(self, system_prompt: str, user_message: str, max_tokens: int = 3000) -> str:
+    def call_sonnet(
+        self,
+        system_prompt: str,
+        user_message: str,
+        max_tokens: int = 3000,
+        timeout: Optional[float] = None
+    ) -> str:
         """Call Claude Sonnet (better quality)"""
-        message = self.client.messages.create(
-            model=self.sonnet_model,
-            max_tokens=max_tokens,
-            system=system_prompt,
-            messages=[
-                {"role": "user", "content": user_message}
-            ]
-        )
-        return message.content[0].text
+        return self.call(self.sonnet_model, system_prompt, user_message, max_tokens, timeout=timeout)
+    
+    def call(
+        self,
+        model: str,
+        system_prompt: str,
+        user_message: str,
+        max_tokens: int,
+        temperature: Optional[float] = None,
+        timeout: Optional[float] = None
+    ) -> str:
+        """Create a message with any model, coalescing identical concurrent calls
+        
+        temperature and timeout (seconds) use the SDK defaults when None.
+        A caller joining an identical call waits at most its own timeout
+        (raising TimeoutError), and retries on its own if the shared call
+        timed out under the first caller's timeout.
+        """
+        options = {}
+        if temperature is not None:
+            options["temperature"] = temperature
+        started_at = time.monotonic()
+        
+        def create(timeout: Optional[float] = timeout):
+            request_options = options if timeout is None else {**options, "timeout": timeout}
+            start = time.perf_counter()
+            try:
+                message = self.client.messages.create(
+                    model=model,
+                    max_tokens=max_tokens,
+                    system=system_prompt,
+                    messages=[
+                        {"role": "user", "content": user_message}
+                    ],
+                    **request_options
+                )
+            except Exception:
+                LLM_REQUESTS.inc(model=model, outcome="error")
+                raise
+            finally:
+                LLM_REQUEST_SECONDS.observe(time.perf_counter() - start, model=model)
+            LLM_REQUESTS.inc(model=model, outcome="ok")
+            usage = getattr(message, "usage", None)
+            if usage is not None:
+                LLM_TOKENS.inc(usage.input_tokens, model=model, kind="input")
+                LLM_TOKENS.inc(usage.output_tokens, model=model, kind="output")
+            return message.content[0].text
+        
+        if not SINGLE_FLIGHT_ENABLED:
+            return create()
+        from anthropic import APITimeoutError
+        key = (model, max_tokens, temperature, system_prompt, user_message)
+        led = []
+        
+        def lead():
+            led.append(True)
+            return create()
+        
+        try:
+            return llm_single_flight.do(key, lead, timeout=timeout)
+        except APITimeoutError:
+            if led:
+                raise
+            # The first caller's timeout expired, not necessarily this caller's
+            remaining = None if timeout is None else timeout - (time.monotonic() - started_at)
+            if remaining is not None and remaining <= 0:
+                raise
+            return create(remaining)
@@ -0,0 +1,151 @@
+"""Policy-driven choice of model, max_tokens and temperature per LLM call"""
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from src.config import HAIKU_MODEL, SONNET_MODEL, MODEL_ROUTING_POLICY
+
+logger = logging.getLogger(__name__)
+
+MODEL_ALIASES = {"haiku": HAIKU_MODEL, "sonnet": SONNET_MODEL}
+
+# Built-in policies; MODEL_ROUTING_POLICY may also be a path to a JSON file
+# with the same shape. Rules are checked in order and the first match wins.
+# A rule matches on any of "agent", "rank" (list) and "min_load"/"max_load"
+# (load is 0-1, e.g. busy worker slots plus queued requests over capacity).
+ROUTING_PRESETS = {
+    # Haiku for analysis, Sonnet for every narrative
+    "quality": {
+        "default": {"model": "haiku", "max_tokens": 2000},
+        "rules": [
+            {"agent": "spending_analyzer", "model": "haiku", "max_tokens": 1500},
+            {"agent": "recommendation_synthesizer", "model": "sonnet", "max_tokens": 3000}
+        ]
+    },
+    # Sonnet only for the #1 card, and everything on Haiku under load
+    "balanced": {
+        "default": {"model": "haiku", "max_tokens": 2000},
+        "rules": [
+            {"agent": "spending_analyzer", "model": "haiku", "max_tokens": 1500},
+            {"min_load": 0.75, "model": "haiku", "max_tokens": 2500},
+            {"agent": "recommendation_synthesizer", "rank": [1], "model": "sonnet", "max_tokens": 3000},
+            {"agent": "recommendation_synthesizer", "model": "haiku", "max_tokens": 2500}
+        ]
+    },
+    # Haiku everywhere
+    "economy": {
+        "default": {"model": "haiku", "max_tokens": 2000},
+        "rules": [
+            {"agent": "spending_analyzer", "model": "haiku", "max_tokens": 1500},
+            {"agent": "recommendation_synthesizer", "model": "haiku", "max_tokens": 2500}
+        ]
+    }
+}
+
+CHOICE_FIELDS = ("model", "max_tokens", "temperature")
+
+
+class ModelChoice:
+    """Model settings for one LLM call"""
+
+    def __init__(self, model: str, max_tokens: int, temperature: Optional[float] = None):
+        self.model = MODEL_ALIASES.get(model, model)
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+
+    def __repr__(self) -> str:
+        return f"ModelChoice(model={self.model!r}, max_tokens={self.max_tokens}, temperature={self.temperature})"
+
+
+class ModelRouter:
+    """Picks a ModelChoice per call from a routing policy
+
+    Every decision is logged and counted, so the cost/latency trade-offs
+    made under load are visible.
+    """
+
+    def __init__(self, policy: Dict, load_provider: Callable[[], float] = None):
+        self.policy = policy
+        self.default = dict(policy.get("default", {"model": "haiku", "max_tokens": 2000}))
+        self.rules: List[Dict] = list(policy.get("rules", []))
+        self.load_provider = load_provider
+        self._lock = threading.Lock()
+        self.decisions: Dict[str, int] = {}
+
+    @classmethod
+    def from_config(cls, policy: str = MODEL_ROUTING_POLICY) -> "ModelRouter":
+        """Load a preset by name or a JSON policy file by path (a new router each call)"""
+        if policy in ROUTING_PRESETS:
+            return cls(ROUTING_PRESETS[policy])
+
+        path = Path(policy)
+        if not path.exists():
+            raise ValueError(
+                f"Unknown model routing policy '{policy}': expected one of "
+                f"{sorted(ROUTING_PRESETS)} or a path to a JSON policy file"
+            )
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def set_load_provider(self, load_provider: Callable[[], float]):
+        """Set the callable reporting current load (0 = idle, 1 = at capacity)
+
+        A router reports one service's load, so a second provider is refused
+        rather than silently replacing the first.
+        """
+        if self.load_provider is not None and self.load_provider != load_provider:
+            raise ValueError("Router already has a load provider; give each service its own ModelRouter")
+        self.load_provider = load_provider
+
+    def choose(self, agent: str, rank: Optional[int] = None) -> ModelChoice:
+        """Model settings for a call from agent (and card rank, for narratives)"""
+        load = self.load_provider() if self.load_provider is not None else 0.0
+        rule = next((rule for rule in self.rules if self._matches(rule, agent, rank, load)), {})
+        settings = {**self.default, **{name: rule[name] for name in CHOICE_FIELDS if name in rule}}
+        choice = ModelChoice(**{name: settings.get(name) for name in CHOICE_FIELDS})
+
+        decision = f"{agent}{f'#{rank}' if rank else ''}:{choice.model}"
+        with self._lock:
+            self.decisions[decision] = self.decisions.get(decision, 0) + 1
+        logger.info(
+            "Routed %s%s to %s (max_tokens=%s, temperature=%s, load=%.2f, rule=%s)",
+            agent, f" rank {rank}" if rank else "", choice.model, choice.max_tokens,
+            choice.temperature, load, self.rules.index(rule) if rule else "default"
+        )
+        return choice
+
+    @staticmethod
+    def _matches(rule: Dict, agent: str, rank: Optional[int], load: float) -> bool:
+        if "agent" in rule and rule["agent"] != agent:
+            return False
+        if "rank" in rule and rank not in rule["rank"]:
+            return False
+        if "min_load" in rule and load < rule["min_load"]:
+            return False
+        if "max_load" in rule and load > rule["max_load"]:
+            return False
+        return True
+
+    def stats(self) -> Dict[str, int]:
+        """How many calls went to each model, per agent and rank"""
+        with self._lock:
+            return dict(self.decisions)
+
+
+_default_router: Optional[ModelRouter] = None
+_default_router_lock = threading.Lock()
+
+
+def get_model_router() -> ModelRouter:
+    """Get the process-wide router built from MODEL_ROUTING_POLICY
+
+    It has no load provider; a service that routes by its own load builds
+    its own router with ModelRouter.from_config().
+    """
+    global _default_router
+    if _default_router is None:
+        with _default_router_lock:
+            if _default_router is None:
+                _default_router = ModelRouter.from_config()
+    return _default_router
@@ -0,0 +1,133 @@
+"""Offline stand-in for ClaudeClient (benchmarks and runs without an API key)"""
+import json
+import re
+import itertools
+import threading
+import time
+from types import SimpleNamespace
+from typing import Dict, Iterator, List, Optional
+from src.prompts import SPENDING_ANALYZER_SYSTEM_PROMPT
+from src.config import TOP_LEVEL_CATEGORIES
+
+
+class StubClaudeClient:
+    """Answers every call with canned JSON shaped like real agent responses
+
+    Never touches the network. latency (seconds) is slept per call to
+    stand in for API time; calls counts calls per model.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def message_batches(self) -> "StubMessageBatches":
+        """Message Batches stand-in answered by call()"""
+        return StubMessageBatches(self)
+
+    def call_haiku(self, system_prompt: str, user_message: str, max_tokens: int = 2000,
+                   timeout: Optional[float] = None) -> str:
+        return self.call("haiku", system_prompt, user_message, max_tokens, timeout=timeout)
+
+    def call_sonnet(self, system_prompt: str, user_message: str, max_tokens: int = 3000,
+                    timeout: Optional[float] = None) -> str:
+        return self.call("sonnet", system_prompt, user_message, max_tokens, timeout=timeout)
+
+    def call(
+        self,
+        model: str,
+        system_prompt: str,
+        user_message: str,
+        max_tokens: int,
+        temperature: Optional[float] = None,
+        timeout: Optional[float] = None
+    ) -> str:
+        """Same signature as ClaudeClient.call"""
+        with self._lock:
+            self.calls[model] = self.calls.get(model, 0) + 1
+        if self.latency > 0:
+            time.sleep(self.latency if timeout is None else min(self.latency, timeout))
+
+        if system_prompt == SPENDING_ANALYZER_SYSTEM_PROMPT:
+            return json.dumps(self._spending_analysis(user_message))
+        return json.dumps(self._recommendation(user_message))
+
+    @staticmethod
+    def _spending_analysis(user_message: str) -> Dict:
+        match = re.search(r"Monthly Spending:\n(\{.*?\n\})", user_message, re.DOTALL)
+        spending = json.loads(match.group(1)) if match else {}
+        amounts = {category: float(spending.get(category) or 0) for category in TOP_LEVEL_CATEGORIES}
+        total = sum(amounts.values())
+        top_categories = sorted((c for c in amounts if amounts[c] > 0), key=amounts.get, reverse=True)[:3]
+        return {
+            "total_monthly_spend": round(total, 2),
+            "total_annual_spend": round(total * 12, 2),
+            "top_categories": top_categories,
+            "spending_profile": f"{top_categories[0]}_focused" if top_categories else "no_spending",
+            "category_percentages": {
+                category: round(amount / total * 100, 1) if total else 0.0
+                for category, amount in amounts.items()
+            },
+            "insights": [f"Total spend is ${total:,.2f}/month."]
+        }
+
+    @staticmethod
+    def _recommendation(user_message: str) -> Dict:
+        return {
+            "why_this_card": "Stub narrative: this card's rewards match your largest spending categories.",
+            "how_to_maximize": ["Use it for your top spending category"],
+            "watch_out_for": ["Check the annual fee against your rewards"],
+            "optimization_strategy": {
+                "use_this_card_for": ["dining"],
+                "pair_with": None,
+                "avoid_using_for": []
+            },
+            "long_term_projection": {
+                "year_1": "Strong first-year value",
+                "year_2": "Steady value",
+                "year_3": "Steady value"
+            }
+        }
+
+
+class StubMessageBatches:
+    """Offline stand-in for the SDK's messages.batches resource
+
+    create() answers every request at once through the stub client, so a
+    batch has already ended when it is first retrieved. Results have the
+    same attributes the job reads from the SDK's objects.
+    """
+
+    _ids = itertools.count(1)
+    _results: Dict[str, List] = {}
+
+    def __init__(self, client: StubClaudeClient):
+        self.client = client
+
+    def create(self, requests: List[Dict]) -> SimpleNamespace:
+        batch_id = f"msgbatch_stub_{next(self._ids)}"
+        results = []
+        for request in requests:
+            params = request["params"]
+            text = self.client.call(
+                params["model"],
+                params.get("system", ""),
+                params["messages"][0]["content"],
+                params["max_tokens"],
+                temperature=params.get("temperature")
+            )
+            message = SimpleNamespace(content=[SimpleNamespace(text=text)])
+            results.append(SimpleNamespace(
+                custom_id=request["custom_id"],
+                result=SimpleNamespace(type="succeeded", message=message)
+            ))
+        self._results[batch_id] = results
+        return self.retrieve(batch_id)
+
+    def retrieve(self, batch_id: str) -> SimpleNamespace:
+        return SimpleNamespace(id=batch_id, processing_status="ended")
+
+    def results(self, batch_id: str) -> Iterator[SimpleNamespace]:
+        return iter(self._results.get(batch_id, []))
@@ -0,0 +1,5 @@
+"""Offline bulk scoring and narrative generation module"""
+from .scoring import BulkScorer, iter_profile_rows, profile_from_row
+from .narratives import NarrativeJob, NarrativeTask
+
+__all__ = ["BulkScorer", "iter_profile_rows", "profile_from_row", "NarrativeJob", "NarrativeTask"]
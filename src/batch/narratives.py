@@ -0,0 +1,256 @@
+"""Pre-generate card narratives for every card x spending archetype"""
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Sequence, Tuple
+from src.agents.narrative_store import NarrativeStore, SpendingArchetype, card_fingerprint, iter_archetypes
+from src.data.catalog import CardCatalog, get_default_catalog
+from src.utils.rate_limit import RateLimiter
+from src.config import NARRATIVE_REQUESTS_PER_MINUTE, NARRATIVE_BATCH_POLL_SECONDS
+
+logger = logging.getLogger(__name__)
+
+GENERATION_MODES = ("auto", "batches", "direct")
+# Message Batches API limit is 100,000 requests per batch; stay well under it
+MAX_BATCH_REQUESTS = 10_000
+
+
+class NarrativeTask:
+    """One narrative to generate: a card for an archetype, with its evaluation"""
+
+    __slots__ = ("archetype", "spending_analysis", "evaluation", "card", "card_hash")
+
+    def __init__(self, archetype: SpendingArchetype, spending_analysis, evaluation, card: Dict, card_hash: str):
+        self.archetype = archetype
+        self.spending_analysis = spending_analysis
+        self.evaluation = evaluation
+        self.card = card
+        self.card_hash = card_hash
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        return self.card['card_id'], self.archetype.key
+
+
+class NarrativeJob:
+    """Generates missing or stale narratives into a NarrativeStore
+
+    Every card is evaluated for each archetype's representative profile
+    (or only each archetype's top_k cards), and the synthesizer's prompt is
+    sent with the archetype's spending in place of a user's. Narratives
+    already stored for the current card data are skipped, so re-running
+    resumes an interrupted job.
+
+    With the Message Batches API (mode "batches", or "auto" when the client
+    has it) requests go out in batches that are recorded in the store
+    before polling, so a restarted job picks up the same batches. Otherwise
+    (mode "direct") requests are sent by a thread pool through
+    client.call(), limited to requests_per_minute with retries and backoff,
+    and each narrative is stored as soon as it arrives.
+    """
+
+    def __init__(
+        self,
+        store: NarrativeStore,
+        claude_client=None,
+        catalog: CardCatalog = None,
+        archetypes: Optional[Sequence[SpendingArchetype]] = None,
+        card_ids: Optional[Sequence[str]] = None,
+        top_k: Optional[int] = None,
+        mode: str = "auto",
+        workers: int = 4,
+        requests_per_minute: float = NARRATIVE_REQUESTS_PER_MINUTE,
+        max_retries: int = 3,
+        batch_size: int = MAX_BATCH_REQUESTS,
+        poll_seconds: float = NARRATIVE_BATCH_POLL_SECONDS
+    ):
+        if mode not in GENERATION_MODES:
+            raise ValueError(f"Unknown generation mode '{mode}', expected one of {GENERATION_MODES}")
+        # Imported here so loading src.batch for bulk scoring doesn't pull in the agents
+        from src.agents.recommendation_synthesizer import RecommendationSynthesizerAgent
+        self.store = store
+        self.catalog = catalog or get_default_catalog()
+        # Archetype prompts don't use RAG context, so the retriever never loads
+        self.synthesizer = RecommendationSynthesizerAgent(claude_client, catalog=self.catalog, narrative_store=store)
+        self.archetypes = list(archetypes) if archetypes is not None else list(iter_archetypes())
+        self.card_ids = set(card_ids) if card_ids else None
+        self.top_k = top_k
+        self.mode = mode
+        self.workers = max(1, workers)
+        self.limiter = RateLimiter(requests_per_minute, burst=self.workers)
+        self.max_retries = max_retries
+        self.batch_size = min(max(1, batch_size), MAX_BATCH_REQUESTS)
+        self.poll_seconds = poll_seconds
+        self.choice = self.synthesizer.router.choose(self.synthesizer.agent_name, rank=1)
+
+    @property
+    def client(self):
+        return self.synthesizer.claude_client
+
+    def resolved_mode(self) -> str:
+        """"batches" or "direct" ("auto" picks batches when the client supports them)"""
+        if self.mode == "auto":
+            return "batches" if getattr(self.client, "message_batches", None) is not None else "direct"
+        return self.mode
+
+    def plan(self) -> Tuple[List[NarrativeTask], int]:
+        """(tasks still to generate, number already stored or in flight)"""
+        from src.agents.card_evaluator import CardEvaluatorAgent
+        from src.agents.spending_analyzer import SpendingAnalyzerAgent
+
+        profiles = [archetype.profile() for archetype in self.archetypes]
+        analyzer = SpendingAnalyzerAgent()
+        # Narratives are shared by every user of an archetype, so they're written
+        # without the representative profile's bonus reachability; each user's
+        # own unreachable-bonus warning is added when the narrative is served
+        evaluator = CardEvaluatorAgent(catalog=self.catalog, batch_window_ms=0, bonus_reachability=False)
+        evaluations = evaluator.evaluate_many(profiles, top_k=self.top_k or len(self.catalog))
+        done = {**self.store.fingerprints(), **self.store.in_flight()}
+        card_hashes = {}
+
+        tasks, skipped = [], 0
+        for archetype, profile, result in zip(self.archetypes, profiles, evaluations):
+            spending_analysis = analyzer.summarize(profile)
+            for evaluation in result.top_cards:
+                card_id = evaluation.card_id
+                if self.card_ids is not None and card_id not in self.card_ids:
+                    continue
+                card = self.catalog.get(card_id)
+                if card_id not in card_hashes:
+                    card_hashes[card_id] = card_fingerprint(card)
+                if done.get((card_id, archetype.key)) == card_hashes[card_id]:
+                    skipped += 1
+                    continue
+                tasks.append(NarrativeTask(archetype, spending_analysis, evaluation, card, card_hashes[card_id]))
+        return tasks, skipped
+
+    def _message(self, task: NarrativeTask) -> str:
+        return self.synthesizer.create_archetype_message(task.spending_analysis, task.evaluation, task.card)
+
+    def run(self, wait: bool = True) -> Dict:
+        """Generate everything missing; returns counts for this run
+
+        With batches and wait=False, new batches are submitted (and ended
+        ones collected) without waiting; run again later to collect the rest.
+        """
+        start = time.perf_counter()
+        mode = self.resolved_mode()
+        summary = {"mode": mode, "generated": 0, "failed": 0, "submitted": 0}
+
+        if mode == "batches":
+            # Collect batches left open by an earlier run before planning,
+            # so their requests aren't submitted twice
+            self._collect_batches(summary, wait=False)
+        tasks, summary["skipped"] = self.plan()
+        summary["planned"] = len(tasks)
+        logger.info("🗂️  %d narratives to generate (%d already stored or in flight)", len(tasks), summary["skipped"])
+
+        if mode == "batches":
+            self._submit_batches(tasks, summary)
+            self._collect_batches(summary, wait=wait)
+        else:
+            self._run_direct(tasks, summary)
+
+        summary["stored_total"] = len(self.store)
+        summary["seconds"] = time.perf_counter() - start
+        return summary
+
+    def _run_direct(self, tasks: List[NarrativeTask], summary: Dict):
+        """Send each request through client.call(), rate-limited, storing each result"""
+        def generate(task: NarrativeTask) -> Dict:
+            message = self._message(task)
+            for attempt in range(self.max_retries + 1):
+                self.limiter.acquire()
+                try:
+                    response = self.client.call(
+                        model=self.choice.model,
+                        system_prompt=self.synthesizer.get_system_prompt(),
+                        user_message=message,
+                        max_tokens=self.choice.max_tokens,
+                        temperature=self.choice.temperature
+                    )
+                    return self.synthesizer.parse_narrative(response)
+                except Exception:
+                    if attempt == self.max_retries:
+                        raise
+                    time.sleep(min(60.0, 2.0 ** attempt))
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="narrative-job") as pool:
+            futures = {pool.submit(generate, task): task for task in tasks}
+            for future in as_completed(futures):
+                task = futures[future]
+                try:
+                    narrative = future.result()
+                except Exception as e:
+                    summary["failed"] += 1
+                    logger.warning("⚠️  %s / %s: %s: %s", task.card['card_name'], task.archetype.key, type(e).__name__, e)
+                    continue
+                self.store.put(*task.key, task.card_hash, narrative, self.choice.model)
+                summary["generated"] += 1
+                done = summary["generated"] + summary["failed"]
+                if done % 25 == 0 or done == len(tasks):
+                    logger.info("Generated %d/%d narratives (%d failed)", summary["generated"], len(tasks), summary["failed"])
+
+    def _submit_batches(self, tasks: List[NarrativeTask], summary: Dict):
+        """Create Message Batches for tasks and record them in the store"""
+        batches = self.client.message_batches
+        for start in range(0, len(tasks), self.batch_size):
+            chunk = tasks[start:start + self.batch_size]
+            params = {"model": self.choice.model, "max_tokens": self.choice.max_tokens,
+                      "system": self.synthesizer.get_system_prompt()}
+            if self.choice.temperature is not None:
+                params["temperature"] = self.choice.temperature
+            # custom_id must be short and [A-Za-z0-9_-]; the store maps it back to the task
+            requests = [
+                {"custom_id": f"r{i}",
+                 "params": {**params, "messages": [{"role": "user", "content": self._message(task)}]}}
+                for i, task in enumerate(chunk)
+            ]
+            self.limiter.acquire()
+            batch = batches.create(requests=requests)
+            self.store.add_batch(
+                batch.id, self.choice.model,
+                [(f"r{i}", *task.key, task.card_hash) for i, task in enumerate(chunk)]
+            )
+            summary["submitted"] += len(chunk)
+            logger.info("📤 Submitted batch %s (%d requests)", batch.id, len(chunk))
+
+    def _collect_batches(self, summary: Dict, wait: bool):
+        """Store the results of every open batch that has ended (waiting for the rest if wait)"""
+        batches = self.client.message_batches
+        open_batches = self.store.open_batches()
+        while open_batches:
+            still_open = []
+            for batch_id, model in open_batches:
+                if batches.retrieve(batch_id).processing_status != "ended":
+                    still_open.append((batch_id, model))
+                    continue
+                self._store_batch_results(batch_id, model, summary)
+            if not still_open or not wait:
+                if still_open:
+                    logger.info("⏳ %d batches still processing; run again to collect them", len(still_open))
+                return
+            time.sleep(self.poll_seconds)
+            open_batches = still_open
+
+    def _store_batch_results(self, batch_id: str, model: str, summary: Dict):
+        requests = self.store.batch_requests(batch_id)
+        rows = []
+        for response in self.client.message_batches.results(batch_id):
+            task = requests.get(response.custom_id)
+            if task is None:
+                continue
+            card_id, archetype, card_hash = task
+            try:
+                if response.result.type != "succeeded":
+                    raise ValueError(f"request {response.result.type}")
+                rows.append((card_id, archetype, card_hash,
+                             self.synthesizer.parse_narrative(response.result.message.content[0].text), model))
+            except Exception as e:
+                summary["failed"] += 1
+                logger.warning("⚠️  %s / %s: %s: %s", card_id, archetype, type(e).__name__, e)
+        # Requests without a stored narrative (failed, expired) are planned again next run
+        self.store.put_many(rows)
+        self.store.finish_batch(batch_id)
+        summary["generated"] += len(rows)
+        logger.info("📥 Batch %s: stored %d narratives", batch_id, len(rows))
@@ -0,0 +1,232 @@
+"""Score large CSV/JSONL profile files across a process pool"""
+import csv
+import json
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+from pydantic import ValidationError
+from src.models.user_input import UserProfile, MonthlySpending
+from src.config import CARDS_JSON_PATH, COMPILED_CATALOG_PATH
+
+logger = logging.getLogger(__name__)
+
+SPENDING_FIELDS = list(MonthlySpending.model_fields)
+PROFILE_FIELDS = [name for name in UserProfile.model_fields if name != "monthly_spending"]
+ID_FIELDS = ("id", "profile_id", "user_id")
+RESULT_FIELDS = ("net_value_year_1", "net_value_year_2", "net_value_year_3", "ranking_score", "net_value_by_year")
+
+
+def iter_profile_rows(path: Path, skip: int = 0) -> Iterator[Tuple[int, Union[Dict, str]]]:
+    """Stream (row_number, row) pairs from a .csv or .jsonl/.ndjson file
+
+    CSV rows are dicts; JSONL rows are left as raw strings so parsing
+    happens in the workers. Blank JSONL lines are not counted as rows.
+    The first skip rows are skipped (used when resuming).
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        if suffix == ".csv":
+            rows = csv.DictReader(f)
+        elif suffix in (".jsonl", ".ndjson"):
+            rows = (line for line in f if line.strip())
+        else:
+            raise ValueError(f"Unsupported profile file '{path.name}', expected .csv, .jsonl or .ndjson")
+        yield from islice(enumerate(rows), skip, None)
+
+
+def profile_from_row(row: Union[Dict, str]) -> Tuple[Optional[str], UserProfile]:
+    """Validate one input row into (row_id, UserProfile)
+
+    Rows are either nested like UserProfile JSON or flat, with the spending
+    categories as top-level columns. Empty CSV cells count as missing.
+    """
+    if isinstance(row, str):
+        row = json.loads(row)
+    if not isinstance(row, dict):
+        raise ValueError("Row must be a JSON object")
+
+    row = {key: value for key, value in row.items() if value not in (None, "")}
+    row_id = next((str(row[name]) for name in ID_FIELDS if name in row), None)
+
+    if "monthly_spending" in row:
+        data = row
+    else:
+        data = {name: row[name] for name in PROFILE_FIELDS if name in row}
+        data["monthly_spending"] = {name: row[name] for name in SPENDING_FIELDS if name in row}
+    return row_id, UserProfile.model_validate(data)
+
+
+# Per-process state, set once by _init_worker
+_worker_evaluator = None
+
+
+def _init_worker(cards_path: Path, compiled_path: Path):
+    """Load the catalog once per worker process"""
+    global _worker_evaluator
+    from src.agents.card_evaluator import CardEvaluatorAgent
+    from src.data.catalog import load_catalog
+
+    catalog = load_catalog(cards_path, compiled_path)
+    _worker_evaluator = CardEvaluatorAgent(catalog=catalog, batch_window_ms=0)
+
+
+def _score_chunk(rows: List[Tuple[int, Union[Dict, str]]], top_k: int) -> Tuple[str, int]:
+    """Score a chunk of rows; returns (NDJSON text in row order, invalid row count)"""
+    records = []
+    valid = []
+    for row_number, row in rows:
+        try:
+            row_id, profile = profile_from_row(row)
+        except ValidationError as e:
+            records.append({"row": row_number, "error": "; ".join(
+                f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()
+            )})
+            continue
+        except ValueError as e:
+            records.append({"row": row_number, "error": str(e)})
+            continue
+        record = {"row": row_number, "id": row_id}
+        records.append(record)
+        valid.append((record, profile))
+
+    evaluations = _worker_evaluator.evaluate_many([profile for _, profile in valid], top_k=top_k)
+    for (record, _), evaluation in zip(valid, evaluations):
+        record["total_cards_evaluated"] = evaluation.total_cards_evaluated
+        record["top_cards"] = [
+            {
+                "card_id": card.card_id,
+                "card_name": card.card_name,
+                **{name: getattr(card, name) for name in RESULT_FIELDS}
+            }
+            for card in evaluation.top_cards
+        ]
+
+    text = "".join(json.dumps(record) + "\n" for record in records)
+    return text, len(records) - len(valid)
+
+
+class BulkScorer:
+    """Scores every profile in a file and writes one NDJSON record per row
+
+    The input is read in chunks and at most 2 chunks per worker are in
+    flight, so memory stays bounded regardless of file size. Results are
+    written in input order; after each chunk the output is flushed and a
+    checkpoint records how many rows and bytes are complete, so a crashed
+    run resumes where it stopped.
+    """
+
+    def __init__(
+        self,
+        input_path: Path,
+        output_path: Path,
+        workers: int = None,
+        chunk_size: int = 1000,
+        top_k: int = 5,
+        cards_path: Path = CARDS_JSON_PATH,
+        compiled_path: Path = COMPILED_CATALOG_PATH
+    ):
+        self.input_path = Path(input_path)
+        self.output_path = Path(output_path)
+        self.checkpoint_path = self.output_path.with_name(self.output_path.name + ".checkpoint")
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.top_k = top_k
+        self.cards_path = Path(cards_path)
+        self.compiled_path = Path(compiled_path)
+
+    def _load_checkpoint(self) -> Dict:
+        if not self.checkpoint_path.exists() or not self.output_path.exists():
+            return {"rows_done": 0, "output_bytes": 0, "invalid_rows": 0}
+
+        with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+            checkpoint = json.load(f)
+        if checkpoint.get("input") != str(self.input_path.resolve()):
+            raise ValueError(
+                f"Checkpoint {self.checkpoint_path} belongs to {checkpoint.get('input')}; "
+                "use a different output path or start over without resuming"
+            )
+        return checkpoint
+
+    def _save_checkpoint(self, rows_done: int, output_bytes: int, invalid_rows: int):
+        checkpoint = {
+            "input": str(self.input_path.resolve()),
+            "rows_done": rows_done,
+            "output_bytes": output_bytes,
+            "invalid_rows": invalid_rows,
+            "updated_at": time.time()
+        }
+        tmp_path = self.checkpoint_path.with_name(f".{self.checkpoint_path.name}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def _chunks(self, skip: int) -> Iterator[List]:
+        rows = iter_profile_rows(self.input_path, skip=skip)
+        while True:
+            chunk = list(islice(rows, self.chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+    def run(self, resume: bool = True) -> Dict:
+        """Score the file; returns counts for this run"""
+        checkpoint = self._load_checkpoint() if resume else {"rows_done": 0, "output_bytes": 0, "invalid_rows": 0}
+        rows_done = checkpoint["rows_done"]
+        invalid_rows = checkpoint["invalid_rows"]
+        if rows_done:
+            logger.info("↩️  Resuming after %d rows", rows_done)
+
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        start = time.perf_counter()
+        rows_this_run = 0
+        chunks_done = 0
+
+        mode = 'r+b' if rows_done else 'wb'
+        with open(self.output_path, mode) as out:
+            # Drop anything written after the last checkpoint (e.g. a partial chunk)
+            out.truncate(checkpoint["output_bytes"])
+            out.seek(checkpoint["output_bytes"])
+
+            def write_next(pending):
+                nonlocal rows_done, invalid_rows, rows_this_run, chunks_done
+                num_rows, future = pending.popleft()
+                text, num_invalid = future.result()
+                out.write(text.encode('utf-8'))
+                out.flush()
+                os.fsync(out.fileno())
+
+                rows_done += num_rows
+                rows_this_run += num_rows
+                invalid_rows += num_invalid
+                self._save_checkpoint(rows_done, out.tell(), invalid_rows)
+
+                chunks_done += 1
+                if chunks_done % 10 == 0:
+                    rate = rows_this_run / max(time.perf_counter() - start, 1e-9)
+                    logger.info("Scored %d rows (%.0f rows/s, %d invalid)", rows_done, rate, invalid_rows)
+
+            with ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.cards_path, self.compiled_path)
+            ) as pool:
+                pending = deque()
+                for chunk in self._chunks(skip=rows_done):
+                    pending.append((len(chunk), pool.submit(_score_chunk, chunk, self.top_k)))
+                    if len(pending) >= self.workers * 2:
+                        write_next(pending)
+                while pending:
+                    write_next(pending)
+
+        return {
+            "rows_scored": rows_this_run,
+            "rows_total": rows_done,
+            "invalid_rows": invalid_rows,
+            "seconds": time.perf_counter() - start
+        }
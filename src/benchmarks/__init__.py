@@ -0,0 +1,28 @@
+"""Offline benchmark suite"""
+from .suite import (
+    TARGETS,
+    DEFAULT_SIZES,
+    BenchmarkContext,
+    measure,
+    run_suite,
+    compare,
+    load_results,
+    save_results
+)
+from .fixtures import scaled_cards, scaled_catalog, HashingEncoder, hashing_embedder, build_vector_db
+
+__all__ = [
+    "TARGETS",
+    "DEFAULT_SIZES",
+    "BenchmarkContext",
+    "measure",
+    "run_suite",
+    "compare",
+    "load_results",
+    "save_results",
+    "scaled_cards",
+    "scaled_catalog",
+    "HashingEncoder",
+    "hashing_embedder",
+    "build_vector_db"
+]
@@ -0,0 +1,89 @@
+"""Offline fixtures for benchmarks: scaled catalogs, a hashing embedder and vector DBs"""
+import zlib
+from pathlib import Path
+from typing import Dict, List
+import numpy as np
+from src.data.card_loader import CardLoader
+from src.data.catalog import CardCatalog
+from src.rag.embeddings import EmbeddingGenerator
+from src.rag.index_builder import VectorDBBuilder
+from src.rag.lexical_index import tokenize
+
+# Same width as all-MiniLM-L6-v2, so FAISS costs match the real index
+EMBEDDING_DIMENSION = 384
+
+
+def scaled_cards(num_cards: int, seed: int = 0) -> List[Dict]:
+    """num_cards cards: the real catalog first, then perturbed copies of it
+
+    Copies get unique ids and names and jittered fees, bonuses and reward
+    rates, so rankings differ from the originals.
+    """
+    base = CardLoader().load_cards()
+    rng = np.random.default_rng(seed)
+    cards = []
+    for i in range(num_cards):
+        card = base[i % len(base)]
+        copy_number = i // len(base)
+        if copy_number == 0:
+            cards.append(card)
+            continue
+        jitter = rng.uniform(0.8, 1.2, size=len(card['rewards']) + 2)
+        signup_bonus = dict(card['signup_bonus']) if card.get('signup_bonus') else None
+        if signup_bonus:
+            signup_bonus['estimated_value'] = round(float(signup_bonus.get('estimated_value') or 0) * jitter[1], 2)
+        cards.append({
+            **card,
+            'card_id': f"{card['card_id']}_{copy_number}",
+            'card_name': f"{card['card_name']} {copy_number}",
+            'annual_fee': round(card['annual_fee'] * jitter[0]),
+            'signup_bonus': signup_bonus,
+            'rewards': {
+                category: round(rate * factor, 2)
+                for (category, rate), factor in zip(card['rewards'].items(), jitter[2:])
+            }
+        })
+    return cards
+
+
+class HashingEncoder:
+    """Deterministic bag-of-words embedder (feature hashing), no model download
+
+    Stands in for the SentenceTransformer with the same encode() interface,
+    so benchmarks exercise the real FAISS and retrieval code offline.
+    """
+
+    def __init__(self, dimension: int = EMBEDDING_DIMENSION):
+        self.dimension = dimension
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dimension
+
+    def encode(self, texts, convert_to_numpy: bool = True, show_progress_bar: bool = False, **kwargs) -> np.ndarray:
+        single = isinstance(texts, str)
+        texts = [texts] if single else texts
+        embeddings = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for token in tokenize(text):
+                embeddings[row, zlib.crc32(token.encode("utf-8")) % self.dimension] += 1.0
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        embeddings /= np.maximum(norms, 1e-12)
+        return embeddings[0] if single else embeddings
+
+
+def hashing_embedder(dimension: int = EMBEDDING_DIMENSION) -> EmbeddingGenerator:
+    """EmbeddingGenerator backed by HashingEncoder"""
+    embedder = EmbeddingGenerator(model_name="hashing")
+    embedder.model = HashingEncoder(dimension)
+    return embedder
+
+
+def build_vector_db(cards: List[Dict], path: Path, embedder: EmbeddingGenerator) -> Path:
+    """Write a FAISS + BM25 vector DB for cards to path (as scripts/build_vector_db.py does)"""
+    VectorDBBuilder(path, workers=0, embedder=embedder).build(cards)
+    return path
+
+
+def scaled_catalog(num_cards: int, seed: int = 0) -> CardCatalog:
+    """In-memory catalog of num_cards cards"""
+    return CardCatalog(scaled_cards(num_cards, seed))
@@ -0,0 +1,310 @@
+"""Benchmark targets, timing runner and baseline comparison"""
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from src.benchmarks.fixtures import scaled_cards, hashing_embedder, build_vector_db
+from src.data.catalog import CardCatalog
+from src.data.text_chunker import CardTextChunker
+from src.models.user_input import UserProfile, MonthlySpending
+from src.utils.calculations import calculate_category_rewards
+
+DEFAULT_SIZES = (25, 1_000, 100_000)
+# Change in median time (fraction) reported as a regression or improvement
+DEFAULT_THRESHOLD = 0.10
+
+RETRIEVAL_QUERIES = [
+    "cards with airport lounge access",
+    "no annual fee cash back on groceries",
+    "best card for dining and restaurants",
+    "travel card with no foreign transaction fees",
+    "hotel points and free night certificates"
+]
+
+
+def sample_profile() -> UserProfile:
+    """The example profile from main.py"""
+    return UserProfile(
+        monthly_spending=MonthlySpending(dining=1200, groceries=200, travel=200, gas=150, streaming=50, other=300),
+        credit_score="excellent",
+        max_annual_fee=500
+    )
+
+
+class BenchmarkContext:
+    """Fixtures for one catalog size, built on first use and shared by targets"""
+
+    def __init__(self, num_cards: int, workdir: Path, llm_latency: float = 0.0):
+        self.num_cards = num_cards
+        self.workdir = Path(workdir)
+        self.llm_latency = llm_latency
+        self.profile = sample_profile()
+        self._fixtures: Dict[str, Any] = {}
+
+    def _get(self, name: str, build: Callable[[], Any]) -> Any:
+        if name not in self._fixtures:
+            self._fixtures[name] = build()
+        return self._fixtures[name]
+
+    @property
+    def cards(self) -> List[Dict]:
+        return self._get("cards", lambda: scaled_cards(self.num_cards))
+
+    @property
+    def catalog(self) -> CardCatalog:
+        return self._get("catalog", lambda: CardCatalog(self.cards))
+
+    @property
+    def embedder(self):
+        return self._get("embedder", hashing_embedder)
+
+    @property
+    def vector_db_path(self) -> Path:
+        return self._get("vector_db_path", lambda: build_vector_db(
+            self.cards, self.workdir / f"vector_db_{self.num_cards}", self.embedder
+        ))
+
+    @property
+    def retriever(self):
+        def build():
+            from src.rag.retriever import CardRetriever
+            retriever = CardRetriever(
+                vector_db_path=self.vector_db_path,
+                catalog=self.catalog,
+                embedder=self.embedder,
+                batch_window_ms=0
+            )
+            retriever.warm_up(background=False)
+            return retriever
+        return self._get("retriever", build)
+
+    @property
+    def spending_summary(self):
+        def build():
+            from src.agents.spending_analyzer import SpendingAnalyzerAgent
+            return SpendingAnalyzerAgent().summarize(self.profile)
+        return self._get("spending_summary", build)
+
+
+def _cycle(items: Sequence) -> Callable[[], Any]:
+    """Returns the next item on each call, wrapping around"""
+    state = {"i": 0}
+
+    def next_item():
+        item = items[state["i"] % len(items)]
+        state["i"] += 1
+        return item
+    return next_item
+
+
+def bench_card_evaluator(ctx: BenchmarkContext) -> Callable[[], Any]:
+    from src.agents.card_evaluator import CardEvaluatorAgent
+    agent = CardEvaluatorAgent(catalog=ctx.catalog, batch_window_ms=0)
+    summary, profile = ctx.spending_summary, ctx.profile
+    return lambda: agent.process(summary, profile)
+
+
+def bench_category_rewards(ctx: BenchmarkContext) -> Callable[[], Any]:
+    spending = ctx.profile.monthly_spending.model_dump()
+    cards = [(card['rewards'], card['point_value']) for card in ctx.cards]
+
+    def run():
+        return [calculate_category_rewards(spending, rewards, point_value) for rewards, point_value in cards]
+    return run
+
+
+def bench_retriever_search(ctx: BenchmarkContext) -> Callable[[], Any]:
+    retriever, next_query = ctx.retriever, _cycle(RETRIEVAL_QUERIES)
+    return lambda: retriever.search(next_query(), k=5)
+
+
+def bench_vector_store_search(ctx: BenchmarkContext) -> Callable[[], Any]:
+    vector_store = ctx.retriever.vector_store
+    next_embedding = _cycle(ctx.embedder.embed_queries(RETRIEVAL_QUERIES))
+    return lambda: vector_store.search(next_embedding(), k=5)
+
+
+def bench_create_chunks(ctx: BenchmarkContext) -> Callable[[], Any]:
+    chunker, cards = CardTextChunker(), ctx.cards
+    return lambda: chunker.create_chunks(cards)
+
+
+def bench_vector_db_build(ctx: BenchmarkContext) -> Callable[[], Any]:
+    from src.rag.index_builder import VectorDBBuilder
+    builder = VectorDBBuilder(ctx.workdir / f"build_{ctx.num_cards}", workers=0, embedder=ctx.embedder)
+    cards = ctx.cards
+    return lambda: builder.build(cards)
+
+
+def bench_orchestrator(ctx: BenchmarkContext) -> Callable[[], Any]:
+    from src.agents.orchestrator import Orchestrator
+    from src.api.stub_client import StubClaudeClient
+    orchestrator = Orchestrator(
+        claude_client=StubClaudeClient(latency=ctx.llm_latency),
+        warm_up=False,
+        catalog=ctx.catalog,
+        retriever=ctx.retriever
+    )
+    # Measure the full pipeline on every run, not cache hits
+    orchestrator.cache = None
+    profile = ctx.profile
+    return lambda: orchestrator.process(profile, budget=0)
+
+
+# name -> (setup returning the function to time, number of items it processes)
+TARGETS: Dict[str, Tuple[Callable[[BenchmarkContext], Callable[[], Any]], Callable[[BenchmarkContext], int]]] = {
+    "card_evaluator.process": (bench_card_evaluator, lambda ctx: ctx.num_cards),
+    "calculate_category_rewards": (bench_category_rewards, lambda ctx: ctx.num_cards),
+    "card_retriever.search": (bench_retriever_search, lambda ctx: 1),
+    "vector_store.search": (bench_vector_store_search, lambda ctx: 1),
+    "card_text_chunker.create_chunks": (bench_create_chunks, lambda ctx: ctx.num_cards),
+    "vector_db_builder.build": (bench_vector_db_build, lambda ctx: ctx.num_cards),
+    "orchestrator.process": (bench_orchestrator, lambda ctx: 1),
+}
+
+
+def measure(fn: Callable[[], Any], repeat: int = 5, warmup: int = 1, min_time: float = 0.0) -> Dict[str, float]:
+    """Time fn() repeat times (more if the total is under min_time seconds), after warmup runs"""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    started = time.perf_counter()
+    while len(samples) < repeat or time.perf_counter() - started < min_time:
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    samples_ms = sorted(s * 1000 for s in samples)
+    return {
+        "iterations": len(samples_ms),
+        "min_ms": samples_ms[0],
+        "median_ms": statistics.median(samples_ms),
+        "mean_ms": statistics.fmean(samples_ms),
+        "p95_ms": samples_ms[min(len(samples_ms) - 1, int(round(0.95 * (len(samples_ms) - 1))))],
+        "stdev_ms": statistics.stdev(samples_ms) if len(samples_ms) > 1 else 0.0
+    }
+
+
+def environment() -> Dict[str, Any]:
+    """Where and on what code the results were measured"""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__
+    }
+
+
+def run_suite(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    targets: Optional[Sequence[str]] = None,
+    repeat: int = 5,
+    warmup: int = 1,
+    min_time: float = 0.0,
+    llm_latency: float = 0.0,
+    workdir: Optional[Path] = None,
+    on_result: Optional[Callable[[Dict], None]] = None
+) -> Dict[str, Any]:
+    """Run targets at each catalog size; returns {"environment", "config", "results"}
+
+    Fixtures (scaled catalog, vector DB) are built once per size and are
+    not part of any timing. on_result is called with each result as it's ready.
+    """
+    targets = list(targets or TARGETS)
+    unknown = [name for name in targets if name not in TARGETS]
+    if unknown:
+        raise ValueError(f"Unknown benchmark targets {unknown}, expected some of {sorted(TARGETS)}")
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="cardiq-bench-", dir=workdir) as tmp:
+        for num_cards in sizes:
+            ctx = BenchmarkContext(num_cards, Path(tmp), llm_latency=llm_latency)
+            for name in targets:
+                setup, count_items = TARGETS[name]
+                result = {"target": name, "cards": num_cards}
+                try:
+                    result.update(measure(setup(ctx), repeat=repeat, warmup=warmup, min_time=min_time))
+                    result["items"] = count_items(ctx)
+                    result["us_per_item"] = result["median_ms"] * 1000 / result["items"]
+                except Exception as e:
+                    result["error"] = f"{type(e).__name__}: {e}"
+                results.append(result)
+                if on_result:
+                    on_result(result)
+
+    return {
+        "environment": environment(),
+        "config": {
+            "sizes": list(sizes),
+            "targets": targets,
+            "repeat": repeat,
+            "warmup": warmup,
+            "min_time": min_time,
+            "llm_latency": llm_latency
+        },
+        "results": results
+    }
+
+
+def compare(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD
+) -> List[Dict[str, Any]]:
+    """Median time of each (target, cards) against the baseline run
+
+    status is "regression" or "improvement" when the change is beyond
+    threshold, "unchanged" within it, and "new"/"error" when there's
+    nothing to compare.
+    """
+    baseline_by_key = {
+        (result["target"], result["cards"]): result
+        for result in baseline.get("results", []) if "median_ms" in result
+    }
+    rows = []
+    for result in current.get("results", []):
+        row = {"target": result["target"], "cards": result["cards"], "median_ms": result.get("median_ms")}
+        previous = baseline_by_key.get((result["target"], result["cards"]))
+        if "median_ms" not in result:
+            row["status"] = "error"
+        elif previous is None:
+            row["status"] = "new"
+        else:
+            change = result["median_ms"] / previous["median_ms"] - 1 if previous["median_ms"] else 0.0
+            row["baseline_ms"] = previous["median_ms"]
+            row["change"] = change
+            row["status"] = (
+                "regression" if change > threshold
+                else "improvement" if change < -threshold
+                else "unchanged"
+            )
+        rows.append(row)
+    return rows
+
+
+def load_results(path: Path) -> Dict[str, Any]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_results(results: Dict[str, Any], path: Path):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+        f.write("\n")
@@ -13,16 +13,111 @@ PROJECT_ROOT = Path(__file__).parent.parent.parent
 ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
 HAIKU_MODEL = os.getenv("HAIKU_MODEL", "claude-3-5-haiku-20241022")
 SONNET_MODEL = os.getenv("SONNET_MODEL", "claude-sonnet-4-20250514")
+# Model per agent/rank/load: "quality", "balanced", "economy" or a JSON policy file
+MODEL_ROUTING_POLICY = os.getenv("MODEL_ROUTING_POLICY", "quality")
 
 # Embedding Configuration
 EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")  # "torch" or "onnx"
+EMBEDDING_ONNX_PATH = PROJECT_ROOT / os.getenv("EMBEDDING_ONNX_PATH", "models/embedding_onnx_int8/")
 
 # Paths
 CARDS_JSON_PATH = PROJECT_ROOT / os.getenv("CARDS_JSON_PATH", "data/raw/credit_cards_llm_special_features_filled.json")
+COMPILED_CATALOG_PATH = PROJECT_ROOT / os.getenv("COMPILED_CATALOG_PATH", "data/compiled/")
+CATALOG_FORMAT = os.getenv("CATALOG_FORMAT", "auto")  # "auto", "compiled" or "json"
+# Cards validated and written per chunk when compiling (bounds memory for large feeds)
+CATALOG_COMPILE_CHUNK_SIZE = int(os.getenv("CATALOG_COMPILE_CHUNK_SIZE", "10000"))
+# Decoded card dicts kept per compiled catalog (LRU; full iteration doesn't fill it)
+COMPILED_CATALOG_CARD_CACHE_SIZE = int(os.getenv("COMPILED_CATALOG_CARD_CACHE_SIZE", "4096"))
 VECTOR_DB_PATH = PROJECT_ROOT / os.getenv("VECTOR_DB_PATH", "data/vector_db/")
+# Vector DB builds: embedding worker processes (0 = embed in the build process) and chunks per batch
+_CPU_COUNT = os.cpu_count() or 1
+VECTOR_DB_BUILD_WORKERS = int(os.getenv("VECTOR_DB_BUILD_WORKERS", str(min(_CPU_COUNT, 4) if _CPU_COUNT > 1 else 0)))
+VECTOR_DB_BUILD_BATCH_SIZE = int(os.getenv("VECTOR_DB_BUILD_BATCH_SIZE", "256"))
 
 # RAG Configuration
 TOP_K_RETRIEVAL = int(os.getenv("TOP_K_RETRIEVAL", "5"))
+VECTOR_DB_MMAP = os.getenv("VECTOR_DB_MMAP", "true").lower() == "true"
+RAG_WARMUP = os.getenv("RAG_WARMUP", "false").lower() == "true"
+# Seconds before a failed retriever load (e.g. vector DB not built yet) is retried
+RETRIEVER_LOAD_RETRY_SECONDS = float(os.getenv("RETRIEVER_LOAD_RETRY_SECONDS", "30"))
+RETRIEVAL_MODE = os.getenv("RETRIEVAL_MODE", "hybrid")  # "dense", "lexical" or "hybrid"
+RRF_K = int(os.getenv("RRF_K", "60"))
+HYBRID_CANDIDATE_MULTIPLIER = int(os.getenv("HYBRID_CANDIDATE_MULTIPLIER", "4"))
+# Queries with at most this many words and enough BM25 hits skip the embedder (0 = never)
+HYBRID_LEXICAL_ONLY_MAX_TERMS = int(os.getenv("HYBRID_LEXICAL_ONLY_MAX_TERMS", "0"))
+
+# Hot reload: seconds between checks for a new catalog/vector DB (0 = disabled)
+HOT_RELOAD_INTERVAL = float(os.getenv("HOT_RELOAD_INTERVAL", "0"))
+
+# HTTP service
+SERVICE_HOST = os.getenv("SERVICE_HOST", "127.0.0.1")
+SERVICE_PORT = int(os.getenv("SERVICE_PORT", "8000"))
+SERVICE_WORKERS = int(os.getenv("SERVICE_WORKERS", "8"))  # max requests processed concurrently
+SERVICE_QUEUE_TIMEOUT = float(os.getenv("SERVICE_QUEUE_TIMEOUT", "30"))  # seconds to wait for a worker
+
+# Micro-batching of concurrent retrieval/scoring calls (window 0 = disabled). Off by
+# default since single-user callers (CLI, bulk scoring) have nothing to batch with;
+# the service uses SERVICE_MICROBATCH_WINDOW_MS instead
+MICROBATCH_WINDOW_MS = float(os.getenv("MICROBATCH_WINDOW_MS", "0"))
+SERVICE_MICROBATCH_WINDOW_MS = float(os.getenv("SERVICE_MICROBATCH_WINDOW_MS", "2"))
+MICROBATCH_MAX_SIZE = int(os.getenv("MICROBATCH_MAX_SIZE", "64"))
+
+# Recommendation cache keyed by bucketed spending profile
+RECOMMENDATION_CACHE_ENABLED = os.getenv("RECOMMENDATION_CACHE_ENABLED", "true").lower() == "true"
+RECOMMENDATION_CACHE_SIZE = int(os.getenv("RECOMMENDATION_CACHE_SIZE", "10000"))
+RECOMMENDATION_CACHE_TTL = float(os.getenv("RECOMMENDATION_CACHE_TTL", "86400"))  # seconds
+# Monthly spend bucket edges ($); each category is keyed by the bucket it falls in
+CACHE_SPENDING_BUCKETS = [
+    float(edge) for edge in
+    os.getenv("CACHE_SPENDING_BUCKETS", "25,50,100,150,200,300,400,500,750,1000,1500,2000,3000,5000").split(",")
+]
+
+# Pre-generated narratives per card x spending archetype (scripts/generate_narratives.py)
+NARRATIVE_STORE_ENABLED = os.getenv("NARRATIVE_STORE_ENABLED", "true").lower() == "true"
+NARRATIVE_STORE_PATH = PROJECT_ROOT / os.getenv("NARRATIVE_STORE_PATH", "data/narratives/narratives.sqlite3")
+# Total monthly spend band edges ($); spend at or above the last edge is an outlier
+NARRATIVE_SPEND_BANDS = [
+    float(edge) for edge in os.getenv("NARRATIVE_SPEND_BANDS", "1500,4000,12000").split(",")
+]
+# L1 distance (0-2) between a user's category shares and their archetype's beyond which
+# narratives are generated live. 0.4 means at most 20% of spend sits elsewhere than the
+# archetype assumes; flat profiles (top two categories under ~45% of spend) are outliers
+NARRATIVE_OUTLIER_MAX_DISTANCE = float(os.getenv("NARRATIVE_OUTLIER_MAX_DISTANCE", "0.4"))
+# Generation job: direct-call rate limit and Message Batches polling interval
+NARRATIVE_REQUESTS_PER_MINUTE = float(os.getenv("NARRATIVE_REQUESTS_PER_MINUTE", "50"))
+NARRATIVE_BATCH_POLL_SECONDS = float(os.getenv("NARRATIVE_BATCH_POLL_SECONDS", "30"))
+
+# Coalesce identical in-flight requests and LLM calls
+SINGLE_FLIGHT_ENABLED = os.getenv("SINGLE_FLIGHT_ENABLED", "true").lower() == "true"
+
+# End-to-end latency budget per recommendation (0 = no deadline) and each
+# LLM stage's share of it; stages that run over fall back to templates
+REQUEST_DEADLINE_SECONDS = float(os.getenv("REQUEST_DEADLINE_SECONDS", "20"))
+SPENDING_ANALYSIS_BUDGET_SHARE = float(os.getenv("SPENDING_ANALYSIS_BUDGET_SHARE", "0.25"))
+SYNTHESIS_BUDGET_SHARE = float(os.getenv("SYNTHESIS_BUDGET_SHARE", "0.7"))
+
+# Value projection and ranking: cumulative net value is projected for
+# PROJECTION_HORIZON_YEARS (discounted yearly at PROJECTION_DISCOUNT_RATE) and
+# cards are ranked by RANKING_OBJECTIVE: "blended" (RANKING_BLEND_WEIGHTS over
+# years 1, 2, 3, ...), "horizon" (value at the horizon), "annualized"
+# (horizon value per year) or "year_N" (value after N years)
+PROJECTION_HORIZON_YEARS = int(os.getenv("PROJECTION_HORIZON_YEARS", "3"))
+PROJECTION_DISCOUNT_RATE = float(os.getenv("PROJECTION_DISCOUNT_RATE", "0"))
+RANKING_OBJECTIVE = os.getenv("RANKING_OBJECTIVE", "blended")
+RANKING_BLEND_WEIGHTS = [float(w) for w in os.getenv("RANKING_BLEND_WEIGHTS", "0.3,0.4,0.3").split(",")]
+
+# Eligibility: a card is open to a credit tier if its min_credit_score is at
+# most the tier's top score. Signup bonuses the user's total monthly spend
+# can't reach in time are valued at $0 (cards without a stated timeframe
+# assume SIGNUP_BONUS_DEFAULT_TIMEFRAME_MONTHS)
+CREDIT_TIER_MAX_SCORES = {
+    "fair": 669,
+    "good": 739,
+    "excellent": 850
+}
+SIGNUP_BONUS_REACHABILITY = os.getenv("SIGNUP_BONUS_REACHABILITY", "true").lower() == "true"
+SIGNUP_BONUS_DEFAULT_TIMEFRAME_MONTHS = int(os.getenv("SIGNUP_BONUS_DEFAULT_TIMEFRAME_MONTHS", "3"))
 
 # Spending Categories
 SPENDING_CATEGORIES = [
@@ -36,6 +131,8 @@ SPENDING_CATEGORIES = [
     "transit",
     "other"
 ]
+# Categories that add up to total spend (flights, hotels and transit are subsets of travel)
+TOP_LEVEL_CATEGORIES = ["dining", "groceries", "travel", "gas", "streaming", "other"]
 
 # Point Valuation (cents per point)
 POINT_VALUES = {
@@ -47,5 +144,6 @@ POINT_VALUES = {
     "dining_rewards": 1.25
 }
 
-# Logging
+# Logging (CLI progress messages are INFO; the service only logs warnings by default)
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+SERVICE_LOG_LEVEL = os.getenv("SERVICE_LOG_LEVEL", "WARNING")
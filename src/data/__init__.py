@@ -1,5 +1,8 @@
 """Data loading and processing module"""
 from .card_loader import CardLoader
 from .text_chunker import CardTextChunker
+from .catalog import CardCatalog, get_default_catalog, load_catalog
+from .compiled_catalog import CompiledCardCatalog, compile_catalog
 
-__all__ = ["CardLoader", "CardTextChunker"]
+__all__ = ["CardLoader", "CardTextChunker", "CardCatalog", "CompiledCardCatalog",
+           "get_default_catalog", "load_catalog", "compile_catalog"]
@@ -1,10 +1,67 @@
 """Load and parse credit card data"""
 import json
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional
 from pathlib import Path
 from src.models.card import CreditCard
 from src.config import CARDS_JSON_PATH
 
+NDJSON_SUFFIXES = (".ndjson", ".jsonl")
+READ_BUFFER_CHARS = 1 << 20
+_WHITESPACE = " \t\r\n"
+
+def iter_json_records(path: Path, buffer_chars: int = READ_BUFFER_CHARS) -> Iterator[Dict]:
+    """Yield the objects of a JSON array file or an NDJSON file one at a time
+    
+    Reads buffer_chars at a time and decodes each object as soon as it is
+    complete, so memory stays flat no matter how large the file is.
+    """
+    path = Path(path)
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.suffix.lower() in NDJSON_SUFFIXES:
+            for line_number, line in enumerate(f, 1):
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError as e:
+                        raise ValueError(f"{path}:{line_number}: invalid JSON ({e})") from None
+            return
+        
+        decoder = json.JSONDecoder()
+        buffer = ""
+        while not buffer:
+            chunk = f.read(buffer_chars)
+            if not chunk:
+                break
+            buffer = chunk.lstrip(_WHITESPACE)
+        if not buffer.startswith("["):
+            raise ValueError(f"{path}: expected a JSON array of cards (or use .ndjson/.jsonl)")
+        pos, eof = 1, False
+        while True:
+            # Skip separators; refill when the buffer runs dry
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE + ",":
+                pos += 1
+            if pos == len(buffer):
+                if eof:
+                    raise ValueError(f"{path}: unexpected end of file inside the card array")
+                chunk = f.read(buffer_chars)
+                eof = not chunk
+                buffer, pos = chunk, 0
+                continue
+            if buffer[pos] == "]":
+                return
+            try:
+                record, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError as e:
+                if eof:
+                    raise ValueError(f"{path}: invalid JSON ({e})") from None
+                # The object continues past the buffer: read more and retry
+                chunk = f.read(max(buffer_chars, len(buffer) - pos))
+                eof = not chunk
+                buffer, pos = buffer[pos:] + chunk, 0
+                continue
+            yield record
+            pos = end
+
 class CardLoader:
     """Loads credit card data from JSON"""
     
@@ -13,12 +70,19 @@ class CardLoader:
         self._cards_cache = None
     
     def load_cards(self) -> List[Dict]:
-        """Load cards from JSON file as dictionaries"""
+        """Load cards from JSON (or NDJSON) file as dictionaries"""
         if self._cards_cache is None:
-            with open(self.json_path, 'r', encoding='utf-8') as f:
-                self._cards_cache = json.load(f)
+            if Path(self.json_path).suffix.lower() in NDJSON_SUFFIXES:
+                self._cards_cache = list(self.iter_cards())
+            else:
+                with open(self.json_path, 'r', encoding='utf-8') as f:
+                    self._cards_cache = json.load(f)
         return self._cards_cache
     
+    def iter_cards(self) -> Iterator[Dict]:
+        """Stream cards one at a time without loading the file (for large feeds)"""
+        return iter_json_records(self.json_path)
+    
     def load_cards_as_models(self) -> List[CreditCard]:
         """Load cards as Pydantic models"""
         cards_data = self.load_cards()
@@ -45,8 +109,6 @@ class CardLoader:
         return [c for c in cards if c['annual_fee'] <= max_fee]
     
     def filter_by_credit_score(self, credit_tier: str) -> List[Dict]:
-        """Filter cards by credit score requirement"""
-        cards = self.load_cards()
-        # For now, all cards accept good-excellent, so return all
-        # In future, could add more sophisticated filtering
-        return cards
+        """Filter cards to those whose min_credit_score is within credit_tier"""
+        from src.utils.eligibility import eligible_cards
+        return eligible_cards(self.load_cards(), credit_tier)
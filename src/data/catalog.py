@@ -0,0 +1,125 @@
+"""Process-wide, read-only card catalog shared by all agents"""
+import threading
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple
+from src.data.card_loader import CardLoader
+from src.config import CARDS_JSON_PATH, COMPILED_CATALOG_PATH, CATALOG_FORMAT
+
+
+class CardCatalog:
+    """Immutable card catalog parsed once and shared across agents and threads
+
+    The catalog and its indexes are never modified after construction, so
+    any number of threads can read from it without locking. Card dicts are
+    shared, not copied: treat them as read-only and copy before changing.
+    """
+
+    def __init__(self, cards: List[Dict], source_path: Optional[Path] = None):
+        self.source_path = source_path
+        self._cards: Tuple[Dict, ...] = tuple(cards)
+        self._by_id: Mapping[str, Dict] = MappingProxyType({c['card_id']: c for c in self._cards})
+        self._rewards_types: Tuple[str, ...] = tuple(sorted({c['rewards_type'] for c in self._cards}))
+        self._row_index = {c['card_id']: row for row, c in enumerate(self._cards)}
+        
+        # Imported here: compiled_catalog subclasses CardCatalog
+        from src.data.compiled_catalog import CatalogColumns
+        self._columns = CatalogColumns.from_cards(self._cards)
+
+    @classmethod
+    def from_file(cls, json_path: Optional[Path] = None) -> "CardCatalog":
+        """Parse the card JSON once into a catalog"""
+        loader = CardLoader(json_path)
+        return cls(loader.load_cards(), source_path=loader.json_path)
+
+    def __len__(self) -> int:
+        return len(self._cards)
+
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(self._cards)
+
+    def __contains__(self, card_id: str) -> bool:
+        return card_id in self._by_id
+
+    @property
+    def cards(self) -> Tuple[Dict, ...]:
+        """All cards, in file order"""
+        return self._cards
+
+    @property
+    def by_id(self) -> Mapping[str, Dict]:
+        """Read-only card_id -> card mapping"""
+        return self._by_id
+
+    @property
+    def rewards_types(self) -> Tuple[str, ...]:
+        """Distinct rewards types, sorted"""
+        return self._rewards_types
+
+    @property
+    def columns(self):
+        """Numeric CatalogColumns, row i describes card i"""
+        return self._columns
+
+    @property
+    def card_ids(self) -> List[str]:
+        return [c['card_id'] for c in self._cards]
+
+    def row_of(self, card_id: str) -> Optional[int]:
+        """Row number of a card in columns"""
+        return self._row_index.get(card_id)
+
+    def card_at(self, row: int) -> Dict:
+        """Card dict at a row"""
+        return self._cards[row]
+
+    def string_at(self, field: str, row: int) -> str:
+        """Read one text field of a card"""
+        return self._cards[row][field]
+
+    def get(self, card_id: str) -> Optional[Dict]:
+        """Get specific card by ID"""
+        return self._by_id.get(card_id)
+
+
+def load_catalog(
+    json_path: Optional[Path] = None,
+    compiled_path: Optional[Path] = None,
+    catalog_format: str = CATALOG_FORMAT
+) -> CardCatalog:
+    """Load the catalog, preferring the compiled artifact when it is up to date
+
+    catalog_format is "auto" (compiled if fresh, else JSON), "compiled" or "json".
+    """
+    json_path = Path(json_path or CARDS_JSON_PATH)
+    compiled_path = Path(compiled_path or COMPILED_CATALOG_PATH)
+    
+    if catalog_format != "json":
+        from src.data.compiled_catalog import CompiledCardCatalog, is_compiled_catalog_fresh
+        if catalog_format == "compiled":
+            return CompiledCardCatalog(compiled_path, source_path=json_path)
+        if json_path.exists() and is_compiled_catalog_fresh(compiled_path, json_path):
+            return CompiledCardCatalog(compiled_path, source_path=json_path)
+    
+    return CardCatalog.from_file(json_path)
+
+
+_default_catalog: Optional[CardCatalog] = None
+_default_catalog_lock = threading.Lock()
+
+
+def get_default_catalog() -> CardCatalog:
+    """Get the process-wide catalog, parsing the card JSON on first use"""
+    global _default_catalog
+    if _default_catalog is None:
+        with _default_catalog_lock:
+            if _default_catalog is None:
+                _default_catalog = load_catalog()
+    return _default_catalog
+
+
+def set_default_catalog(catalog: CardCatalog):
+    """Replace the process-wide catalog (e.g. with one loaded from another path)"""
+    global _default_catalog
+    with _default_catalog_lock:
+        _default_catalog = catalog
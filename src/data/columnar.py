@@ -0,0 +1,157 @@
+"""Memory-mapped columnar storage for string and numeric columns
+
+A string column is stored as two files:
+- ``<name>.bin``: all values UTF-8 encoded and concatenated
+- ``<name>.offsets.npy``: int64 offsets, value ``i`` spans ``offsets[i]:offsets[i+1]``
+
+Both files are opened with ``mmap`` so processes on the same host share
+page-cache pages, and values are only decoded when a row is accessed.
+Files are written under a temporary name and moved into place, so readers
+that already mapped the old version are never disturbed.
+"""
+import os
+import shutil
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+import numpy as np
+
+
+def _tmp_path(path: Path) -> Path:
+    return path.with_name(f".{path.name}.{os.getpid()}.tmp")
+
+
+def save_array(path: Path, array: np.ndarray):
+    """Save a numeric column, atomically replacing any existing file"""
+    path = Path(path)
+    tmp_path = _tmp_path(path)
+    with open(tmp_path, 'wb') as f:
+        np.save(f, np.ascontiguousarray(array))
+    os.replace(tmp_path, path)
+
+
+def load_array(path: Path, mmap: bool = True) -> np.ndarray:
+    """Load a numeric column, memory-mapped by default"""
+    return np.load(path, mmap_mode='r' if mmap else None, allow_pickle=False)
+
+
+class StringColumnWriter:
+    """Appends strings to a column on disk without holding them in memory"""
+
+    def __init__(self, directory: Path, name: str):
+        self.directory = Path(directory)
+        self.name = name
+        self.data_path = self.directory / f"{name}.bin"
+        self.offsets_path = self.directory / f"{name}.offsets.npy"
+        self._tmp_data_path = _tmp_path(self.data_path)
+        self._file = open(self._tmp_data_path, 'wb')
+        self._offsets = [0]
+
+    def append(self, value: str):
+        """Append a single value"""
+        encoded = (value or "").encode('utf-8')
+        self._file.write(encoded)
+        self._offsets.append(self._offsets[-1] + len(encoded))
+
+    def extend(self, values: Iterable[str]):
+        """Append several values"""
+        for value in values:
+            self.append(value)
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def close(self):
+        """Flush data and move both files into place"""
+        self._file.close()
+        save_array(self.offsets_path, np.asarray(self._offsets, dtype=np.int64))
+        os.replace(self._tmp_data_path, self.data_path)
+
+    def abort(self):
+        """Discard everything written, leaving any existing column untouched"""
+        self._file.close()
+        self._tmp_data_path.unlink(missing_ok=True)
+
+
+class ArrayColumnWriter:
+    """Appends rows to a numeric .npy column in chunks without holding it in memory
+
+    Rows go to a raw temporary file; close() writes the .npy header and
+    copies the rows after it, then moves the file into place.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._tmp_raw_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.raw")
+        self._file = open(self._tmp_raw_path, 'wb')
+        self.dtype: Optional[np.dtype] = None
+        self.row_shape: Tuple[int, ...] = ()
+        self.rows = 0
+
+    def append(self, rows: np.ndarray):
+        """Append a chunk of rows (all chunks must share dtype and row shape)"""
+        rows = np.ascontiguousarray(rows)
+        if self.dtype is None:
+            self.dtype, self.row_shape = rows.dtype, rows.shape[1:]
+        elif rows.dtype != self.dtype or rows.shape[1:] != self.row_shape:
+            raise ValueError(
+                f"{self.path.name}: expected rows of {self.dtype} {self.row_shape}, "
+                f"got {rows.dtype} {rows.shape[1:]}"
+            )
+        self._file.write(rows.tobytes())
+        self.rows += len(rows)
+
+    def close(self):
+        """Write the .npy file and move it into place"""
+        self._file.close()
+        tmp_path = _tmp_path(self.path)
+        header = {
+            'descr': np.lib.format.dtype_to_descr(self.dtype or np.dtype(np.float64)),
+            'fortran_order': False,
+            'shape': (self.rows,) + tuple(self.row_shape)
+        }
+        with open(tmp_path, 'wb') as out, open(self._tmp_raw_path, 'rb') as raw:
+            np.lib.format.write_array_header_1_0(out, header)
+            shutil.copyfileobj(raw, out, length=1 << 20)
+        self._tmp_raw_path.unlink()
+        os.replace(tmp_path, self.path)
+
+    def abort(self):
+        """Discard everything written, leaving any existing column untouched"""
+        self._file.close()
+        self._tmp_raw_path.unlink(missing_ok=True)
+
+
+class StringColumn:
+    """Read-only, memory-mapped string column with lazy per-row decoding"""
+
+    def __init__(self, directory: Path, name: str, mmap: bool = True):
+        directory = Path(directory)
+        self.offsets = load_array(directory / f"{name}.offsets.npy", mmap=mmap)
+        data_path = directory / f"{name}.bin"
+        if data_path.stat().st_size == 0:
+            # np.memmap cannot map an empty file
+            self.data = np.zeros(0, dtype=np.uint8)
+        elif mmap:
+            self.data = np.memmap(data_path, dtype=np.uint8, mode='r')
+        else:
+            self.data = np.fromfile(data_path, dtype=np.uint8)
+
+    @staticmethod
+    def exists(directory: Path, name: str) -> bool:
+        directory = Path(directory)
+        return (directory / f"{name}.bin").exists() and (directory / f"{name}.offsets.npy").exists()
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(f"Row {i} out of range for column of length {len(self)}")
+        start, end = int(self.offsets[i]), int(self.offsets[i + 1])
+        return self.data[start:end].tobytes().decode('utf-8')
+
+    def to_list(self) -> List[str]:
+        """Decode every value (use sparingly)"""
+        return [self[i] for i in range(len(self))]
@@ -0,0 +1,386 @@
+"""Compiled binary card catalog: NumPy columns plus a string table
+
+Layout of a compiled catalog directory (all files prefixed ``catalog.``):
+- one ``.npy`` file per numeric column, ``reward_rates`` is (cards x categories)
+- string columns (card_id, card_name, issuer, rewards_type, record), where
+  ``record`` is each card's original JSON, decoded only when a card is requested
+- ``catalog.manifest.json``, written last, with the format version, the
+  categories, rewards types and the stat of the source JSON it was compiled from
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Set, Tuple
+import numpy as np
+from pydantic import ValidationError
+from src.data.catalog import CardCatalog
+from src.data.columnar import StringColumn, StringColumnWriter, ArrayColumnWriter, save_array, load_array
+from src.models.card import CreditCard
+from src.config import SPENDING_CATEGORIES, CATALOG_COMPILE_CHUNK_SIZE, COMPILED_CATALOG_CARD_CACHE_SIZE
+
+PREFIX = "catalog"
+MANIFEST_FILE = f"{PREFIX}.manifest.json"
+# Bumped whenever columns change; older compiled catalogs are recompiled
+FORMAT_VERSION = 2
+STRING_FIELDS = ["card_id", "card_name", "issuer", "rewards_type", "record"]
+NUMERIC_FIELDS = [
+    "annual_fee",
+    "point_value",
+    "signup_bonus_value",
+    "annual_credits_value",
+    "foreign_transaction_fee",
+    "min_credit_score",
+    "spend_requirement",
+    "timeframe_months",
+    "first_year_fee_waived",
+    "rewards_type_code",
+    "reward_rates",
+]
+# Invalid cards listed in the error message before the rest are only counted
+MAX_REPORTED_ERRORS = 50
+
+
+class CatalogColumns:
+    """Numeric view of the catalog, one array entry per card, ready for vectorized scoring"""
+
+    def __init__(self, categories: List[str], rewards_types: Tuple[str, ...], **arrays: np.ndarray):
+        self.categories = list(categories)
+        self.rewards_types = tuple(rewards_types)
+        self.annual_fee = arrays['annual_fee']
+        self.point_value = arrays['point_value']
+        self.signup_bonus_value = arrays['signup_bonus_value']
+        self.annual_credits_value = arrays['annual_credits_value']
+        self.foreign_transaction_fee = arrays['foreign_transaction_fee']
+        self.min_credit_score = arrays['min_credit_score']
+        self.spend_requirement = arrays['spend_requirement']
+        self.timeframe_months = arrays['timeframe_months']
+        self.first_year_fee_waived = arrays['first_year_fee_waived']
+        self.rewards_type_code = arrays['rewards_type_code']
+        self.reward_rates = arrays['reward_rates']
+
+    @classmethod
+    def from_cards(
+        cls,
+        cards: Iterable[Dict],
+        categories: List[str] = SPENDING_CATEGORIES,
+        rewards_types: Optional[Tuple[str, ...]] = None
+    ) -> "CatalogColumns":
+        """Derive the numeric columns from card dicts
+        
+        rewards_types fixes the rewards_type codes (e.g. across chunks of one
+        catalog); by default they are the sorted types in cards.
+        """
+        cards = list(cards)
+        if rewards_types is None:
+            rewards_types = tuple(sorted({c['rewards_type'] for c in cards}))
+        type_codes = {rewards_type: i for i, rewards_type in enumerate(rewards_types)}
+        n = len(cards)
+
+        arrays = {
+            'annual_fee': np.zeros(n),
+            'point_value': np.zeros(n),
+            'signup_bonus_value': np.zeros(n),
+            'annual_credits_value': np.zeros(n),
+            'foreign_transaction_fee': np.zeros(n),
+            'min_credit_score': np.zeros(n, dtype=np.int32),
+            'spend_requirement': np.zeros(n),
+            'timeframe_months': np.zeros(n, dtype=np.int32),
+            'first_year_fee_waived': np.zeros(n, dtype=bool),
+            'rewards_type_code': np.zeros(n, dtype=np.int32),
+            'reward_rates': np.zeros((n, len(categories))),
+        }
+        for i, card in enumerate(cards):
+            signup_bonus = card.get('signup_bonus') or {}
+            eligibility = card.get('eligibility') or {}
+            arrays['annual_fee'][i] = float(card['annual_fee'])
+            arrays['point_value'][i] = float(card['point_value'])
+            arrays['signup_bonus_value'][i] = float(signup_bonus.get('estimated_value') or 0)
+            arrays['annual_credits_value'][i] = sum(
+                float(credit.get('value', 0)) for credit in card.get('annual_credits', [])
+            )
+            arrays['foreign_transaction_fee'][i] = float(card.get('foreign_transaction_fee') or 0)
+            arrays['min_credit_score'][i] = int(eligibility.get('min_credit_score') or 0)
+            arrays['spend_requirement'][i] = float(signup_bonus.get('spend_requirement') or 0)
+            arrays['timeframe_months'][i] = int(signup_bonus.get('timeframe_months') or 0)
+            arrays['first_year_fee_waived'][i] = bool(card.get('first_year_fee_waived'))
+            arrays['rewards_type_code'][i] = type_codes[card['rewards_type']]
+            rewards = card['rewards']
+            arrays['reward_rates'][i] = [float(rewards.get(category, 0)) for category in categories]
+
+        return cls(categories, rewards_types, **arrays)
+
+    def save(self, directory: Path):
+        for field in NUMERIC_FIELDS:
+            save_array(Path(directory) / f"{PREFIX}.{field}.npy", getattr(self, field))
+
+    @classmethod
+    def load(cls, directory: Path, categories: List[str], rewards_types: Tuple[str, ...], mmap: bool = True):
+        arrays = {
+            field: load_array(Path(directory) / f"{PREFIX}.{field}.npy", mmap=mmap)
+            for field in NUMERIC_FIELDS
+        }
+        return cls(categories, rewards_types, **arrays)
+
+    def __len__(self) -> int:
+        return len(self.annual_fee)
+
+
+def _check_card(card: Dict, row: int, seen_ids: Set[str], errors: List[str]) -> bool:
+    """Validate one card against CreditCard and earlier ids; appends any problems to errors"""
+    card_id = card.get('card_id', f'<row {row}>')
+    valid = True
+    try:
+        CreditCard(**card)
+    except ValidationError as e:
+        errors.append(f"{card_id}: {e}")
+        valid = False
+    if card_id in seen_ids:
+        errors.append(f"{card_id}: duplicate card_id")
+        valid = False
+    seen_ids.add(card_id)
+    return valid
+
+
+def _invalid_cards_error(errors: List[str]) -> ValueError:
+    shown = errors[:MAX_REPORTED_ERRORS]
+    if len(errors) > len(shown):
+        shown.append(f"... and {len(errors) - len(shown)} more")
+    return ValueError(f"{len(errors)} invalid card(s):\n" + "\n".join(shown))
+
+
+def validate_cards(cards: Iterable[Dict]) -> List[Dict]:
+    """Validate every card against the CreditCard model, reporting all failures at once"""
+    cards = list(cards)
+    errors = []
+    seen_ids = set()
+    for i, card in enumerate(cards):
+        _check_card(card, i, seen_ids, errors)
+    if errors:
+        raise _invalid_cards_error(errors)
+    return cards
+
+
+def source_stat(source_path: Path) -> Dict:
+    stat = Path(source_path).stat()
+    return {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+
+def compile_catalog(
+    cards: Iterable[Dict],
+    output_dir: Path,
+    source_path: Optional[Path] = None,
+    chunk_size: int = CATALOG_COMPILE_CHUNK_SIZE
+) -> Path:
+    """Validate cards and write the compiled catalog to output_dir
+    
+    cards may be a stream (e.g. CardLoader.iter_cards()): it is consumed
+    chunk_size cards at a time and each chunk is written straight to the
+    column files, so only one chunk of card dicts is in memory. If any card
+    is invalid, every problem is reported and nothing in output_dir changes.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    array_writers = {field: ArrayColumnWriter(output_dir / f"{PREFIX}.{field}.npy") for field in NUMERIC_FIELDS}
+    string_writers = {field: StringColumnWriter(output_dir, f"{PREFIX}.{field}") for field in STRING_FIELDS}
+    writers = list(array_writers.values()) + list(string_writers.values())
+
+    errors: List[str] = []
+    seen_ids: Set[str] = set()
+    # Codes in first-seen order while streaming, remapped to sorted order at the end
+    rewards_types: List[str] = []
+    num_cards = 0
+    try:
+        cards = iter(cards)
+        while True:
+            chunk = list(islice(cards, chunk_size))
+            if not chunk:
+                break
+            for i, card in enumerate(chunk):
+                _check_card(card, num_cards + i, seen_ids, errors)
+            num_cards += len(chunk)
+            if errors:
+                # Keep validating so every problem is reported, but stop writing
+                continue
+
+            for card in chunk:
+                if card['rewards_type'] not in rewards_types:
+                    rewards_types.append(card['rewards_type'])
+            _append_columns(array_writers, CatalogColumns.from_cards(chunk, rewards_types=tuple(rewards_types)))
+            for card in chunk:
+                string_writers['card_id'].append(card['card_id'])
+                string_writers['card_name'].append(card['card_name'])
+                string_writers['issuer'].append(card['issuer'])
+                string_writers['rewards_type'].append(card['rewards_type'])
+                string_writers['record'].append(json.dumps(card, ensure_ascii=False))
+
+        if errors:
+            raise _invalid_cards_error(errors)
+        if num_cards == 0:
+            # Still write correctly shaped (empty) columns
+            _append_columns(array_writers, CatalogColumns.from_cards([]))
+    except BaseException:
+        for writer in writers:
+            writer.abort()
+        raise
+
+    for writer in writers:
+        writer.close()
+
+    sorted_types = sorted(rewards_types)
+    if sorted_types != rewards_types:
+        codes_path = output_dir / f"{PREFIX}.rewards_type_code.npy"
+        remap = np.asarray([sorted_types.index(rewards_type) for rewards_type in rewards_types], dtype=np.int32)
+        save_array(codes_path, remap[load_array(codes_path, mmap=False)])
+
+    manifest = {
+        'format_version': FORMAT_VERSION,
+        'num_cards': num_cards,
+        'categories': list(SPENDING_CATEGORIES),
+        'rewards_types': sorted_types,
+        'compiled_at': time.time(),
+        'source': str(source_path) if source_path else None,
+        'source_stat': source_stat(source_path) if source_path else None,
+    }
+    tmp_path = output_dir / f".{MANIFEST_FILE}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    tmp_path.replace(output_dir / MANIFEST_FILE)
+    return output_dir
+
+
+def _append_columns(writers: Dict[str, ArrayColumnWriter], columns: CatalogColumns):
+    for field in NUMERIC_FIELDS:
+        writers[field].append(getattr(columns, field))
+
+
+def is_compiled_catalog_fresh(compiled_dir: Path, source_path: Path) -> bool:
+    """Whether compiled_dir holds a catalog compiled from the current source JSON in the current format"""
+    manifest_path = Path(compiled_dir) / MANIFEST_FILE
+    if not manifest_path.exists():
+        return False
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    return (manifest.get('format_version') == FORMAT_VERSION
+            and manifest.get('source_stat') == source_stat(source_path))
+
+
+class _CompiledCardMapping(Mapping):
+    """Read-only card_id -> card mapping that decodes a card only when it's accessed"""
+
+    def __init__(self, catalog: "CompiledCardCatalog"):
+        self._catalog = catalog
+
+    def __getitem__(self, card_id: str) -> Dict:
+        row = self._catalog.row_of(card_id)
+        if row is None:
+            raise KeyError(card_id)
+        return self._catalog.card_at(row)
+
+    def __contains__(self, card_id) -> bool:
+        return self._catalog.row_of(card_id) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._catalog.card_ids)
+
+    def __len__(self) -> int:
+        return len(self._catalog)
+
+
+class CompiledCardCatalog(CardCatalog):
+    """CardCatalog backed by a compiled, memory-mapped catalog directory
+
+    Loading maps the files and reads the manifest, so it takes milliseconds
+    regardless of catalog size. Card dicts are decoded from the string
+    table only when requested; the card_cache_size most recently requested
+    are kept. Iterating over every card decodes without caching, so a full
+    pass doesn't hold the whole catalog in memory.
+    """
+
+    def __init__(
+        self,
+        compiled_dir: Path,
+        source_path: Optional[Path] = None,
+        mmap: bool = True,
+        card_cache_size: int = COMPILED_CATALOG_CARD_CACHE_SIZE
+    ):
+        compiled_dir = Path(compiled_dir)
+        with open(compiled_dir / MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('format_version') != FORMAT_VERSION:
+            raise ValueError(
+                f"Compiled catalog at {compiled_dir} has format {manifest.get('format_version', 1)}, "
+                f"expected {FORMAT_VERSION}; re-run scripts/compile_catalog.py"
+            )
+
+        self.source_path = source_path
+        self.compiled_dir = compiled_dir
+        self._rewards_types = tuple(manifest['rewards_types'])
+        self._columns = CatalogColumns.load(
+            compiled_dir, manifest['categories'], self._rewards_types, mmap=mmap
+        )
+        self._strings = {
+            field: StringColumn(compiled_dir, f"{PREFIX}.{field}", mmap=mmap)
+            for field in STRING_FIELDS
+        }
+        self._row_index = None
+        self._card_cache: "OrderedDict[int, Dict]" = OrderedDict()
+        self._card_cache_size = card_cache_size
+        self._cache_lock = threading.Lock()
+        self._by_id = _CompiledCardMapping(self)
+
+    def __len__(self) -> int:
+        return len(self._columns)
+
+    def __iter__(self) -> Iterator[Dict]:
+        return (self._decode(row, cache=False) for row in range(len(self)))
+
+    def __contains__(self, card_id: str) -> bool:
+        return self.row_of(card_id) is not None
+
+    @property
+    def card_ids(self) -> List[str]:
+        return self._strings['card_id'].to_list()
+
+    def row_of(self, card_id: str) -> Optional[int]:
+        """Row number of a card, building the id index on first use"""
+        if self._row_index is None:
+            # Concurrent first calls may both build it; the result is identical
+            self._row_index = {card_id: row for row, card_id in enumerate(self.card_ids)}
+        return self._row_index.get(card_id)
+
+    def card_at(self, row: int) -> Dict:
+        """Decode the card dict stored at a row (recently requested cards are cached)"""
+        return self._decode(row, cache=True)
+
+    def _decode(self, row: int, cache: bool) -> Dict:
+        with self._cache_lock:
+            card = self._card_cache.get(row)
+            if card is not None:
+                if cache:
+                    self._card_cache.move_to_end(row)
+                return card
+        card = json.loads(self._strings['record'][row])
+        if cache and self._card_cache_size > 0:
+            with self._cache_lock:
+                self._card_cache[row] = card
+                self._card_cache.move_to_end(row)
+                while len(self._card_cache) > self._card_cache_size:
+                    self._card_cache.popitem(last=False)
+        return card
+
+    def string_at(self, field: str, row: int) -> str:
+        """Read one text field without decoding the whole card"""
+        return self._strings[field][row]
+
+    @property
+    def cards(self) -> Tuple[Dict, ...]:
+        """All cards (decodes every record on each access; prefer columns or iteration for bulk work)"""
+        return tuple(self)
+
+    def get(self, card_id: str) -> Optional[Dict]:
+        row = self.row_of(card_id)
+        return None if row is None else self.card_at(row)
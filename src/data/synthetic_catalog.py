@@ -0,0 +1,135 @@
+"""Synthetic card catalogs that follow the real card schema, for scale testing"""
+import json
+import random
+from pathlib import Path
+from typing import Dict, Iterator
+from src.data.card_loader import NDJSON_SUFFIXES
+from src.config import SPENDING_CATEGORIES, POINT_VALUES
+
+ISSUERS = [
+    "Chase", "American Express", "Capital One", "Citibank", "Wells Fargo", "Discover",
+    "Bank of America", "U.S. Bank", "Barclays", "Synchrony", "Navy Federal", "PNC"
+]
+PRODUCT_WORDS = [
+    "Sapphire", "Horizon", "Summit", "Voyager", "Harvest", "Metro", "Atlas", "Aurora",
+    "Pioneer", "Beacon", "Vista", "Quantum", "Cobalt", "Meridian", "Ember", "Harbor"
+]
+PRODUCT_TIERS = ["", "Preferred", "Premier", "Reserve", "Select", "Elite", "Everyday", "Plus"]
+REWARDS_TYPES = list(POINT_VALUES)
+# (credit_tier, min_credit_score)
+ELIGIBILITY_TIERS = [("fair", 580), ("good", 670), ("good_to_excellent", 690), ("excellent", 740)]
+# (name, value, category)
+ANNUAL_CREDITS = [
+    ("$100 airline fee credit", 100, "travel"),
+    ("$300 annual travel credit", 300, "travel"),
+    ("$120 dining credit", 120, "dining"),
+    ("$84 streaming credit", 84, "streaming"),
+    ("$200 rideshare credit", 200, "rideshare"),
+    ("$100 Global Entry credit", 100, "travel_security"),
+    ("Annual free night (est. $200 value)", 200, "hotel_free_night"),
+    ("$155 grocery membership credit", 155, "subscription")
+]
+SPECIAL_FEATURES = [
+    "Airport lounge access",
+    "No foreign transaction fees",
+    "Primary rental car coverage",
+    "Cell phone protection",
+    "Purchase protection and extended warranty",
+    "Trip cancellation and interruption insurance",
+    "Transfer points to airline and hotel partners",
+    "Automatic hotel elite status",
+    "Free checked bag on partner airlines",
+    "0% intro APR on purchases for 15 months"
+]
+BEST_FOR = {
+    "cash_back": "cash_back",
+    "flexible_points": "flexible_points",
+    "travel": "travel",
+    "business": "business",
+    "hotel_points": "hotel points",
+    "dining_rewards": "dining rewards"
+}
+SIGNUP_CURRENCY = {"cash_back": "usd", "travel": "miles"}
+
+
+def generate_card(rng: random.Random, index: int) -> Dict:
+    """One random card shaped like the cards in the real catalog"""
+    issuer = rng.choice(ISSUERS)
+    rewards_type = rng.choice(REWARDS_TYPES)
+    point_value = 0.01 if rewards_type in ("cash_back", "business") else rng.choice([0.01, 0.0125, 0.015])
+    premium = rng.random() < 0.3
+
+    base_rate = rng.choice([1.0, 1.0, 1.5, 2.0])
+    bonus_categories = rng.sample(SPENDING_CATEGORIES[:-1], k=rng.randint(1, 4))
+    rewards = {category: base_rate for category in SPENDING_CATEGORIES}
+    for category in bonus_categories:
+        rewards[category] = float(rng.choice([2, 3, 4, 5]))
+    # Travel subcategories earn at least the general travel rate
+    for category in ("flights", "hotels", "transit"):
+        rewards[category] = max(rewards[category], rewards["travel"])
+
+    if premium:
+        annual_fee = rng.choice([250, 325, 395, 450, 550, 695, 795])
+        credits = rng.sample(ANNUAL_CREDITS, k=rng.randint(1, 4))
+        bonus_amount = rng.choice([60000, 75000, 80000, 100000, 125000])
+    else:
+        annual_fee = rng.choice([0, 0, 0, 39, 89, 95, 99])
+        credits = rng.sample(ANNUAL_CREDITS, k=rng.randint(0, 1))
+        bonus_amount = rng.choice([150, 200, 250, 20000, 30000, 60000])
+    is_cash = bonus_amount < 1000
+    tier, min_score = rng.choice(ELIGIBILITY_TIERS[2:] if premium else ELIGIBILITY_TIERS)
+
+    word, product_tier = rng.choice(PRODUCT_WORDS), rng.choice(PRODUCT_TIERS)
+    card_name = " ".join(part for part in (issuer, word, product_tier, "Card") if part)
+    top = max(bonus_categories, key=rewards.get)
+    return {
+        "card_id": f"synthetic_{index:08d}",
+        "card_name": f"{card_name} {index}",
+        "issuer": issuer,
+        "annual_fee": annual_fee,
+        "signup_bonus": {
+            "amount": bonus_amount,
+            "currency": "usd" if is_cash else SIGNUP_CURRENCY.get(rewards_type, "points"),
+            "spend_requirement": rng.choice([500, 1000, 3000, 4000, 5000, 6000]),
+            "timeframe_months": rng.choice([3, 3, 6]),
+            "estimated_value": float(bonus_amount if is_cash else round(bonus_amount * point_value, 2))
+        },
+        "rewards": rewards,
+        "rewards_type": rewards_type,
+        "point_value": point_value,
+        "eligibility": {"credit_tier": tier, "min_credit_score": min_score},
+        "annual_credits": [{"name": name, "value": value, "category": category} for name, value, category in credits],
+        "description": (
+            f"{'Premium' if premium else 'Everyday'} {rewards_type.replace('_', ' ')} card earning "
+            f"{rewards[top]:g}x on {top} and {base_rate:g}x on everything else."
+        ),
+        "best_for": [BEST_FOR[rewards_type]],
+        "foreign_transaction_fee": 0.0 if premium or rng.random() < 0.4 else 3.0,
+        "special_features": rng.sample(SPECIAL_FEATURES, k=rng.randint(1, 4)),
+        "first_year_fee_waived": 0 < annual_fee < 100 and rng.random() < 0.5
+    }
+
+
+def generate_cards(num_cards: int, seed: int = 0) -> Iterator[Dict]:
+    """Yield num_cards synthetic cards (the same seed gives the same catalog)"""
+    rng = random.Random(seed)
+    for index in range(num_cards):
+        yield generate_card(rng, index)
+
+
+def write_synthetic_catalog(path: Path, num_cards: int, seed: int = 0) -> Path:
+    """Stream a synthetic catalog to path: NDJSON for .ndjson/.jsonl, else a JSON array"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    ndjson = path.suffix.lower() in NDJSON_SUFFIXES
+    with open(path, 'w', encoding='utf-8') as f:
+        if not ndjson:
+            f.write("[\n")
+        for i, card in enumerate(generate_cards(num_cards, seed)):
+            if ndjson:
+                f.write(json.dumps(card) + "\n")
+            else:
+                f.write(("" if i == 0 else ",\n") + json.dumps(card))
+        if not ndjson:
+            f.write("\n]\n")
+    return path
@@ -6,8 +6,12 @@ from .agent_outputs import (
     CardEvaluation,
     CardEvaluations,
     Recommendation,
-    RecommendationOutput
+    RecommendationOutput,
+    RankedCardSummary,
+    PreliminaryResult
 )
+from .service import RetrievalRequest, RetrievedCard, RetrievalResponse
+from .records import CardHit, CardEvaluationRecord, CardEvaluationsRecord
 
 __all__ = [
     "UserProfile",
@@ -17,5 +21,13 @@ __all__ = [
     "CardEvaluation",
     "CardEvaluations",
     "Recommendation",
-    "RecommendationOutput"
+    "RecommendationOutput",
+    "RankedCardSummary",
+    "PreliminaryResult",
+    "RetrievalRequest",
+    "RetrievedCard",
+    "RetrievalResponse",
+    "CardHit",
+    "CardEvaluationRecord",
+    "CardEvaluationsRecord"
 ]
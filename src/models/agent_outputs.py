@@ -23,6 +23,8 @@ class CardEvaluation(BaseModel):
     net_value_year_2: float
     net_value_year_3: float
     ranking_score: float
+    net_value_by_year: List[float] = []  # cumulative net value after years 1..projection horizon
+    signup_bonus_reachable: bool = True  # False when the user's spend can't meet the bonus requirement in time
 
 class CardEvaluations(BaseModel):
     """Output from Card Evaluator Agent"""
@@ -46,8 +48,25 @@ class Recommendation(BaseModel):
     watch_out_for: List[str]
     optimization_strategy: OptimizationStrategy
     long_term_projection: Dict[str, str]
+    degraded_reason: Optional[str] = None  # set when the narrative is a template fallback
 
 class RecommendationOutput(BaseModel):
     """Output from Recommendation Synthesizer Agent"""
     recommendations: List[Recommendation]
     portfolio_strategy: str
+    degraded: bool = False
+    degraded_reasons: List[str] = []
+    timings: Dict[str, float] = {}  # milliseconds per pipeline stage for this request
+
+class RankedCardSummary(BaseModel):
+    """Numbers for one recommended card, available before its narrative"""
+    rank: int
+    card_id: str
+    card_name: str
+    financial_summary: Dict[str, float]
+
+class PreliminaryResult(BaseModel):
+    """First phase of a progressive response: ranked cards and their values"""
+    spending_analysis: SpendingAnalysis
+    card_evaluations: CardEvaluations
+    top_cards: List[RankedCardSummary]
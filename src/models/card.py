@@ -37,3 +37,4 @@ class CreditCard(BaseModel):
     best_for: List[str]
     foreign_transaction_fee: float
     special_features: List[str]
+    first_year_fee_waived: bool = False  # annual fee is $0 for the first year
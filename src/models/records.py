@@ -0,0 +1,138 @@
+"""Lightweight internal records for the request hot path
+
+These are plain __slots__ classes: no validation, no per-instance dict.
+They have the same attributes as their pydantic counterparts, so agents
+use them interchangeably. Pydantic models are built from them only at
+the API boundary (to_model()).
+"""
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Optional
+from src.models.agent_outputs import CardEvaluation, CardEvaluations
+
+
+class CardHit(Mapping):
+    """A retrieval hit: a view of one catalog row plus its relevance score
+
+    score is higher-is-better in every retrieval mode: 1 / (1 + L2
+    distance) for dense search, the BM25 score for lexical search and the
+    reciprocal rank fusion score for hybrid search. Scores are only
+    comparable between hits of the same mode.
+
+    Reads like the old copied card dict (including '_relevance_score'),
+    but the card itself is only materialized when a field other than
+    card_id/card_name is read, and is never copied.
+    """
+
+    __slots__ = ("catalog", "row", "score", "_card")
+
+    def __init__(self, catalog, row: int, score: float):
+        self.catalog = catalog
+        self.row = row
+        self.score = score
+        self._card = None
+
+    @property
+    def card_id(self) -> str:
+        return self.catalog.string_at('card_id', self.row)
+
+    @property
+    def card_name(self) -> str:
+        return self.catalog.string_at('card_name', self.row)
+
+    @property
+    def card(self) -> Dict:
+        """The shared (read-only) catalog card"""
+        if self._card is None:
+            self._card = self.catalog.card_at(self.row)
+        return self._card
+
+    def __getitem__(self, key: str):
+        if key == '_relevance_score':
+            return self.score
+        return self.card[key]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.card
+        yield '_relevance_score'
+
+    def __len__(self) -> int:
+        return len(self.card) + 1
+
+    def __repr__(self) -> str:
+        return f"CardHit(card_id={self.card_id!r}, score={self.score!r})"
+
+    def to_dict(self) -> Dict:
+        """A private copy of the card with '_relevance_score' set"""
+        return {**self.card, '_relevance_score': self.score}
+
+
+class CardEvaluationRecord:
+    """Evaluation of one card for one profile (fields of CardEvaluation)"""
+
+    FIELDS = tuple(CardEvaluation.model_fields)
+    __slots__ = FIELDS
+
+    def __init__(
+        self,
+        card_id: str,
+        card_name: str,
+        annual_rewards: float,
+        signup_bonus_value: float,
+        annual_fee: float,
+        annual_credits_value: float,
+        net_value_year_1: float,
+        net_value_year_2: float,
+        net_value_year_3: float,
+        ranking_score: float,
+        net_value_by_year: Optional[List[float]] = None,
+        signup_bonus_reachable: bool = True
+    ):
+        self.card_id = card_id
+        self.card_name = card_name
+        self.annual_rewards = annual_rewards
+        self.signup_bonus_value = signup_bonus_value
+        self.annual_fee = annual_fee
+        self.annual_credits_value = annual_credits_value
+        self.net_value_year_1 = net_value_year_1
+        self.net_value_year_2 = net_value_year_2
+        self.net_value_year_3 = net_value_year_3
+        self.ranking_score = ranking_score
+        self.net_value_by_year = net_value_by_year if net_value_by_year is not None else []
+        self.signup_bonus_reachable = signup_bonus_reachable
+
+    def __repr__(self) -> str:
+        return f"CardEvaluationRecord(card_id={self.card_id!r}, ranking_score={self.ranking_score!r})"
+
+    def as_dict(self) -> Dict:
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+    def to_model(self) -> CardEvaluation:
+        # Values are already typed floats/strings, so skip re-validation
+        return CardEvaluation.model_construct(**self.as_dict())
+
+
+class CardEvaluationsRecord:
+    """Ranked evaluations for one profile (fields of CardEvaluations)"""
+
+    __slots__ = ("top_cards", "total_cards_evaluated")
+
+    def __init__(self, top_cards: List[CardEvaluationRecord], total_cards_evaluated: int):
+        self.top_cards = top_cards
+        self.total_cards_evaluated = total_cards_evaluated
+
+    def __repr__(self) -> str:
+        return (f"CardEvaluationsRecord(top_cards={[e.card_id for e in self.top_cards]!r}, "
+                f"total_cards_evaluated={self.total_cards_evaluated!r})")
+
+    def to_model(self) -> CardEvaluations:
+        return CardEvaluations.model_construct(
+            top_cards=[evaluation.to_model() for evaluation in self.top_cards],
+            total_cards_evaluated=self.total_cards_evaluated
+        )
+
+
+def as_card_evaluations(evaluations) -> Optional[CardEvaluations]:
+    """CardEvaluations model from a record (models pass through unchanged)"""
+    if evaluations is None or isinstance(evaluations, CardEvaluations):
+        return evaluations
+    return evaluations.to_model()
@@ -0,0 +1,20 @@
+"""Pydantic models for the HTTP service"""
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+class RetrievalRequest(BaseModel):
+    """Body of a retrieval request (one query or several)"""
+    query: Optional[str] = None
+    queries: List[str] = Field(default_factory=list)
+    k: int = Field(default=5, ge=1, le=50)
+    mode: Optional[str] = Field(default=None, pattern="^(dense|lexical|hybrid)$")
+
+class RetrievedCard(BaseModel):
+    """A single retrieval hit (score is higher-is-better in every mode)"""
+    card_id: str
+    card_name: str
+    score: float
+
+class RetrievalResponse(BaseModel):
+    """Retrieval hits, one list per query"""
+    results: List[List[RetrievedCard]]
@@ -1,6 +1,20 @@
-"""RAG module for embeddings and retrieval"""
-from .embeddings import EmbeddingGenerator
-from .vector_store import VectorStore
-from .retriever import CardRetriever
+"""RAG module for embeddings and retrieval
 
-__all__ = ["EmbeddingGenerator", "VectorStore", "CardRetriever"]
+Exports are imported on first access; FAISS and the embedding model's
+libraries are only imported when an index or model is actually loaded.
+"""
+from src.utils.lazy import lazy_exports
+
+_EXPORTS = {
+    "EmbeddingGenerator": ".embeddings",
+    "VectorStore": ".vector_store",
+    "ChunkMetadataStore": ".metadata_store",
+    "BM25Index": ".lexical_index",
+    "CardRetriever": ".retriever",
+    "ResourceSnapshot": ".hot_reload",
+    "VersionedResources": ".hot_reload",
+    "VectorDBBuilder": ".index_builder"
+}
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+__all__ = list(_EXPORTS)
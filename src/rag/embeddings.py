@@ -1,22 +1,55 @@
 """Generate embeddings for text chunks"""
+import logging
+import threading
+from pathlib import Path
 from typing import List
 import numpy as np
-from sentence_transformers import SentenceTransformer
-from src.config import EMBEDDING_MODEL
+from src.utils.metrics import timed_stage
+from src.config import EMBEDDING_MODEL, EMBEDDING_BACKEND, EMBEDDING_ONNX_PATH
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_BACKENDS = ("torch", "onnx")
 
 class EmbeddingGenerator:
-    """Generates embeddings using sentence transformers"""
+    """Generates embeddings using sentence transformers
     
-    def __init__(self, model_name: str = EMBEDDING_MODEL):
+    The "torch" backend runs the float32 SentenceTransformer; the "onnx"
+    backend runs an int8-quantized export of the same model with ONNX
+    Runtime (see scripts/export_onnx_embedder.py).
+    """
+    
+    def __init__(
+        self,
+        model_name: str = EMBEDDING_MODEL,
+        backend: str = EMBEDDING_BACKEND,
+        onnx_path: Path = EMBEDDING_ONNX_PATH
+    ):
+        if backend not in EMBEDDING_BACKENDS:
+            raise ValueError(f"Unknown embedding backend '{backend}', expected one of {EMBEDDING_BACKENDS}")
         self.model_name = model_name
+        self.backend = backend
+        self.onnx_path = onnx_path
         self.model = None
+        self._load_lock = threading.Lock()
     
     def load_model(self):
-        """Load the embedding model"""
-        if self.model is None:
-            print(f"Loading embedding model: {self.model_name}...")
-            self.model = SentenceTransformer(self.model_name)
-            print("✅ Model loaded successfully")
+        """Load the embedding model (safe to call from several threads)"""
+        if self.model is not None:
+            return
+        with self._load_lock:
+            if self.model is not None:
+                return
+            if self.backend == "onnx":
+                # Imported here so the ONNX backend never loads torch
+                from src.rag.onnx_embedder import OnnxSentenceEncoder
+                logger.info("Loading ONNX embedding model from %s...", self.onnx_path)
+                self.model = OnnxSentenceEncoder(self.onnx_path)
+            else:
+                from sentence_transformers import SentenceTransformer
+                logger.info("Loading embedding model: %s...", self.model_name)
+                self.model = SentenceTransformer(self.model_name)
+            logger.info("✅ Model loaded successfully")
     
     def embed_text(self, text: str) -> np.ndarray:
         """Generate embedding for a single text"""
@@ -24,18 +57,29 @@ class EmbeddingGenerator:
             self.load_model()
         return self.model.encode(text, convert_to_numpy=True)
     
+    def embed_queries(self, queries: List[str]) -> np.ndarray:
+        """Generate embeddings for a batch of queries in a single encode call"""
+        if self.model is None:
+            self.load_model()
+        with timed_stage("embedding"):
+            return self.model.encode(
+                queries,
+                convert_to_numpy=True,
+                show_progress_bar=False
+            )
+    
     def embed_texts(self, texts: List[str], show_progress: bool = True) -> np.ndarray:
         """Generate embeddings for multiple texts"""
         if self.model is None:
             self.load_model()
         
-        print(f"Generating embeddings for {len(texts)} texts...")
+        logger.info("Generating embeddings for %d texts...", len(texts))
         embeddings = self.model.encode(
             texts,
             convert_to_numpy=True,
             show_progress_bar=show_progress
         )
-        print(f"✅ Generated {len(embeddings)} embeddings")
+        logger.info("✅ Generated %d embeddings", len(embeddings))
         return embeddings
     
     def embed_chunks(self, chunks: List[dict]) -> np.ndarray:
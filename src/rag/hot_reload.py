@@ -0,0 +1,195 @@
+"""Versioned catalog + vector index handle with background hot reload"""
+import hashlib
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Callable, List, Optional
+from src.data.catalog import CardCatalog, load_catalog
+from src.data.compiled_catalog import MANIFEST_FILE as CATALOG_MANIFEST_FILE
+from src.rag.embeddings import EmbeddingGenerator
+from src.rag.retriever import CardRetriever
+from src.config import CARDS_JSON_PATH, VECTOR_DB_PATH, COMPILED_CATALOG_PATH, HOT_RELOAD_INTERVAL, MICROBATCH_WINDOW_MS
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = "manifest.json"
+# Files whose stat is used for the version when no manifest exists
+VECTOR_DB_FILES = ["faiss_index.bin", "bm25_index.json", "card_metadata.card_id.bin"]
+
+
+def compute_version(
+    cards_path: Path = CARDS_JSON_PATH,
+    vector_db_path: Path = VECTOR_DB_PATH,
+    compiled_path: Path = COMPILED_CATALOG_PATH
+) -> str:
+    """Fingerprint the catalog and vector DB on disk
+
+    The vector DB manifest (written last by build_vector_db.py) is hashed
+    when present, so a half-written build never looks like a new version.
+    Otherwise file mtimes and sizes are used.
+    """
+    digest = hashlib.sha256()
+    cards_path = Path(cards_path)
+    vector_db_path = Path(vector_db_path)
+
+    stat = cards_path.stat()
+    digest.update(f"{cards_path.name}:{stat.st_mtime_ns}:{stat.st_size}".encode())
+
+    # A freshly compiled catalog is picked up as a new version too
+    catalog_manifest_path = Path(compiled_path) / CATALOG_MANIFEST_FILE
+    if catalog_manifest_path.exists():
+        digest.update(catalog_manifest_path.read_bytes())
+
+    manifest_path = vector_db_path / MANIFEST_FILE
+    if manifest_path.exists():
+        digest.update(manifest_path.read_bytes())
+    else:
+        for name in VECTOR_DB_FILES:
+            path = vector_db_path / name
+            if path.exists():
+                stat = path.stat()
+                digest.update(f"{name}:{stat.st_mtime_ns}:{stat.st_size}".encode())
+
+    return digest.hexdigest()[:16]
+
+
+def write_manifest(vector_db_path: Path, **fields):
+    """Write the vector DB manifest; call after every other file is in place"""
+    vector_db_path = Path(vector_db_path)
+    manifest = {"built_at": time.time(), **fields}
+    tmp_path = vector_db_path / f".{MANIFEST_FILE}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    tmp_path.replace(vector_db_path / MANIFEST_FILE)
+
+
+class ResourceSnapshot:
+    """Catalog and retriever pinned at one version
+
+    A request should take a snapshot once and use it throughout, so it
+    finishes on the data it started with even if a reload happens.
+    """
+
+    def __init__(self, version: str, catalog: CardCatalog, retriever: CardRetriever):
+        self.version = version
+        self.catalog = catalog
+        self.retriever = retriever
+
+
+class VersionedResources:
+    """Holds the current ResourceSnapshot and swaps in new versions atomically
+
+    A background thread polls the files on disk; when the version changes it
+    loads and warms the new catalog and index off the request path, then
+    replaces the current snapshot. The embedding model is shared across
+    versions since only the data changes.
+    """
+
+    def __init__(
+        self,
+        cards_path: Path = CARDS_JSON_PATH,
+        vector_db_path: Path = VECTOR_DB_PATH,
+        compiled_path: Path = COMPILED_CATALOG_PATH,
+        poll_interval: float = HOT_RELOAD_INTERVAL,
+        embedder: Optional[EmbeddingGenerator] = None,
+        batch_window_ms: float = MICROBATCH_WINDOW_MS
+    ):
+        self.cards_path = Path(cards_path)
+        self.vector_db_path = Path(vector_db_path)
+        self.compiled_path = Path(compiled_path)
+        self.poll_interval = poll_interval
+        self.embedder = embedder or EmbeddingGenerator()
+        self.batch_window_ms = batch_window_ms
+
+        self._swap_lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._listeners: List[Callable[[ResourceSnapshot, ResourceSnapshot], None]] = []
+        self._failed_version = None
+        self._stop = threading.Event()
+        self._thread = None
+        self.reload_count = 0
+
+        self._current = self._load_snapshot(self._compute_version())
+
+    def current(self) -> ResourceSnapshot:
+        """Get the current snapshot (a plain reference read, safe from any thread)"""
+        return self._current
+
+    @property
+    def version(self) -> str:
+        return self._current.version
+
+    def add_listener(self, callback: Callable[[ResourceSnapshot, ResourceSnapshot], None]):
+        """Register callback(old, new), called after each swap (e.g. to drop caches)"""
+        self._listeners.append(callback)
+
+    def _compute_version(self) -> str:
+        return compute_version(self.cards_path, self.vector_db_path, self.compiled_path)
+
+    def _load_snapshot(self, version: str) -> ResourceSnapshot:
+        catalog = load_catalog(self.cards_path, self.compiled_path)
+        retriever = CardRetriever(
+            vector_db_path=self.vector_db_path,
+            catalog=catalog,
+            embedder=self.embedder,
+            batch_window_ms=self.batch_window_ms
+        )
+        return ResourceSnapshot(version, catalog, retriever)
+
+    def check_for_update(self) -> bool:
+        """Reload if the files changed; returns True if a new version was swapped in"""
+        with self._reload_lock:
+            try:
+                version = self._compute_version()
+            except FileNotFoundError:
+                # Files are mid-replace; try again on the next poll
+                return False
+            if version == self._current.version or version == self._failed_version:
+                return False
+
+            logger.info("🔄 Catalog/index changed, loading version %s...", version)
+            start = time.perf_counter()
+            try:
+                snapshot = self._load_snapshot(version)
+                # Warm the new index before it takes traffic (the model is shared)
+                if self._current.retriever.is_ready:
+                    snapshot.retriever.warm_up(background=False)
+            except Exception as e:
+                self._failed_version = version
+                logger.warning("⚠️  Failed to load version %s, keeping %s: %s", version, self._current.version, e)
+                return False
+
+            with self._swap_lock:
+                old = self._current
+                self._current = snapshot
+                self.reload_count += 1
+            logger.info("✅ Swapped in version %s (%.0f ms)", version, (time.perf_counter() - start) * 1000)
+
+        for callback in self._listeners:
+            callback(old, snapshot)
+        return True
+
+    def start(self) -> Optional[threading.Thread]:
+        """Start polling in a background thread (no-op if poll_interval <= 0)"""
+        if self.poll_interval <= 0 or self._thread is not None:
+            return self._thread
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._poll, name="catalog-hot-reload", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self):
+        """Stop the polling thread"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _poll(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.check_for_update()
+            except Exception as e:
+                logger.warning("⚠️  Hot reload check failed: %s", e)
@@ -0,0 +1,279 @@
+"""Streaming, parallel vector DB builder
+
+Cards are streamed from the catalog file, chunked, and embedded and
+tokenized in fixed-size batches by a pool of worker processes (each loads
+the model once). Finished batches are added to the FAISS index, the columnar
+metadata store and the BM25 index in input order, so row i is the same
+chunk in all three. Only the in-flight batches are held in memory besides
+the indexes themselves.
+"""
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from itertools import islice
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import numpy as np
+from src.data.text_chunker import CardTextChunker
+from src.rag.embeddings import EmbeddingGenerator
+from src.rag.vector_store import VectorStore
+from src.rag.metadata_store import ChunkMetadataWriter
+from src.rag.lexical_index import BM25IndexBuilder, batch_postings
+from src.rag.hot_reload import write_manifest
+from src.config import (
+    EMBEDDING_MODEL,
+    EMBEDDING_BACKEND,
+    EMBEDDING_ONNX_PATH,
+    VECTOR_DB_PATH,
+    VECTOR_DB_BUILD_WORKERS,
+    VECTOR_DB_BUILD_BATCH_SIZE
+)
+
+logger = logging.getLogger(__name__)
+
+BUILD_STAGES = ("chunking", "embedding", "indexing", "metadata", "lexical")
+
+
+class StageStats:
+    """Items processed and seconds spent in one build stage"""
+
+    __slots__ = ("items", "seconds")
+
+    def __init__(self):
+        self.items = 0
+        self.seconds = 0.0
+
+    @property
+    def items_per_second(self) -> float:
+        return self.items / self.seconds if self.seconds > 0 else 0.0
+
+    def as_dict(self) -> Dict:
+        return {
+            "items": self.items,
+            "seconds": round(self.seconds, 4),
+            "items_per_second": round(self.items_per_second, 1)
+        }
+
+
+@contextmanager
+def _timed(stats: StageStats, items: int):
+    """Add the block's elapsed time (and items) to stats"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.seconds += time.perf_counter() - start
+        stats.items += items
+
+
+# Per-process embedder, set once by _init_worker
+_worker_embedder = None
+
+
+def _init_worker(embedder_factory: Callable[[], EmbeddingGenerator], threads: int):
+    """Load the embedding model once per worker process"""
+    global _worker_embedder
+    if threads:
+        # Split the cores between workers instead of every worker using all of them;
+        # set before torch/onnxruntime are imported so their thread pools pick it up
+        os.environ["OMP_NUM_THREADS"] = str(threads)
+        os.environ["MKL_NUM_THREADS"] = str(threads)
+    _worker_embedder = embedder_factory()
+    _worker_embedder.load_model()
+
+
+def _process_batch(embedder: EmbeddingGenerator, texts: List[str], first_row: int) -> Tuple:
+    """Embed and tokenize one batch; returns (embeddings, postings, doc lengths, embed s, tokenize s)"""
+    start = time.perf_counter()
+    embeddings = np.ascontiguousarray(embedder.embed_texts(texts, show_progress=False), dtype=np.float32)
+    embedded = time.perf_counter()
+    postings, doc_lengths = batch_postings(texts, first_row)
+    return embeddings, postings, doc_lengths, embedded - start, time.perf_counter() - embedded
+
+
+def _embed_batch(texts: List[str], first_row: int) -> Tuple:
+    """_process_batch in a worker process"""
+    return _process_batch(_worker_embedder, texts, first_row)
+
+
+class _InlineFuture:
+    """Result holder with the Future interface, for batches processed in-process"""
+
+    def __init__(self, result):
+        self._result = result
+
+    def result(self):
+        return self._result
+
+
+class VectorDBBuilder:
+    """Builds the FAISS + metadata + BM25 vector DB from a stream of cards
+
+    With workers > 0, batches are embedded and BM25-tokenized in a process
+    pool (spawned, so workers never inherit torch or FAISS thread state)
+    with at most 2 batches per worker in flight; this process only appends
+    finished batches. A corpus that fits in one batch is
+    embedded in-process, so small catalogs don't pay for starting workers.
+    With workers=0 everything runs in-process with embedder (or a model
+    made by embedder_factory).
+    """
+
+    def __init__(
+        self,
+        output_path: Path = VECTOR_DB_PATH,
+        workers: int = VECTOR_DB_BUILD_WORKERS,
+        batch_size: int = VECTOR_DB_BUILD_BATCH_SIZE,
+        embedder_factory: Optional[Callable[[], EmbeddingGenerator]] = None,
+        embedder: Optional[EmbeddingGenerator] = None,
+        chunker: Optional[CardTextChunker] = None
+    ):
+        if batch_size < 1:
+            raise ValueError(f"Batch size must be at least 1, got {batch_size}")
+        if workers < 0:
+            raise ValueError(f"Workers must be 0 or more, got {workers}")
+        self.output_path = Path(output_path)
+        self.workers = workers
+        self.batch_size = batch_size
+        self.embedder_factory = embedder_factory or partial(
+            EmbeddingGenerator, EMBEDDING_MODEL, EMBEDDING_BACKEND, EMBEDDING_ONNX_PATH
+        )
+        self._embedder = embedder
+        self.chunker = chunker or CardTextChunker()
+        self.stats = {stage: StageStats() for stage in BUILD_STAGES}
+
+    @property
+    def embedder(self) -> EmbeddingGenerator:
+        """In-process embedder (made on first use; the model itself loads on first embed)"""
+        if self._embedder is None:
+            self._embedder = self.embedder_factory()
+        return self._embedder
+
+    def _batches(self, cards: Iterable[Dict]) -> Iterator[List[Dict]]:
+        """Chunk batches of batch_size chunks (one chunk per card)"""
+        stats = self.stats["chunking"]
+        cards = iter(cards)
+        while True:
+            start = time.perf_counter()
+            batch = self.chunker.create_chunks(islice(cards, self.batch_size))
+            stats.seconds += time.perf_counter() - start
+            if not batch:
+                return
+            stats.items += len(batch)
+            yield batch
+
+    def _make_pool(self) -> ProcessPoolExecutor:
+        threads = max(1, (os.cpu_count() or 1) // self.workers)
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.embedder_factory, threads)
+        )
+
+    def build(self, cards: Iterable[Dict]) -> Dict:
+        """Build and save the vector DB; returns per-stage throughput
+
+        Files are written under temporary names and moved into place, and
+        the manifest is written last, so running services only see the new
+        version once it is complete.
+        """
+        self.stats = {stage: StageStats() for stage in BUILD_STAGES}
+        start = time.perf_counter()
+        vector_store = VectorStore()
+        metadata = ChunkMetadataWriter(self.output_path)
+        lexical = BM25IndexBuilder()
+        batches_done = 0
+
+        def add_next(pending: deque):
+            nonlocal batches_done
+            chunks, future = pending.popleft()
+            embeddings, postings, doc_lengths, embed_seconds, tokenize_seconds = future.result()
+            self.stats["embedding"].items += len(chunks)
+            self.stats["embedding"].seconds += embed_seconds
+            self.stats["lexical"].seconds += tokenize_seconds
+
+            with _timed(self.stats["indexing"], len(chunks)):
+                vector_store.add(embeddings)
+            with _timed(self.stats["metadata"], len(chunks)):
+                metadata.extend(chunks)
+            with _timed(self.stats["lexical"], len(chunks)):
+                lexical.add_postings(postings, doc_lengths)
+
+            batches_done += 1
+            if batches_done % 20 == 0:
+                rate = len(metadata) / max(time.perf_counter() - start, 1e-9)
+                logger.info("Indexed %d chunks (%.0f chunks/s)", len(metadata), rate)
+
+        pool = None
+        try:
+            batches = self._batches(cards)
+            first = next(batches, None)
+            second = next(batches, None)
+            pending = deque()
+            rows_submitted = 0
+            if first is not None and second is not None and self.workers > 0:
+                pool = self._make_pool()
+                max_pending = self.workers * 2
+                for chunks in _prepend((first, second), batches):
+                    texts = [chunk['text'] for chunk in chunks]
+                    pending.append((chunks, pool.submit(_embed_batch, texts, rows_submitted)))
+                    rows_submitted += len(chunks)
+                    if len(pending) >= max_pending:
+                        add_next(pending)
+            else:
+                for chunks in _prepend((first, second), batches):
+                    texts = [chunk['text'] for chunk in chunks]
+                    pending.append((chunks, _InlineFuture(_process_batch(self.embedder, texts, rows_submitted))))
+                    rows_submitted += len(chunks)
+                    add_next(pending)
+            while pending:
+                add_next(pending)
+        except BaseException:
+            metadata.abort()
+            raise
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+
+        if vector_store.index is None:
+            metadata.abort()
+            raise ValueError("No cards to index")
+
+        with _timed(self.stats["indexing"], 0):
+            vector_store.save_index(self.output_path)
+        with _timed(self.stats["metadata"], 0):
+            metadata.close()
+        with _timed(self.stats["lexical"], 0):
+            lexical_index = lexical.finish()
+            lexical_index.save(self.output_path)
+
+        # Written last: running services treat a new manifest as a new version
+        write_manifest(
+            self.output_path,
+            num_chunks=vector_store.index.ntotal,
+            embedding_model=self.embedder.model_name
+        )
+
+        seconds = time.perf_counter() - start
+        return {
+            "num_chunks": vector_store.index.ntotal,
+            "dimension": vector_store.dimension,
+            "workers": self.workers if pool is not None else 0,
+            "batch_size": self.batch_size,
+            "seconds": round(seconds, 4),
+            "chunks_per_second": round(vector_store.index.ntotal / max(seconds, 1e-9), 1),
+            "stages": {stage: stats.as_dict() for stage, stats in self.stats.items()}
+        }
+
+
+def _prepend(head: Tuple, rest: Iterator) -> Iterator:
+    """Non-None items of head, then everything in rest"""
+    for item in head:
+        if item is not None:
+            yield item
+    yield from rest
@@ -0,0 +1,188 @@
+"""BM25 inverted index over card text chunks"""
+import json
+import logging
+import math
+import os
+import re
+from array import array
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, List, Tuple
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+LEXICAL_INDEX_FILE = "bm25_index.json"
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset([
+    "a", "an", "and", "are", "as", "at", "by", "for", "from", "in", "is",
+    "it", "of", "on", "or", "the", "this", "to", "with"
+])
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens plus adjacent-word bigrams for phrase matching"""
+    words = [w for w in TOKEN_PATTERN.findall(text.lower()) if w not in STOPWORDS]
+    bigrams = [f"{a}_{b}" for a, b in zip(words, words[1:])]
+    return words + bigrams
+
+
+class BM25Index:
+    """In-memory BM25 index; document ids are chunk row numbers in the vector store"""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.num_docs = 0
+        self.doc_lengths = np.zeros(0, dtype=np.float32)
+        # term -> (doc ids, term frequencies)
+        self.postings: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._weights: Dict[str, np.ndarray] = {}
+
+    def build(self, texts: List[str]):
+        """Build the index from chunk texts (row i = document i)"""
+        builder = BM25IndexBuilder(k1=self.k1, b=self.b)
+        builder.add(texts)
+        built = builder.finish()
+        self.num_docs = built.num_docs
+        self.doc_lengths = built.doc_lengths
+        self.postings = built.postings
+        self._weights = built._weights
+
+    def _precompute_weights(self):
+        """Store the final BM25 contribution of every posting so queries only sum"""
+        avgdl = float(self.doc_lengths.mean()) if self.num_docs else 0.0
+        self._weights = {}
+        for term, (ids, tfs) in self.postings.items():
+            df = len(ids)
+            idf = math.log(1 + (self.num_docs - df + 0.5) / (df + 0.5))
+            norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[ids] / max(avgdl, 1e-9))
+            self._weights[term] = (idf * tfs * (self.k1 + 1) / (tfs + norm)).astype(np.float32)
+
+    def search(self, query: str, k: int = 5) -> List[Tuple[int, float]]:
+        """Return up to k (doc id, score) pairs with a positive score, best first"""
+        terms = [t for t in set(tokenize(query)) if t in self.postings]
+        if not terms or self.num_docs == 0:
+            return []
+
+        scores = np.zeros(self.num_docs, dtype=np.float32)
+        for term in terms:
+            scores[self.postings[term][0]] += self._weights[term]
+
+        candidates = np.flatnonzero(scores)
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        order = candidates[np.argsort(-scores[candidates], kind='stable')]
+        return [(int(i), float(scores[i])) for i in order]
+
+    def search_many(self, queries: List[str], k: int = 5) -> List[List[Tuple[int, float]]]:
+        """Run search for several queries"""
+        return [self.search(query, k=k) for query in queries]
+
+    @staticmethod
+    def exists(path: Path) -> bool:
+        return (Path(path) / LEXICAL_INDEX_FILE).exists()
+
+    def save(self, path: Path):
+        """Save index as JSON next to the FAISS index"""
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        index_path = path / LEXICAL_INDEX_FILE
+        header = {
+            'k1': self.k1,
+            'b': self.b,
+            'num_docs': self.num_docs,
+            'doc_lengths': self.doc_lengths.astype(int).tolist()
+        }
+        tmp_path = path / f".{LEXICAL_INDEX_FILE}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            # Postings are written one term at a time rather than as one big
+            # dict of lists, so saving a large index doesn't double its memory
+            f.write(json.dumps(header)[:-1] + ', "postings": {')
+            for i, (term, (ids, tfs)) in enumerate(self.postings.items()):
+                f.write(f"{', ' if i else ''}{json.dumps(term)}: "
+                        f"{json.dumps([ids.tolist(), tfs.astype(int).tolist()])}")
+            f.write('}}')
+        os.replace(tmp_path, index_path)
+        logger.info("✅ BM25 index saved to %s", index_path)
+
+    @classmethod
+    def load(cls, path: Path) -> "BM25Index":
+        """Load an index saved with save()"""
+        with open(Path(path) / LEXICAL_INDEX_FILE, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        index = cls(k1=data['k1'], b=data['b'])
+        index.num_docs = data['num_docs']
+        index.doc_lengths = np.asarray(data['doc_lengths'], dtype=np.float32)
+        index.postings = {
+            term: (np.asarray(ids, dtype=np.int32), np.asarray(tfs, dtype=np.float32))
+            for term, (ids, tfs) in data['postings'].items()
+        }
+        index._precompute_weights()
+        return index
+
+
+def batch_postings(texts: List[str], first_doc_id: int = 0) -> Tuple[Dict[str, Tuple[array, array]], array]:
+    """Postings (term -> (doc ids, term frequencies)) and doc lengths for a batch of texts
+
+    Doc ids start at first_doc_id, so batches tokenized in parallel can be
+    merged with BM25IndexBuilder.add_postings() in order.
+    """
+    postings = {}
+    doc_lengths = array('i')
+    for doc_id, text in enumerate(texts, first_doc_id):
+        tokens = tokenize(text)
+        doc_lengths.append(len(tokens))
+        for term, tf in Counter(tokens).items():
+            entry = postings.get(term)
+            if entry is None:
+                entry = postings[term] = (array('i'), array('i'))
+            entry[0].append(doc_id)
+            entry[1].append(tf)
+    return postings, doc_lengths
+
+
+class BM25IndexBuilder:
+    """Builds a BM25Index from batches of chunk texts, in row order
+
+    Postings are accumulated as compact typed arrays rather than Python
+    lists, so memory grows with the index itself, not with the corpus text.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.num_docs = 0
+        self.doc_lengths = array('i')
+        self.doc_ids = defaultdict(lambda: array('i'))
+        self.term_freqs = defaultdict(lambda: array('i'))
+
+    def add(self, texts: List[str]):
+        """Index the next batch of texts (ids continue from the previous batch)"""
+        self.add_postings(*batch_postings(texts, self.num_docs))
+
+    def add_postings(self, postings: Dict[str, Tuple[array, array]], doc_lengths: array):
+        """Merge the next batch from batch_postings(texts, first_doc_id=self.num_docs)"""
+        for term, (ids, tfs) in postings.items():
+            self.doc_ids[term].extend(ids)
+            self.term_freqs[term].extend(tfs)
+        self.doc_lengths.extend(doc_lengths)
+        self.num_docs += len(doc_lengths)
+
+    def finish(self) -> BM25Index:
+        """The finished index (empties the builder)"""
+        index = BM25Index(k1=self.k1, b=self.b)
+        index.num_docs = self.num_docs
+        index.doc_lengths = np.asarray(self.doc_lengths, dtype=np.float32)
+        index.postings = {}
+        # Release each term's arrays as soon as it is converted
+        for term in list(self.doc_ids):
+            index.postings[term] = (
+                np.frombuffer(self.doc_ids.pop(term), dtype=np.int32).copy(),
+                np.asarray(self.term_freqs.pop(term), dtype=np.float32)
+            )
+        index._precompute_weights()
+        logger.info("✅ BM25 index built with %d terms over %d chunks", len(index.postings), index.num_docs)
+        return index
@@ -0,0 +1,109 @@
+"""Columnar, memory-mapped store for chunk metadata"""
+from pathlib import Path
+from typing import Dict, Iterator, List
+import numpy as np
+from src.data.columnar import StringColumn, StringColumnWriter, ArrayColumnWriter, load_array
+
+METADATA_PREFIX = "card_metadata"
+STRING_FIELDS = ["card_id", "card_name", "text", "issuer", "rewards_type"]
+
+
+class ChunkMetadataStore:
+    """Chunk metadata stored column by column and decoded one row at a time
+
+    Rows look exactly like the chunks produced by CardTextChunker, so the
+    store can be used anywhere a list of chunk dicts was used before.
+    """
+
+    def __init__(self, path: Path, mmap: bool = True):
+        path = Path(path)
+        self.columns = {
+            field: StringColumn(path, f"{METADATA_PREFIX}.{field}", mmap=mmap)
+            for field in STRING_FIELDS
+        }
+        self.annual_fee = load_array(path / f"{METADATA_PREFIX}.annual_fee.npy", mmap=mmap)
+
+    @staticmethod
+    def exists(path: Path) -> bool:
+        """Check whether a columnar metadata store was written to path"""
+        path = Path(path)
+        return (path / f"{METADATA_PREFIX}.annual_fee.npy").exists() and all(
+            StringColumn.exists(path, f"{METADATA_PREFIX}.{field}") for field in STRING_FIELDS
+        )
+
+    @staticmethod
+    def write(path: Path, chunks: List[Dict]):
+        """Write chunk dicts to path as columns"""
+        writer = ChunkMetadataWriter(path)
+        writer.extend(chunks)
+        writer.close()
+
+    def __len__(self) -> int:
+        return len(self.annual_fee)
+
+    def __getitem__(self, i: int) -> Dict:
+        """Decode a single row into a chunk dict"""
+        columns = self.columns
+        return {
+            'card_id': columns['card_id'][i],
+            'card_name': columns['card_name'][i],
+            'text': columns['text'][i],
+            'metadata': {
+                'issuer': columns['issuer'][i],
+                'rewards_type': columns['rewards_type'][i],
+                'annual_fee': float(self.annual_fee[i])
+            }
+        }
+
+    def __iter__(self) -> Iterator[Dict]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def card_id(self, i: int) -> str:
+        """Get only the card_id of a row, without decoding the rest"""
+        return self.columns['card_id'][i]
+
+
+class ChunkMetadataWriter:
+    """Streams chunk dicts into a columnar metadata store
+
+    Nothing is held in memory between batches; columns are moved into
+    place by close(), so readers never see a half-written store.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.writers = {
+            field: StringColumnWriter(self.path, f"{METADATA_PREFIX}.{field}")
+            for field in STRING_FIELDS
+        }
+        self.annual_fee_writer = ArrayColumnWriter(self.path / f"{METADATA_PREFIX}.annual_fee.npy")
+
+    def extend(self, chunks: List[Dict]):
+        """Append a batch of chunks"""
+        annual_fees = []
+        for chunk in chunks:
+            metadata = chunk.get('metadata', {})
+            self.writers['card_id'].append(chunk['card_id'])
+            self.writers['card_name'].append(chunk['card_name'])
+            self.writers['text'].append(chunk['text'])
+            self.writers['issuer'].append(metadata.get('issuer', ''))
+            self.writers['rewards_type'].append(metadata.get('rewards_type', ''))
+            annual_fees.append(metadata.get('annual_fee', 0))
+        self.annual_fee_writer.append(np.asarray(annual_fees, dtype=np.float64))
+
+    def __len__(self) -> int:
+        return self.annual_fee_writer.rows
+
+    def close(self):
+        """Finish writing all columns"""
+        for writer in self.writers.values():
+            writer.close()
+        self.annual_fee_writer.close()
+
+    def abort(self):
+        """Discard everything written, leaving any existing store untouched"""
+        for writer in self.writers.values():
+            writer.abort()
+        self.annual_fee_writer.abort()
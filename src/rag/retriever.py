@@ -1,53 +1,308 @@
 """High-level retriever interface for agents"""
-from typing import List, Dict
+import logging
+import threading
+import time
+from typing import List, Dict, Tuple, Optional
 from pathlib import Path
 from src.rag.embeddings import EmbeddingGenerator
 from src.rag.vector_store import VectorStore
-from src.data.card_loader import CardLoader
-from src.config import VECTOR_DB_PATH, TOP_K_RETRIEVAL
+from src.rag.lexical_index import BM25Index, tokenize
+from src.data.catalog import CardCatalog, get_default_catalog
+from src.models.records import CardHit
+from src.utils.microbatch import MicroBatcher
+from src.utils.metrics import timed_stage
+from src.config import (
+    VECTOR_DB_PATH,
+    TOP_K_RETRIEVAL,
+    RETRIEVAL_MODE,
+    RRF_K,
+    HYBRID_CANDIDATE_MULTIPLIER,
+    HYBRID_LEXICAL_ONLY_MAX_TERMS,
+    MICROBATCH_WINDOW_MS,
+    MICROBATCH_MAX_SIZE,
+    RETRIEVER_LOAD_RETRY_SECONDS
+)
+
+logger = logging.getLogger(__name__)
+
+RETRIEVAL_MODES = ("dense", "lexical", "hybrid")
+
+def reciprocal_rank_fusion(rankings: List[List[Tuple[str, float]]], rrf_k: int = RRF_K) -> List[Tuple[str, float]]:
+    """Combine ranked (card_id, score) lists; each card scores sum(1 / (rrf_k + rank))"""
+    fused = {}
+    for ranking in rankings:
+        seen = set()
+        for rank, (card_id, _) in enumerate(ranking, 1):
+            if card_id in seen:
+                continue
+            seen.add(card_id)
+            fused[card_id] = fused.get(card_id, 0.0) + 1.0 / (rrf_k + rank)
+    return sorted(fused.items(), key=lambda item: item[1], reverse=True)
 
 class CardRetriever:
     """High-level interface for retrieving relevant cards"""
     
-    def __init__(self, vector_db_path: Path = VECTOR_DB_PATH):
-        self.embedder = EmbeddingGenerator()
-        self.embedder.load_model()
-        
+    def __init__(
+        self,
+        vector_db_path: Path = VECTOR_DB_PATH,
+        mode: str = RETRIEVAL_MODE,
+        catalog: CardCatalog = None,
+        embedder: EmbeddingGenerator = None,
+        batch_window_ms: float = MICROBATCH_WINDOW_MS,
+        load_retry_seconds: float = RETRIEVER_LOAD_RETRY_SECONDS
+    ):
+        self.vector_db_path = vector_db_path
+        self.mode = mode
+        # The embedder may be shared with other retrievers (e.g. across catalog versions)
+        self.embedder = embedder or EmbeddingGenerator()
         self.vector_store = VectorStore()
-        self.vector_store.load(vector_db_path)
+        self.lexical_index = None
+        self.catalog = catalog or get_default_catalog()
+        self.cards_dict = self.catalog.by_id
+        
+        # The embedding model and index are loaded on first use (or by warm_up)
+        self._load_lock = threading.Lock()
+        self._warmup_lock = threading.Lock()
+        self._ready = threading.Event()
+        self._load_error = None
+        self._load_failed_at = None
+        self.load_retry_seconds = load_retry_seconds
+        self._warmup_thread = None
+        self._first_search_logged = False
+        self.load_seconds = None
+        
+        # Concurrent search_many() calls share one encode and one FAISS search
+        self._batcher = None
+        if batch_window_ms > 0:
+            self._batcher = MicroBatcher(
+                self._search_batch,
+                window_ms=batch_window_ms,
+                max_batch_size=MICROBATCH_MAX_SIZE,
+                name="card-retriever-batch"
+            )
+    
+    @property
+    def batch_stats(self) -> Optional[Dict[str, float]]:
+        """Micro-batching metrics, or None when batching is disabled"""
+        return self._batcher.stats.snapshot() if self._batcher else None
+    
+    @property
+    def is_ready(self) -> bool:
+        """Whether the embedding model and vector index are loaded"""
+        return self._ready.is_set()
+    
+    @property
+    def load_error(self) -> Optional[Exception]:
+        """Error raised by the last load attempt, if it failed (cleared once a load succeeds)"""
+        return self._load_error
+    
+    @property
+    def retry_due(self) -> bool:
+        """Whether loading may be attempted now (no failure, or its retry backoff has passed)"""
+        if self._load_error is None:
+            return True
+        return time.monotonic() - self._load_failed_at >= self.load_retry_seconds
+    
+    def warm_up(self, background: bool = True) -> Optional[threading.Thread]:
+        """Load retrieval resources now, optionally in a background thread"""
+        if not background:
+            self._ensure_loaded()
+            return None
+        
+        with self._warmup_lock:
+            # A finished warm-up that failed is started again once its retry is due
+            finished = self._warmup_thread is not None and not self._warmup_thread.is_alive()
+            if (self._warmup_thread is None or (finished and self.retry_due)) and not self.is_ready:
+                self._warmup_thread = threading.Thread(
+                    target=self._warm_up_quietly,
+                    name="card-retriever-warmup",
+                    daemon=True
+                )
+                self._warmup_thread.start()
+        return self._warmup_thread
+    
+    def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        """Block until resources are loaded; returns False on timeout or load failure"""
+        thread = self.warm_up(background=True)
+        if thread is not None:
+            thread.join(timeout)
+        return self.is_ready
+    
+    def _warm_up_quietly(self):
+        try:
+            self._ensure_loaded()
+        except Exception as e:
+            logger.warning("⚠️  Retriever warm-up failed: %s", e)
+    
+    def _ensure_loaded(self):
+        """Load the embedding model and vector indexes once they load successfully
+        
+        A failed load is retried after load_retry_seconds (e.g. once the
+        vector DB has been built), not on every request.
+        """
+        if self._ready.is_set():
+            return
         
-        self.card_loader = CardLoader()
-        self.cards_dict = {c['card_id']: c for c in self.card_loader.load_cards()}
+        with self._load_lock:
+            if self._ready.is_set():
+                return
+            if not self.retry_due:
+                raise self._load_error
+            
+            start = time.perf_counter()
+            try:
+                self.embedder.load_model()
+                vector_store = VectorStore()
+                vector_store.load(self.vector_db_path)
+                lexical_index = None
+                if BM25Index.exists(self.vector_db_path):
+                    lexical_index = BM25Index.load(self.vector_db_path)
+                else:
+                    logger.warning("⚠️  No BM25 index found, hybrid retrieval falls back to dense search")
+            except Exception as e:
+                self._load_error = e
+                self._load_failed_at = time.monotonic()
+                raise
+            
+            self.vector_store = vector_store
+            self.lexical_index = lexical_index
+            self._load_error = None
+            self.load_seconds = time.perf_counter() - start
+            logger.info("✅ Retriever ready (startup load took %.0f ms)", self.load_seconds * 1000)
+            self._ready.set()
     
-    def search(self, query: str, k: int = TOP_K_RETRIEVAL) -> List[Dict]:
+    def search(self, query: str, k: int = TOP_K_RETRIEVAL, mode: Optional[str] = None) -> List[CardHit]:
         """Search for cards relevant to query"""
-        # Generate query embedding
-        query_embedding = self.embedder.embed_text(query)
+        return self.search_many([query], k=k, mode=mode)[0]
+    
+    def search_many(
+        self,
+        queries: List[str],
+        k: int = TOP_K_RETRIEVAL,
+        mode: Optional[str] = None
+    ) -> List[List[CardHit]]:
+        """Search for several queries at once
+        
+        All queries that need dense retrieval are encoded in one model batch
+        and looked up with a single FAISS search. Returns one list of CardHit
+        (read-only card views with '_relevance_score') per query, in order.
+        mode is "dense", "lexical" or "hybrid" (BM25 and dense results
+        combined with reciprocal-rank fusion). With micro-batching on,
+        queries from concurrent callers join the same batch.
+        """
+        mode = mode or self.mode
+        if mode not in RETRIEVAL_MODES:
+            raise ValueError(f"Unknown retrieval mode '{mode}', expected one of {RETRIEVAL_MODES}")
+        if not queries:
+            return []
+        
+        with timed_stage("retrieval"):
+            if self._batcher is not None:
+                return self._batcher.run((list(queries), k, mode))
+            return self._search_many_now(queries, k, mode)
+    
+    def _search_batch(self, items) -> List:
+        """Run queued (queries, k, mode) calls, one search per distinct (k, mode)"""
+        results = [None] * len(items)
+        groups = {}
+        for i, (_, k, mode) in enumerate(items):
+            groups.setdefault((k, mode), []).append(i)
+        
+        for (k, mode), indices in groups.items():
+            queries = [query for i in indices for query in items[i][0]]
+            try:
+                cards = self._search_many_now(queries, k, mode)
+            except Exception as e:
+                for i in indices:
+                    results[i] = e
+                continue
+            offset = 0
+            for i in indices:
+                count = len(items[i][0])
+                results[i] = cards[offset:offset + count]
+                offset += count
+        return results
+    
+    def _search_many_now(self, queries: List[str], k: int, mode: str) -> List[List[CardHit]]:
+        start = time.perf_counter()
+        self._ensure_loaded()
+        queries = list(queries)
+        
+        if mode != "dense" and self.lexical_index is None:
+            if mode == "lexical":
+                raise ValueError("Lexical index not built, re-run scripts/build_vector_db.py")
+            mode = "dense"
+        
+        # Fusion needs more candidates than the final k from each side
+        candidates_k = k if mode == "dense" else k * HYBRID_CANDIDATE_MULTIPLIER
         
-        # Search vector store
-        results = self.vector_store.search(query_embedding, k=k)
+        lexical_results = [None] * len(queries)
+        if mode != "dense":
+            lexical_results = self.lexical_index.search_many(queries, k=candidates_k)
         
-        # Get full card data for each result
+        # Short keyword queries with enough exact matches skip the embedder
+        dense_results = [None] * len(queries)
+        if mode != "lexical":
+            dense_rows = [
+                i for i, query in enumerate(queries)
+                if mode == "dense" or not self._lexical_is_enough(query, lexical_results[i], k)
+            ]
+            if dense_rows:
+                # Generate query embeddings in one batch, search vector store once
+                query_embeddings = self.embedder.embed_queries([queries[i] for i in dense_rows])
+                all_results = self.vector_store.search_many(query_embeddings, k=candidates_k)
+                for i, results in zip(dense_rows, all_results):
+                    dense_results[i] = [(chunk['card_id'], distance) for chunk, distance in results]
+        
+        cards = []
+        for dense, lexical in zip(dense_results, lexical_results):
+            if lexical is None:
+                # Hit scores are higher-is-better in every mode, so turn L2 distances into similarities
+                hits = [(card_id, 1.0 / (1.0 + distance)) for card_id, distance in dense]
+            else:
+                lexical = [(self.vector_store.card_id_at(row), score) for row, score in lexical]
+                hits = lexical if dense is None else reciprocal_rank_fusion([dense, lexical])
+            cards.append(self._collect_cards(hits, k))
+        
+        if not self._first_search_logged:
+            self._first_search_logged = True
+            logger.info("✅ First retrieval served in %.0f ms", (time.perf_counter() - start) * 1000)
+        
+        return cards
+    
+    def _lexical_is_enough(self, query: str, lexical_hits, k: int) -> bool:
+        """Whether a short keyword query can be answered from BM25 alone"""
+        if HYBRID_LEXICAL_ONLY_MAX_TERMS <= 0 or lexical_hits is None:
+            return False
+        num_words = sum(1 for token in tokenize(query) if "_" not in token)
+        return num_words <= HYBRID_LEXICAL_ONLY_MAX_TERMS and len(lexical_hits) >= k
+    
+    def _collect_cards(self, hits: List[Tuple[str, float]], k: int) -> List[CardHit]:
+        """Catalog views for the first k distinct cards in ranked (card_id, score) hits"""
         cards = []
-        for chunk, distance in results:
-            card_id = chunk['card_id']
-            if card_id in self.cards_dict:
-                card = self.cards_dict[card_id].copy()
-                card['_relevance_score'] = distance
-                cards.append(card)
+        seen = set()
+        for card_id, score in hits:
+            if card_id in seen:
+                continue
+            row = self.catalog.row_of(card_id)
+            if row is not None:
+                seen.add(card_id)
+                cards.append(CardHit(self.catalog, row, score))
+                if len(cards) == k:
+                    break
         
         return cards
     
-    def search_by_feature(self, feature: str, k: int = TOP_K_RETRIEVAL) -> List[Dict]:
+    def search_by_feature(self, feature: str, k: int = TOP_K_RETRIEVAL) -> List[CardHit]:
         """Search for cards with a specific feature"""
         query = f"credit card with {feature}"
         return self.search(query, k=k)
     
-    def search_by_category(self, category: str, k: int = TOP_K_RETRIEVAL) -> List[Dict]:
+    def search_by_category(self, category: str, k: int = TOP_K_RETRIEVAL) -> List[CardHit]:
         """Search for cards best for a spending category"""
         query = f"best credit card for {category} rewards"
         return self.search(query, k=k)
     
     def get_all_cards(self) -> List[Dict]:
         """Get all cards (for card evaluator)"""
-        return self.card_loader.load_cards()
+        return list(self.catalog.cards)
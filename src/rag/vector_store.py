@@ -1,10 +1,25 @@
 """FAISS vector store for card embeddings"""
-import faiss
+import logging
+import os
 import numpy as np
 import pickle
 from pathlib import Path
 from typing import List, Dict, Tuple
-from src.config import VECTOR_DB_PATH
+from src.rag.metadata_store import ChunkMetadataStore
+from src.config import VECTOR_DB_PATH, VECTOR_DB_MMAP
+
+logger = logging.getLogger(__name__)
+
+def _faiss():
+    """Import FAISS on first use, so importing this module stays cheap"""
+    import faiss
+    return faiss
+
+def faiss_mmap_flags() -> int:
+    """Read flags for memory-mapping an index"""
+    faiss = _faiss()
+    # Flat indexes can only be memory-mapped with the IFC flag on newer FAISS
+    return getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP) | faiss.IO_FLAG_READ_ONLY
 
 class VectorStore:
     """FAISS-based vector store for card embeddings"""
@@ -19,34 +34,49 @@ class VectorStore:
         self.dimension = embeddings.shape[1]
         self.chunks = chunks
         
-        print(f"Building FAISS index with dimension {self.dimension}...")
+        logger.info("Building FAISS index with dimension %d...", self.dimension)
         
-        # Use L2 distance for similarity
-        self.index = faiss.IndexFlatL2(self.dimension)
-        
-        # Add embeddings to index
-        self.index.add(embeddings.astype('float32'))
+        self.index = None
+        self.add(embeddings)
         
-        print(f"✅ Index built with {self.index.ntotal} vectors")
+        logger.info("✅ Index built with %d vectors", self.index.ntotal)
     
-    def save(self, path: Path = VECTOR_DB_PATH):
-        """Save index and metadata to disk"""
+    def add(self, embeddings: np.ndarray):
+        """Append a batch of embeddings to the index (created on the first batch)"""
+        if self.index is None:
+            self.dimension = embeddings.shape[1]
+            # Use L2 distance for similarity
+            self.index = _faiss().IndexFlatL2(self.dimension)
+        self.index.add(np.ascontiguousarray(embeddings, dtype='float32'))
+    
+    def save_index(self, path: Path = VECTOR_DB_PATH):
+        """Save only the FAISS index (metadata is written separately)"""
         path = Path(path)
         path.mkdir(parents=True, exist_ok=True)
         
-        # Save FAISS index
+        # Write then rename, so mapped readers keep the old file
         index_path = path / "faiss_index.bin"
-        faiss.write_index(self.index, str(index_path))
-        print(f"✅ FAISS index saved to {index_path}")
+        tmp_index_path = path / f".faiss_index.bin.{os.getpid()}.tmp"
+        _faiss().write_index(self.index, str(tmp_index_path))
+        os.replace(tmp_index_path, index_path)
+        logger.info("✅ FAISS index saved to %s", index_path)
+    
+    def save(self, path: Path = VECTOR_DB_PATH):
+        """Save index and metadata to disk"""
+        path = Path(path)
+        self.save_index(path)
         
-        # Save chunks metadata
-        metadata_path = path / "card_metadata.pkl"
-        with open(metadata_path, 'wb') as f:
-            pickle.dump(self.chunks, f)
-        print(f"✅ Metadata saved to {metadata_path}")
+        # Save chunks metadata as mmap-friendly columns
+        ChunkMetadataStore.write(path, self.chunks)
+        logger.info("✅ Metadata saved to %s", path)
     
-    def load(self, path: Path = VECTOR_DB_PATH):
-        """Load index and metadata from disk"""
+    def load(self, path: Path = VECTOR_DB_PATH, mmap: bool = VECTOR_DB_MMAP):
+        """Load index and metadata from disk
+        
+        With mmap enabled, the index and metadata are mapped rather than
+        read, so load time does not grow with index size and workers on
+        the same host share page-cache pages.
+        """
         path = Path(path)
         
         # Load FAISS index
@@ -54,32 +84,55 @@ class VectorStore:
         if not index_path.exists():
             raise FileNotFoundError(f"Index not found at {index_path}")
         
-        self.index = faiss.read_index(str(index_path))
+        if mmap:
+            self.index = _faiss().read_index(str(index_path), faiss_mmap_flags())
+        else:
+            self.index = _faiss().read_index(str(index_path))
         self.dimension = self.index.d
-        print(f"✅ Loaded FAISS index with {self.index.ntotal} vectors")
+        logger.info("✅ Loaded FAISS index with %d vectors", self.index.ntotal)
         
         # Load chunks metadata
-        metadata_path = path / "card_metadata.pkl"
-        with open(metadata_path, 'rb') as f:
-            self.chunks = pickle.load(f)
-        print(f"✅ Loaded metadata for {len(self.chunks)} cards")
+        if ChunkMetadataStore.exists(path):
+            self.chunks = ChunkMetadataStore(path, mmap=mmap)
+        else:
+            # Vector DBs built before the columnar format; rebuild to drop pickle
+            metadata_path = path / "card_metadata.pkl"
+            logger.warning("⚠️  Loading legacy pickle metadata from %s, "
+                           "re-run scripts/build_vector_db.py to upgrade", metadata_path)
+            with open(metadata_path, 'rb') as f:
+                self.chunks = pickle.load(f)
+        logger.info("✅ Loaded metadata for %d cards", len(self.chunks))
+    
+    def card_id_at(self, row: int) -> str:
+        """Get the card_id of a chunk row without decoding the whole row"""
+        if isinstance(self.chunks, ChunkMetadataStore):
+            return self.chunks.card_id(row)
+        return self.chunks[row]['card_id']
     
     def search(self, query_embedding: np.ndarray, k: int = 5) -> List[Tuple[Dict, float]]:
         """Search for top-k most similar cards"""
-        if self.index is None:
-            raise ValueError("Index not built or loaded")
-        
         # Ensure query is 2D array
         if query_embedding.ndim == 1:
             query_embedding = query_embedding.reshape(1, -1)
         
-        # Search
-        distances, indices = self.index.search(query_embedding.astype('float32'), k)
+        return self.search_many(query_embedding[:1], k=k)[0]
+    
+    def search_many(self, query_embeddings: np.ndarray, k: int = 5) -> List[List[Tuple[Dict, float]]]:
+        """Search top-k for every row of a query matrix in one FAISS call"""
+        if self.index is None:
+            raise ValueError("Index not built or loaded")
+        
+        # FAISS needs a contiguous float32 matrix
+        query_matrix = np.ascontiguousarray(query_embeddings, dtype='float32')
+        distances, indices = self.index.search(query_matrix, k)
         
-        # Return chunks with distances
-        results = []
-        for idx, distance in zip(indices[0], distances[0]):
-            if idx < len(self.chunks):  # Valid index
-                results.append((self.chunks[idx], float(distance)))
+        # Return chunks with distances, one list per query
+        all_results = []
+        for row_indices, row_distances in zip(indices, distances):
+            results = []
+            for idx, distance in zip(row_indices, row_distances):
+                if 0 <= idx < len(self.chunks):  # Valid index (FAISS pads with -1)
+                    results.append((self.chunks[idx], float(distance)))
+            all_results.append(results)
         
-        return results
+        return all_results
@@ -0,0 +1,4 @@
+"""HTTP service module"""
+from .app import RecommendationService, create_server, run_service
+
+__all__ = ["RecommendationService", "create_server", "run_service"]
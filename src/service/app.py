@@ -0,0 +1,405 @@
+"""Long-running HTTP service around one warm Orchestrator"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, Optional, Tuple
+from pydantic import ValidationError
+from src.agents.orchestrator import Orchestrator
+from src.models.user_input import UserProfile
+from src.models.service import RetrievalRequest, RetrievalResponse, RetrievedCard
+from src.rag.hot_reload import VersionedResources
+from src.api.model_router import ModelRouter, get_model_router
+from src.utils.metrics import metrics
+from src.config import (
+    SERVICE_HOST,
+    SERVICE_PORT,
+    SERVICE_WORKERS,
+    SERVICE_QUEUE_TIMEOUT,
+    SERVICE_MICROBATCH_WINDOW_MS,
+    HOT_RELOAD_INTERVAL
+)
+
+MAX_BODY_BYTES = 1_000_000
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+HTTP_REQUESTS = metrics.counter("cardiq_http_requests_total", "HTTP requests by route and status", ("route", "status"))
+HTTP_REQUEST_SECONDS = metrics.histogram(
+    "cardiq_http_request_seconds",
+    "Time until the response is ready (until the first event is produced, for streams), including queueing",
+    ("route",)
+)
+IN_FLIGHT = metrics.gauge("cardiq_requests_in_flight", "Requests holding a worker slot")
+WAITING = metrics.gauge("cardiq_requests_waiting", "Requests queued for a worker slot")
+
+
+class ServiceError(Exception):
+    """Error with an HTTP status, returned to the client as JSON"""
+
+    def __init__(self, status: int, message: str, details: Any = None):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.details = details
+
+
+class _StreamingResponse:
+    """Event iterator that runs on_close once, when exhausted or closed
+
+    on_first_event, if set, runs once when the first event is produced (or
+    at close, for a stream that ends without any).
+    """
+
+    def __init__(self, events: Iterator[Tuple[str, Dict]], on_close):
+        self._events = events
+        self._on_close = on_close
+        self._closed = False
+        self.on_first_event = None
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> Tuple[str, Dict]:
+        try:
+            event = next(self._events)
+        except BaseException:
+            self.close()
+            raise
+        self._first_event()
+        return event
+
+    def _first_event(self):
+        callback, self.on_first_event = self.on_first_event, None
+        if callback is not None:
+            callback()
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            if hasattr(self._events, "close"):
+                self._events.close()
+            self._first_event()
+            self._on_close()
+
+
+class RecommendationService:
+    """Routes JSON requests to a shared, warm Orchestrator
+
+    At most max_concurrency requests are processed at once; others wait up
+    to queue_timeout seconds for a slot and then get a 503. Load-aware model
+    routing needs an orchestrator built with its own ModelRouter, as
+    run_service does.
+    """
+
+    def __init__(
+        self,
+        orchestrator: Orchestrator,
+        max_concurrency: int = SERVICE_WORKERS,
+        queue_timeout: float = SERVICE_QUEUE_TIMEOUT
+    ):
+        self.orchestrator = orchestrator
+        self.max_concurrency = max_concurrency
+        self.queue_timeout = queue_timeout
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._counter_lock = threading.Lock()
+        self.in_flight = 0
+        self.waiting = 0
+        self.started_at = time.time()
+        IN_FLIGHT.set(0)
+        WAITING.set(0)
+        
+        # Model routing can downgrade models when the service is busy. Only a
+        # router of the service's own reports its load; the process-wide one
+        # is left alone so routing elsewhere in the process is unaffected
+        self.router = orchestrator.router
+        if self.router is not get_model_router():
+            self.router.set_load_provider(self.load_level)
+
+        self.routes = {
+            ("GET", "/healthz"): self.health,
+            ("GET", "/readyz"): self.readiness,
+            ("GET", "/metrics"): self.export_metrics,
+            ("POST", "/recommend"): self.recommend,
+            ("POST", "/recommend/stream"): self.recommend_stream,
+            ("POST", "/evaluate"): self.evaluate,
+            ("POST", "/retrieve"): self.retrieve,
+        }
+
+    def handle(self, method: str, path: str, body: bytes) -> Tuple[int, Any]:
+        """Dispatch one request, map errors to HTTP statuses and record its metrics"""
+        route_path = path.split("?", 1)[0].rstrip("/") or "/"
+        route = self.routes.get((method, route_path))
+        if route is None:
+            HTTP_REQUESTS.inc(route="unmatched", status=404)
+            return 404, {"error": f"No route for {method} {path}"}
+
+        start = time.perf_counter()
+        status, payload = self._handle(method, route, body)
+        observe = lambda: HTTP_REQUEST_SECONDS.observe(time.perf_counter() - start, route=route_path)
+        if isinstance(payload, _StreamingResponse):
+            # Stream events are produced lazily, as the response is written
+            payload.on_first_event = observe
+        else:
+            observe()
+        HTTP_REQUESTS.inc(route=route_path, status=status)
+        return status, payload
+
+    def _handle(self, method: str, route, body: bytes) -> Tuple[int, Any]:
+        # Health checks and metrics never wait for a worker slot
+        if method == "GET":
+            return self._call(route, body)
+
+        with self._counter_lock:
+            self.waiting += 1
+            WAITING.set(self.waiting)
+        acquired = self._slots.acquire(timeout=self.queue_timeout)
+        with self._counter_lock:
+            self.waiting -= 1
+            WAITING.set(self.waiting)
+            if acquired:
+                self.in_flight += 1
+                IN_FLIGHT.set(self.in_flight)
+        if not acquired:
+            return 503, {"error": "Service overloaded, try again later"}
+        status, payload = self._call(route, body)
+        
+        # Streaming responses hold their slot until the stream is consumed
+        if isinstance(payload, Iterator):
+            return status, _StreamingResponse(payload, on_close=self._release_slot)
+        self._release_slot()
+        return status, payload
+
+    @staticmethod
+    def _call(route, body: bytes) -> Tuple[int, Any]:
+        """Run a route, mapping its exceptions to JSON error responses"""
+        try:
+            return route(body)
+        except ServiceError as e:
+            payload = {"error": e.message}
+            if e.details is not None:
+                payload["details"] = e.details
+            return e.status, payload
+        except ValidationError as e:
+            return 400, {"error": "Invalid request", "details": json.loads(e.json())}
+        except Exception as e:
+            return 500, {"error": f"{type(e).__name__}: {e}"}
+
+    def load_level(self) -> float:
+        """Busy plus queued requests relative to capacity (1.0 = all slots busy)"""
+        return (self.in_flight + self.waiting) / self.max_concurrency
+
+    def _release_slot(self):
+        with self._counter_lock:
+            self.in_flight -= 1
+            IN_FLIGHT.set(self.in_flight)
+        self._slots.release()
+
+    def health(self, body: bytes) -> Tuple[int, Dict]:
+        """Liveness: the process is up and serving"""
+        return 200, {
+            "status": "ok",
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "max_concurrency": self.max_concurrency,
+            "model_routing": self.router.stats(),
+            "microbatch": self.orchestrator.batch_stats(),
+            "recommendation_cache": self.orchestrator.cache.stats() if self.orchestrator.cache else None,
+            "single_flight": self.orchestrator.single_flight_stats()
+        }
+
+    def export_metrics(self, body: bytes) -> Tuple[int, str]:
+        """Stage latencies, token and cache counters and load gauges in Prometheus text format"""
+        return 200, metrics.render_prometheus()
+
+    def readiness(self, body: bytes) -> Tuple[int, Dict]:
+        """Readiness: retrieval resources are warm (or known to be unavailable)"""
+        snapshot = self.orchestrator.snapshot()
+        retriever = snapshot.retriever
+        if retriever.is_ready:
+            retrieval = "ready"
+        elif retriever.load_error is not None:
+            # Recommendations still work without RAG context; probes also
+            # restart loading once the retry backoff has passed
+            retrieval = "unavailable"
+            if retriever.retry_due:
+                retriever.warm_up(background=True)
+        else:
+            retrieval = "warming"
+
+        ready = retrieval != "warming"
+        return (200 if ready else 503), {
+            "ready": ready,
+            "retrieval": retrieval,
+            "catalog_version": snapshot.version,
+            "cards": len(snapshot.catalog)
+        }
+
+    def recommend(self, body: bytes) -> Tuple[int, Dict]:
+        """Full recommendations (spending analysis, evaluation, narratives)"""
+        user_profile = UserProfile.model_validate_json(self._require_body(body))
+        return 200, self.orchestrator.process(user_profile).model_dump()
+
+    def recommend_stream(self, body: bytes) -> Tuple[int, Iterator[Tuple[str, Dict]]]:
+        """Progressive recommendations as server-sent events
+        
+        Sends a "preliminary" event with ranked cards and financial summaries
+        right away, a "recommendation" event per narrative as it completes,
+        then "complete" (or "error").
+        """
+        user_profile = UserProfile.model_validate_json(self._require_body(body))
+        events = self.orchestrator.stream(user_profile)
+        
+        def sse_events():
+            try:
+                for event, payload in events:
+                    yield event, payload.model_dump()
+            except Exception as e:
+                yield "error", {"error": f"{type(e).__name__}: {e}"}
+        
+        return 200, sse_events()
+
+    def evaluate(self, body: bytes) -> Tuple[int, Dict]:
+        """Evaluation-only scoring, no LLM calls"""
+        user_profile = UserProfile.model_validate_json(self._require_body(body))
+        return 200, self.orchestrator.evaluate(user_profile).model_dump()
+
+    def retrieve(self, body: bytes) -> Tuple[int, Dict]:
+        """Card retrieval for one or more queries"""
+        request = RetrievalRequest.model_validate_json(self._require_body(body))
+        queries = ([request.query] if request.query else []) + request.queries
+        if not queries:
+            raise ServiceError(400, "Provide 'query' or 'queries'")
+
+        retriever = self.orchestrator.snapshot().retriever
+        try:
+            results = retriever.search_many(queries, k=request.k, mode=request.mode)
+        except (FileNotFoundError, ValueError) as e:
+            raise ServiceError(503, f"Retrieval unavailable: {e}")
+
+        response = RetrievalResponse(results=[
+            [
+                RetrievedCard(card_id=hit.card_id, card_name=hit.card_name, score=hit.score)
+                for hit in hits
+            ]
+            for hits in results
+        ])
+        return 200, response.model_dump()
+
+    @staticmethod
+    def _require_body(body: bytes) -> bytes:
+        if not body:
+            raise ServiceError(400, "Request body must be JSON")
+        return body
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """Thin HTTP adapter; all logic lives in RecommendationService"""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "CardIQ"
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def _dispatch(self, method: str):
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0 or length > MAX_BODY_BYTES:
+            # The body is left unread, so the connection can't be reused
+            self.close_connection = True
+            if length < 0:
+                self._send(400, {"error": "Invalid Content-Length header"})
+            else:
+                self._send(413, {"error": "Request body too large"})
+            return
+        body = self.rfile.read(length) if length else b""
+        status, payload = self.server.service.handle(method, self.path, body)
+        if isinstance(payload, Iterator):
+            self._send_events(status, payload)
+        else:
+            self._send(status, payload)
+
+    def _send(self, status: int, payload: Any):
+        """Send a JSON payload, or a str as Prometheus text"""
+        if isinstance(payload, str):
+            data, content_type = payload.encode("utf-8"), PROMETHEUS_CONTENT_TYPE
+        else:
+            data, content_type = json.dumps(payload).encode("utf-8"), "application/json"
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_events(self, status: int, events: Iterator[Tuple[str, Dict]]):
+        """Write (event, payload) pairs as server-sent events, then close"""
+        self.send_response(status)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        try:
+            for event, payload in events:
+                self.wfile.write(f"event: {event}\ndata: {json.dumps(payload)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+        finally:
+            events.close()
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def create_server(
+    service: RecommendationService,
+    host: str = SERVICE_HOST,
+    port: int = SERVICE_PORT,
+    verbose: bool = False
+) -> ThreadingHTTPServer:
+    """Create (but don't start) the HTTP server for a service"""
+    server = ThreadingHTTPServer((host, port), _RequestHandler)
+    server.daemon_threads = True
+    server.service = service
+    server.verbose = verbose
+    return server
+
+
+def run_service(
+    host: str = SERVICE_HOST,
+    port: int = SERVICE_PORT,
+    workers: int = SERVICE_WORKERS,
+    orchestrator: Optional[Orchestrator] = None,
+    verbose: bool = False
+):
+    """Start a warm Orchestrator and serve until interrupted"""
+    resources = None
+    if orchestrator is None:
+        # Concurrent requests share embedding batches and scoring passes
+        if HOT_RELOAD_INTERVAL > 0:
+            resources = VersionedResources(batch_window_ms=SERVICE_MICROBATCH_WINDOW_MS)
+            resources.start()
+        orchestrator = Orchestrator(
+            warm_up=True,
+            resources=resources,
+            batch_window_ms=SERVICE_MICROBATCH_WINDOW_MS,
+            router=ModelRouter.from_config()
+        )
+
+    service = RecommendationService(orchestrator, max_concurrency=workers)
+    server = create_server(service, host, port, verbose=verbose)
+    print(f"✅ CardIQ service listening on http://{host}:{port} ({workers} workers)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down...")
+    finally:
+        server.server_close()
+        if resources is not None:
+            resources.stop()
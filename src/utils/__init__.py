@@ -1,16 +1,51 @@
 """Utility functions module"""
 from .calculations import (
     calculate_category_rewards,
+    calculate_category_rewards_vectorized,
+    calculate_category_rewards_batch,
     calculate_net_value,
     get_point_value_for_rewards_type,
     calculate_total_annual_credits,
     calculate_spending_percentages
 )
+from .projection import ValueProjection
+from .microbatch import MicroBatcher, MicroBatchStats
+from .single_flight import SingleFlight
+from .rate_limit import RateLimiter
+from .deadline import Deadline, run_with_timeout
+from .metrics import (
+    metrics,
+    MetricsRegistry,
+    RequestTimings,
+    timed_stage,
+    track_timings,
+    in_current_context
+)
+from .log import configure_logging
+from .lazy import lazy_exports, profile_imports
 
 __all__ = [
     "calculate_category_rewards",
+    "calculate_category_rewards_vectorized",
+    "calculate_category_rewards_batch",
     "calculate_net_value",
     "get_point_value_for_rewards_type",
     "calculate_total_annual_credits",
-    "calculate_spending_percentages"
+    "calculate_spending_percentages",
+    "ValueProjection",
+    "MicroBatcher",
+    "MicroBatchStats",
+    "SingleFlight",
+    "RateLimiter",
+    "Deadline",
+    "run_with_timeout",
+    "metrics",
+    "MetricsRegistry",
+    "RequestTimings",
+    "timed_stage",
+    "track_timings",
+    "in_current_context",
+    "configure_logging",
+    "lazy_exports",
+    "profile_imports"
 ]
@@ -1,5 +1,6 @@
 """Utility functions for reward calculations"""
-from typing import Dict
+from typing import Dict, List
+import numpy as np
 from src.config import POINT_VALUES
 
 def calculate_category_rewards(
@@ -37,6 +38,41 @@ def calculate_category_rewards(
 
     return annual_rewards
 
+def monthly_spending_vector(monthly_spending: Dict[str, float], categories: List[str]) -> np.ndarray:
+    """Monthly spend per category as a vector, with travel excluding its subcategories"""
+    spending = {category: float(monthly_spending.get(category) or 0) for category in categories}
+    if 'travel' in spending:
+        spending['travel'] -= sum(spending.get(sub, 0) for sub in ('flights', 'hotels', 'transit'))
+    return np.array([spending[category] for category in categories])
+
+def calculate_category_rewards_vectorized(
+    monthly_spending: Dict[str, float],
+    reward_rates: np.ndarray,
+    point_values: np.ndarray,
+    categories: List[str]
+) -> np.ndarray:
+    """Calculate annual rewards for many cards at once
+
+    reward_rates is (cards x categories) in the order of categories. Same
+    travel handling as calculate_category_rewards.
+    """
+    spending = monthly_spending_vector(monthly_spending, categories)
+    return (reward_rates @ spending) * 12 * point_values
+
+def calculate_category_rewards_batch(
+    monthly_spendings: List[Dict[str, float]],
+    reward_rates: np.ndarray,
+    point_values: np.ndarray,
+    categories: List[str]
+) -> np.ndarray:
+    """Calculate annual rewards for many profiles and cards in one matrix product
+
+    Returns a (profiles x cards) array; row i equals
+    calculate_category_rewards_vectorized for monthly_spendings[i].
+    """
+    spending = np.stack([monthly_spending_vector(s, categories) for s in monthly_spendings])
+    return (spending @ reward_rates.T) * 12 * point_values
+
 def calculate_net_value(
     annual_rewards: float,
     signup_bonus_value: float,
@@ -44,7 +80,7 @@ def calculate_net_value(
     annual_credits_value: float,
     year: int
 ) -> float:
-    """Calculate net value for a specific year"""
+    """Calculate net value for a specific year (works element-wise on NumPy arrays)"""
     if year == 1:
         return annual_rewards + signup_bonus_value + annual_credits_value - annual_fee
     else:
@@ -0,0 +1,55 @@
+"""End-to-end latency budgets split across pipeline stages"""
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Optional
+
+
+class Deadline:
+    """A fixed point in time that a request must finish by
+
+    Stages ask for a share of the total budget with stage_budget(); a stage
+    never gets more than what is actually left.
+    """
+
+    def __init__(self, seconds: Optional[float]):
+        self.total = seconds
+        self.started_at = time.monotonic()
+        self.expires_at = None if seconds is None else self.started_at + seconds
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left (never negative), or None for no deadline"""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.expires_at is not None and time.monotonic() >= self.expires_at
+
+    def stage_budget(self, share: float) -> Optional[float]:
+        """Seconds for a stage allowed share of the total budget, capped by what remains"""
+        if self.expires_at is None:
+            return None
+        return min(self.total * share, self.remaining())
+
+
+def run_with_timeout(fn: Callable[[], Any], timeout: Optional[float]) -> Any:
+    """Run fn in a daemon thread and wait at most timeout seconds
+
+    Raises concurrent.futures.TimeoutError if fn hasn't finished; fn keeps
+    running in the background but nothing waits for it.
+    """
+    if timeout is None:
+        return fn()
+
+    future = Future()
+
+    def run():
+        try:
+            future.set_result(fn())
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, name="deadline-stage", daemon=True).start()
+    return future.result(timeout)
@@ -0,0 +1,92 @@
+"""Vectorized card eligibility and signup bonus reachability"""
+from typing import List, Sequence
+import numpy as np
+from src.config import (
+    CREDIT_TIER_MAX_SCORES,
+    TOP_LEVEL_CATEGORIES,
+    SIGNUP_BONUS_REACHABILITY,
+    SIGNUP_BONUS_DEFAULT_TIMEFRAME_MONTHS
+)
+
+# rewards_code when the profile has no rewards type preference
+ANY_REWARDS_TYPE = -1
+# rewards_code when the preferred type isn't in the catalog (nothing matches)
+NO_REWARDS_TYPE = -2
+
+
+def max_credit_score(credit_tier: str) -> int:
+    """Highest credit score in a tier ("excellent", "good" or "fair")"""
+    try:
+        return CREDIT_TIER_MAX_SCORES[credit_tier.lower()]
+    except KeyError:
+        raise ValueError(
+            f"Unknown credit tier '{credit_tier}', expected one of {list(CREDIT_TIER_MAX_SCORES)}"
+        ) from None
+
+
+def total_monthly_spend(monthly_spending) -> float:
+    """Total monthly spend (travel subcategories are already part of travel)"""
+    spending = monthly_spending.model_dump() if hasattr(monthly_spending, 'model_dump') else monthly_spending
+    return sum(float(spending.get(category) or 0) for category in TOP_LEVEL_CATEGORIES)
+
+
+class ProfileConstraints:
+    """Each profile's limits as arrays, so a whole catalog is masked in one pass
+
+    eligible() and bonus_reachable() return (profiles x cards) boolean
+    arrays over CatalogColumns, computed by broadcasting; there is no
+    per-card or per-profile Python loop.
+    """
+
+    def __init__(self, user_profiles: Sequence, rewards_types: Sequence[str]):
+        # Rewards types compare case-insensitively: map each to the code of
+        # its first case-insensitive match so one code stands for the group
+        canonical = {}
+        self.type_groups = np.array(
+            [canonical.setdefault(t.lower(), code) for code, t in enumerate(rewards_types)],
+            dtype=np.int32
+        )
+
+        self.fee_cap = np.array([
+            np.inf if p.max_annual_fee is None else float(p.max_annual_fee) for p in user_profiles
+        ])
+        self.max_credit_score = np.array([max_credit_score(p.credit_score) for p in user_profiles])
+        self.rewards_code = np.array([
+            canonical.get(p.preferred_rewards_type.lower(), NO_REWARDS_TYPE)
+            if p.preferred_rewards_type else ANY_REWARDS_TYPE
+            for p in user_profiles
+        ], dtype=np.int32)
+        self.needs_no_foreign_fee = np.array([bool(p.planning_to_travel) for p in user_profiles])
+        self.monthly_spend = np.array([total_monthly_spend(p.monthly_spending) for p in user_profiles])
+
+    def __len__(self) -> int:
+        return len(self.fee_cap)
+
+    def eligible(self, columns) -> np.ndarray:
+        """Cards each profile can get and wants: credit tier, fee cap, rewards type, foreign fees"""
+        mask = columns.annual_fee[None, :] <= self.fee_cap[:, None]
+        mask &= columns.min_credit_score[None, :] <= self.max_credit_score[:, None]
+
+        card_groups = self.type_groups[columns.rewards_type_code]
+        wanted = self.rewards_code[:, None]
+        mask &= (wanted == ANY_REWARDS_TYPE) | (card_groups[None, :] == wanted)
+
+        # International travelers only see cards without foreign transaction fees
+        mask &= ~self.needs_no_foreign_fee[:, None] | (columns.foreign_transaction_fee[None, :] <= 0)
+        return mask
+
+    def bonus_reachable(self, columns, enabled: bool = SIGNUP_BONUS_REACHABILITY) -> np.ndarray:
+        """Whether each profile's monthly spend meets each card's bonus spend requirement in time"""
+        if not enabled:
+            return np.ones((len(self), len(columns)), dtype=bool)
+        months = np.where(columns.timeframe_months > 0, columns.timeframe_months, SIGNUP_BONUS_DEFAULT_TIMEFRAME_MONTHS)
+        return np.multiply.outer(self.monthly_spend, months) >= columns.spend_requirement[None, :]
+
+
+def eligible_cards(cards: List, credit_tier: str) -> List:
+    """Card dicts whose minimum credit score is within credit_tier"""
+    max_score = max_credit_score(credit_tier)
+    return [
+        card for card in cards
+        if int((card.get('eligibility') or {}).get('min_credit_score') or 0) <= max_score
+    ]
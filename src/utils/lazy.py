@@ -0,0 +1,62 @@
+"""Lazy package exports and import-time profiling"""
+import importlib
+import re
+import sys
+from typing import Callable, Dict, List, Tuple
+from src.config import PROJECT_ROOT
+
+# "import time:  self [us] | cumulative | imported package" lines from -X importtime
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+def lazy_exports(package: str, exports: Dict[str, str]) -> Tuple[Callable, Callable]:
+    """__getattr__ and __dir__ for a package that imports its exports on first access
+
+    exports maps each public name to the submodule (relative, e.g.
+    ".retriever") that defines it, so `from package import Name` only
+    imports that submodule and its dependencies.
+    """
+    module = sys.modules[package]
+
+    def __getattr__(name: str):
+        if name not in exports:
+            raise AttributeError(f"module '{package}' has no attribute '{name}'")
+        value = getattr(importlib.import_module(exports[name], package), name)
+        # Cache on the package so later lookups skip __getattr__
+        setattr(module, name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(module.__dict__) | set(exports))
+
+    return __getattr__, __dir__
+
+
+def profile_imports(statement: str, python: str = sys.executable) -> List[Dict]:
+    """Import-time breakdown of running statement in a fresh interpreter
+
+    Returns one record per module in import order, with its own import
+    time ("self_ms"), the time including its dependencies ("cumulative_ms")
+    and its nesting depth. Raises RuntimeError if the statement fails.
+    """
+    import subprocess
+    result = subprocess.run(
+        [python, "-X", "importtime", "-c", statement],
+        capture_output=True, text=True, cwd=PROJECT_ROOT
+    )
+    records, errors = [], []
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            records.append({
+                "module": module,
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cumulative_us) / 1000,
+                "depth": (len(indent) - 1) // 2
+            })
+        elif not line.startswith("import time:"):
+            errors.append(line)
+    if result.returncode != 0:
+        raise RuntimeError(f"'{statement}' failed:\n" + "\n".join(errors))
+    return records
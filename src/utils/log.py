@@ -0,0 +1,21 @@
+"""Console logging for CardIQ progress messages"""
+import logging
+from src.config import LOG_LEVEL
+
+# Modules log to "src.<module>" loggers, all under this one
+ROOT_LOGGER = "src"
+
+
+def configure_logging(level: str = LOG_LEVEL):
+    """Print CardIQ progress messages at level and above (e.g. "INFO", "WARNING")
+
+    Called by entry points; library code only logs. Third-party loggers are
+    left alone, and calling this again just changes the level.
+    """
+    logger = logging.getLogger(ROOT_LOGGER)
+    logger.setLevel(level.upper() if isinstance(level, str) else level)
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.propagate = False
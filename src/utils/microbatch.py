@@ -0,0 +1,125 @@
+"""Cross-request micro-batching of concurrent calls"""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional
+from src.config import MICROBATCH_WINDOW_MS, MICROBATCH_MAX_SIZE
+
+
+class MicroBatchStats:
+    """Batch size and queueing delay counters for one batcher"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.items = 0
+        self.max_batch_size = 0
+        self.total_queue_delay = 0.0
+        self.max_queue_delay = 0.0
+
+    def record(self, batch_size: int, queue_delays: List[float]):
+        with self._lock:
+            self.batches += 1
+            self.items += batch_size
+            self.max_batch_size = max(self.max_batch_size, batch_size)
+            self.total_queue_delay += sum(queue_delays)
+            self.max_queue_delay = max(self.max_queue_delay, max(queue_delays))
+
+    def snapshot(self) -> Dict[str, float]:
+        """Current counters, with means, as a plain dict"""
+        with self._lock:
+            return {
+                'batches': self.batches,
+                'items': self.items,
+                'mean_batch_size': round(self.items / self.batches, 2) if self.batches else 0.0,
+                'max_batch_size': self.max_batch_size,
+                'mean_queue_delay_ms': round(self.total_queue_delay / self.items * 1000, 3) if self.items else 0.0,
+                'max_queue_delay_ms': round(self.max_queue_delay * 1000, 3)
+            }
+
+
+class MicroBatcher:
+    """Collects concurrent calls for a short window and runs them as one batch
+
+    Callers submit single items and block on a Future. A worker thread takes
+    the first waiting item, keeps collecting until window_ms has passed or
+    max_batch_size items are queued, then calls batch_fn(items) once.
+    batch_fn must return one result per item, in order; a result that is an
+    exception is raised to that item's caller only. The worker exits after
+    idle_timeout seconds without work and is restarted by the next submit.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[Any]], List[Any]],
+        window_ms: float = MICROBATCH_WINDOW_MS,
+        max_batch_size: int = MICROBATCH_MAX_SIZE,
+        name: str = "microbatch",
+        idle_timeout: float = 30.0
+    ):
+        self.batch_fn = batch_fn
+        self.window = window_ms / 1000.0
+        self.max_batch_size = max(1, max_batch_size)
+        self.name = name
+        self.idle_timeout = idle_timeout
+        self.stats = MicroBatchStats()
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+
+    def submit(self, item: Any) -> Future:
+        """Queue an item; the Future resolves to its result"""
+        future = Future()
+        with self._thread_lock:
+            self._queue.put((item, future, time.perf_counter()))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._work, name=self.name, daemon=True)
+                self._thread.start()
+        return future
+
+    def run(self, item: Any, timeout: Optional[float] = None) -> Any:
+        """Submit an item and wait for its result"""
+        return self.submit(item).result(timeout)
+
+    def _work(self):
+        while True:
+            try:
+                first = self._queue.get(timeout=self.idle_timeout)
+            except queue.Empty:
+                # Exit only if nothing was queued while we decided to stop
+                with self._thread_lock:
+                    if self._queue.empty():
+                        self._thread = None
+                        return
+                continue
+
+            batch = [first]
+            deadline = time.perf_counter() + self.window
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._run_batch(batch)
+
+    def _run_batch(self, batch):
+        started = time.perf_counter()
+        self.stats.record(len(batch), [started - queued_at for _, _, queued_at in batch])
+
+        futures = [future for _, future, _ in batch]
+        try:
+            results = self.batch_fn([item for item, _, _ in batch])
+        except BaseException as e:
+            for future in futures:
+                future.set_exception(e)
+            return
+
+        for future, result in zip(futures, results):
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
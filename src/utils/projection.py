@@ -0,0 +1,119 @@
+"""Closed-form projection of cumulative card value and ranking objectives"""
+from typing import Sequence, Tuple
+import numpy as np
+from src.config import (
+    PROJECTION_HORIZON_YEARS,
+    PROJECTION_DISCOUNT_RATE,
+    RANKING_OBJECTIVE,
+    RANKING_BLEND_WEIGHTS
+)
+
+RANKING_OBJECTIVES = ("blended", "horizon", "annualized", "year_N")
+# Years always projected, so net_value_year_1..3 are filled whatever the horizon
+REPORTED_YEARS = 3
+
+
+class ValueProjection:
+    """Cumulative net value of cards over any horizon, in one vectorized pass
+
+    Every year earns rewards + credits - annual fee. Year 1 also earns the
+    signup bonus and gets the fee back when it is waived. Year t is
+    discounted by (1 + discount_rate) ** (t - 1), so the cumulative value
+    after t years is recurring * A[t] + one_time, where A is the cumulative
+    discount factor (A[t] = t without discounting).
+
+    The ranking objective is a weight vector w over the cumulative values
+    of years 1..horizon. Because the projection is linear, the score
+    sum(w[t] * value[t]) is recurring * (w . A) + one_time * sum(w), so all
+    (profile, card) pairs are scored without materializing per-year values.
+    """
+
+    def __init__(
+        self,
+        horizon_years: int = PROJECTION_HORIZON_YEARS,
+        discount_rate: float = PROJECTION_DISCOUNT_RATE,
+        objective: str = RANKING_OBJECTIVE,
+        blend_weights: Sequence[float] = RANKING_BLEND_WEIGHTS
+    ):
+        if horizon_years < 1:
+            raise ValueError(f"Projection horizon must be at least 1 year, got {horizon_years}")
+        if discount_rate <= -1:
+            raise ValueError(f"Discount rate must be above -1, got {discount_rate}")
+        self.horizon_years = horizon_years
+        self.discount_rate = discount_rate
+        self.objective = objective
+        self.blend_weights = tuple(float(w) for w in blend_weights)
+        self.weights = self._objective_weights()
+
+        years = max(horizon_years, REPORTED_YEARS)
+        self.cumulative_discount = np.cumsum((1.0 + discount_rate) ** -np.arange(years, dtype=np.float64))
+        self._recurring_weight = float(self.weights @ self.cumulative_discount[:horizon_years])
+        self._one_time_weight = float(self.weights.sum())
+
+    @property
+    def years(self) -> int:
+        """Number of years project() returns"""
+        return len(self.cumulative_discount)
+
+    def _objective_weights(self) -> np.ndarray:
+        """Weights over cumulative values of years 1..horizon for the objective"""
+        weights = np.zeros(self.horizon_years)
+        if self.objective == "blended":
+            if len(self.blend_weights) > self.horizon_years:
+                raise ValueError(
+                    f"{len(self.blend_weights)} blend weights for a {self.horizon_years}-year horizon"
+                )
+            weights[:len(self.blend_weights)] = self.blend_weights
+        elif self.objective == "horizon":
+            weights[-1] = 1.0
+        elif self.objective == "annualized":
+            weights[-1] = 1.0 / self.horizon_years
+        elif self.objective.startswith("year_") and self.objective[5:].isdigit():
+            year = int(self.objective[5:])
+            if not 1 <= year <= self.horizon_years:
+                raise ValueError(f"Objective '{self.objective}' is outside the {self.horizon_years}-year horizon")
+            weights[year - 1] = 1.0
+        else:
+            raise ValueError(f"Unknown ranking objective '{self.objective}', expected one of {RANKING_OBJECTIVES}")
+        return weights
+
+    @staticmethod
+    def components(
+        annual_rewards,
+        signup_bonus_value,
+        annual_fee,
+        annual_credits_value,
+        first_year_fee_waived=0.0
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """(recurring yearly value, one-time year 1 value), element-wise"""
+        recurring = annual_rewards + annual_credits_value - annual_fee
+        one_time = signup_bonus_value + annual_fee * first_year_fee_waived
+        return recurring, one_time
+
+    def project(
+        self,
+        annual_rewards,
+        signup_bonus_value,
+        annual_fee,
+        annual_credits_value,
+        first_year_fee_waived=0.0
+    ) -> np.ndarray:
+        """Cumulative net value after each year, shape (..., years)"""
+        recurring, one_time = self.components(
+            annual_rewards, signup_bonus_value, annual_fee, annual_credits_value, first_year_fee_waived
+        )
+        return np.multiply.outer(recurring, self.cumulative_discount) + np.asarray(one_time)[..., None]
+
+    def score(
+        self,
+        annual_rewards,
+        signup_bonus_value,
+        annual_fee,
+        annual_credits_value,
+        first_year_fee_waived=0.0
+    ) -> np.ndarray:
+        """Ranking score under the objective, element-wise"""
+        recurring, one_time = self.components(
+            annual_rewards, signup_bonus_value, annual_fee, annual_credits_value, first_year_fee_waived
+        )
+        return recurring * self._recurring_weight + one_time * self._one_time_weight
@@ -0,0 +1,34 @@
+"""Token-bucket rate limiter for outbound API calls"""
+import threading
+import time
+
+
+class RateLimiter:
+    """Allows at most per_minute acquisitions a minute, in bursts of up to burst
+
+    Thread-safe; acquire() blocks until a token is available. Callers
+    sleep outside the lock, so waiting threads don't block each other's
+    bookkeeping.
+    """
+
+    def __init__(self, per_minute: float, burst: int = 1):
+        if per_minute <= 0:
+            raise ValueError(f"Rate must be positive, got {per_minute} per minute")
+        self.rate = per_minute / 60.0
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take one token, waiting as long as needed"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
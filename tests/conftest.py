@@ -0,0 +1,62 @@
+"""Shared pytest setup: make the project root importable as in scripts/"""
+import sys
+from pathlib import Path
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.api.stub_client import StubClaudeClient  # noqa: E402
+from src.benchmarks import build_vector_db, hashing_embedder, scaled_catalog  # noqa: E402
+
+
+class HangingClient(StubClaudeClient):
+    """Stub that takes its full latency whatever timeout it is given, like a stuck API call"""
+
+    def call(self, model, system_prompt, user_message, max_tokens, temperature=None, timeout=None):
+        return super().call(model, system_prompt, user_message, max_tokens, temperature)
+
+
+@pytest.fixture(scope="session")
+def small_catalog():
+    return scaled_catalog(30)
+
+
+@pytest.fixture(scope="session")
+def small_retriever(tmp_path_factory, small_catalog):
+    """Warm retriever over small_catalog, embedded offline"""
+    from src.rag.retriever import CardRetriever
+    embedder = hashing_embedder()
+    path = build_vector_db(list(small_catalog), tmp_path_factory.mktemp("vector_db"), embedder)
+    retriever = CardRetriever(vector_db_path=path, catalog=small_catalog, embedder=embedder, batch_window_ms=0)
+    retriever.warm_up(background=False)
+    return retriever
+
+
+@pytest.fixture
+def make_orchestrator(tmp_path, small_catalog, small_retriever):
+    """Orchestrator factory on a stub client, no cache, empty narrative store"""
+    from src.agents.narrative_store import NarrativeStore
+    from src.agents.orchestrator import Orchestrator
+
+    def make(latency: float = 0.0, client=None, cache=None, hang: bool = False):
+        """hang=True ignores call timeouts, so every LLM stage outlives its budget"""
+        orchestrator = Orchestrator(
+            claude_client=client or (HangingClient if hang else StubClaudeClient)(latency=latency),
+            warm_up=False,
+            catalog=small_catalog,
+            retriever=small_retriever,
+            batch_window_ms=0
+        )
+        orchestrator.cache = cache
+        orchestrator.recommendation_synthesizer._narrative_store = NarrativeStore(tmp_path / "narratives.db")
+        return orchestrator
+    return make
+
+
+@pytest.fixture
+def profile():
+    from src.models.user_input import UserProfile
+    return UserProfile(
+        monthly_spending={"dining": 500, "groceries": 400, "travel": 300, "gas": 100, "streaming": 30, "other": 600},
+        credit_score="excellent"
+    )
@@ -0,0 +1,51 @@
+"""Streaming card parsing matches json.load"""
+import json
+import pytest
+from src.data.card_loader import CardLoader, iter_json_records
+from src.data.synthetic_catalog import write_synthetic_catalog
+from src.config import CARDS_JSON_PATH
+
+# Strings with JSON structure characters, escapes and non-ASCII text
+TRICKY_RECORDS = [
+    {"card_id": "a", "text": "brackets ] [ and braces } {", "nested": [[1, 2], {"x": []}]},
+    {"card_id": "b", "text": "quote \" backslash \\ comma , colon :", "value": -1.5e3},
+    {"card_id": "c", "text": "café ✈️ 中文", "flag": None, "ok": True},
+]
+
+
+@pytest.mark.parametrize("buffer_chars", [1, 7, 64, 1 << 20])
+def test_streaming_matches_json_load_for_real_catalog(buffer_chars):
+    with open(CARDS_JSON_PATH, 'r', encoding='utf-8') as f:
+        expected = json.load(f)
+    assert list(iter_json_records(CARDS_JSON_PATH, buffer_chars=buffer_chars)) == expected
+
+
+@pytest.mark.parametrize("buffer_chars", [1, 5, 32])
+def test_streaming_matches_json_load_for_tricky_records(tmp_path, buffer_chars):
+    path = tmp_path / "cards.json"
+    path.write_text("  \n[ " + " ,\n\t".join(json.dumps(r, ensure_ascii=False) for r in TRICKY_RECORDS) + " ]\n",
+                    encoding='utf-8')
+    assert list(iter_json_records(path, buffer_chars=buffer_chars)) == json.loads(path.read_text(encoding='utf-8'))
+
+
+def test_streaming_synthetic_array_and_ndjson_agree(tmp_path):
+    array_path = write_synthetic_catalog(tmp_path / "cards.json", 200, seed=3)
+    ndjson_path = write_synthetic_catalog(tmp_path / "cards.ndjson", 200, seed=3)
+    with open(array_path, 'r', encoding='utf-8') as f:
+        expected = json.load(f)
+    assert list(iter_json_records(array_path, buffer_chars=100)) == expected
+    assert list(CardLoader(ndjson_path).iter_cards()) == expected
+
+
+def test_empty_array(tmp_path):
+    path = tmp_path / "cards.json"
+    path.write_text("[\n]\n", encoding='utf-8')
+    assert list(iter_json_records(path, buffer_chars=1)) == []
+
+
+@pytest.mark.parametrize("content", ['{"card_id": "a"}', '[{"card_id": "a"}, {"card_id": ', '[{"card_id": "a"},'])
+def test_malformed_input_raises_value_error(tmp_path, content):
+    path = tmp_path / "cards.json"
+    path.write_text(content, encoding='utf-8')
+    with pytest.raises(ValueError):
+        list(iter_json_records(path, buffer_chars=4))
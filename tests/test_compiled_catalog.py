@@ -0,0 +1,109 @@
+"""Compiled catalogs: chunked compilation, format checks and the card cache"""
+import json
+import numpy as np
+import pytest
+from src.data.catalog import CardCatalog
+from src.data.compiled_catalog import (
+    FORMAT_VERSION,
+    MANIFEST_FILE,
+    CompiledCardCatalog,
+    compile_catalog,
+    is_compiled_catalog_fresh
+)
+from src.data.synthetic_catalog import generate_cards, write_synthetic_catalog
+
+
+def _artifacts(directory):
+    """Every compiled file's bytes, except the manifest (it has a timestamp)"""
+    return {
+        path.name: path.read_bytes()
+        for path in sorted(directory.iterdir())
+        if path.name != MANIFEST_FILE
+    }
+
+
+def _manifest(directory):
+    with open(directory / MANIFEST_FILE, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    manifest.pop('compiled_at')
+    return manifest
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64])
+def test_chunked_compile_is_byte_identical_to_full_compile(tmp_path, chunk_size):
+    cards = list(generate_cards(150, seed=1))
+    full = compile_catalog(cards, tmp_path / "full", chunk_size=len(cards))
+    chunked = compile_catalog(iter(cards), tmp_path / "chunked", chunk_size=chunk_size)
+
+    assert _artifacts(chunked) == _artifacts(full)
+    assert _manifest(chunked) == _manifest(full)
+
+
+def test_compiled_catalog_matches_in_memory_catalog(tmp_path):
+    cards = list(generate_cards(80, seed=2))
+    compiled = CompiledCardCatalog(compile_catalog(iter(cards), tmp_path / "compiled", chunk_size=9))
+    in_memory = CardCatalog(cards)
+
+    assert list(compiled) == cards
+    assert compiled.columns.rewards_types == in_memory.columns.rewards_types
+    np.testing.assert_array_equal(compiled.columns.rewards_type_code, in_memory.columns.rewards_type_code)
+    np.testing.assert_array_equal(compiled.columns.reward_rates, in_memory.columns.reward_rates)
+    np.testing.assert_array_equal(compiled.columns.first_year_fee_waived, in_memory.columns.first_year_fee_waived)
+
+
+def test_invalid_card_leaves_existing_catalog_untouched(tmp_path):
+    output = compile_catalog(generate_cards(20, seed=4), tmp_path / "compiled", chunk_size=5)
+    before = _artifacts(output)
+
+    cards = list(generate_cards(20, seed=5))
+    del cards[13]['annual_fee']
+    with pytest.raises(ValueError):
+        compile_catalog(iter(cards), output, chunk_size=5)
+    assert _artifacts(output) == before
+
+
+def test_empty_input_writes_empty_catalog(tmp_path):
+    catalog = CompiledCardCatalog(compile_catalog(iter([]), tmp_path / "compiled", chunk_size=4))
+    assert len(catalog) == 0
+    assert catalog.columns.reward_rates.shape[0] == 0
+
+
+def test_older_format_is_stale_and_refused(tmp_path):
+    source = write_synthetic_catalog(tmp_path / "cards.json", 10)
+    output = compile_catalog(generate_cards(10), tmp_path / "compiled", source_path=source)
+    assert is_compiled_catalog_fresh(output, source)
+
+    manifest_path = output / MANIFEST_FILE
+    manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+    manifest['format_version'] = FORMAT_VERSION - 1
+    manifest_path.write_text(json.dumps(manifest), encoding='utf-8')
+
+    assert not is_compiled_catalog_fresh(output, source)
+    with pytest.raises(ValueError):
+        CompiledCardCatalog(output)
+
+
+def test_card_cache_is_bounded_lru(tmp_path):
+    cards = list(generate_cards(50, seed=6))
+    catalog = CompiledCardCatalog(compile_catalog(cards, tmp_path / "compiled"), card_cache_size=3)
+
+    for row in (0, 1, 2):
+        assert catalog.card_at(row) == cards[row]
+    assert catalog.card_at(0) is catalog.card_at(0)
+    catalog.card_at(3)
+    # Row 1 was least recently used
+    assert list(catalog._card_cache) == [2, 0, 3]
+    assert catalog.get(cards[10]['card_id']) == cards[10]
+    assert len(catalog._card_cache) == 3
+
+
+def test_full_iteration_does_not_fill_card_cache(tmp_path):
+    cards = list(generate_cards(50, seed=7))
+    catalog = CompiledCardCatalog(compile_catalog(cards, tmp_path / "compiled"), card_cache_size=10)
+    cached = catalog.card_at(5)
+
+    assert list(catalog) == cards
+    assert list(catalog.cards) == cards
+    assert list(catalog._card_cache) == [5]
+    # Cached cards are still served from the cache during iteration
+    assert list(catalog)[5] is cached
@@ -0,0 +1,97 @@
+"""Request deadlines, timeouts and templated fallbacks"""
+import time
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+import pytest
+from src.api.stub_client import StubClaudeClient
+from src.utils.deadline import Deadline, run_with_timeout
+
+
+class UnparseableClient(StubClaudeClient):
+    """Stub whose every answer is prose instead of JSON"""
+
+    def call(self, model, system_prompt, user_message, max_tokens, temperature=None, timeout=None):
+        super().call(model, system_prompt, user_message, max_tokens, temperature, timeout)
+        return "Sorry, I can't produce JSON right now."
+
+
+def test_deadline_budgets():
+    unbounded = Deadline(None)
+    assert unbounded.remaining() is None
+    assert unbounded.stage_budget(0.5) is None
+    assert not unbounded.expired
+
+    deadline = Deadline(1.0)
+    assert deadline.stage_budget(0.4) == pytest.approx(0.4)
+    # A stage never gets more than what is left
+    deadline.expires_at = time.monotonic() + 0.1
+    assert deadline.stage_budget(0.4) <= 0.1
+
+    expired = Deadline(0.0)
+    assert expired.expired
+    assert expired.remaining() == 0.0
+
+
+def test_run_with_timeout():
+    assert run_with_timeout(lambda: "inline", None) == "inline"
+    assert run_with_timeout(lambda: "fast", 1.0) == "fast"
+    started = time.monotonic()
+    with pytest.raises(FuturesTimeoutError):
+        run_with_timeout(lambda: time.sleep(1.0), 0.1)
+    assert time.monotonic() - started < 0.5
+    with pytest.raises(ZeroDivisionError):
+        run_with_timeout(lambda: 1 / 0, 1.0)
+
+
+def test_no_budget_is_not_degraded(make_orchestrator, profile):
+    output = make_orchestrator(latency=0.05).process(profile, budget=0)
+    assert not output.degraded
+    assert output.degraded_reasons == []
+    assert all(rec.degraded_reason is None for rec in output.recommendations)
+
+
+def test_slow_llm_falls_back_within_budget(make_orchestrator, profile):
+    orchestrator = make_orchestrator(latency=1.0, hang=True)
+    started = time.monotonic()
+    output = orchestrator.process(profile, budget=0.3)
+    assert time.monotonic() - started < 0.5
+
+    assert output.degraded
+    assert "Spending analysis timed out, used local summary" in output.degraded_reasons
+    assert len(output.recommendations) == 3
+    for rec in output.recommendations:
+        assert rec.degraded_reason == f"{rec.card_name}: narrative timed out"
+        assert rec.degraded_reason in output.degraded_reasons
+    # Templates still carry the user's real numbers, in rank order
+    assert [rec.rank for rec in output.recommendations] == [1, 2, 3]
+    assert all(rec.financial_summary for rec in output.recommendations)
+
+
+def test_unparseable_output_falls_back(make_orchestrator, profile):
+    orchestrator = make_orchestrator(client=UnparseableClient())
+    output = orchestrator.process(profile, budget=0)
+
+    assert output.degraded
+    assert output.degraded_reasons[0] == "Spending analysis unavailable (ValueError), used local summary"
+    for rec in output.recommendations:
+        assert rec.degraded_reason == f"{rec.card_name}: narrative unavailable (ValueError)"
+
+
+def test_stream_marks_degraded_on_complete(make_orchestrator, profile):
+    events = list(make_orchestrator(latency=1.0, hang=True).stream(profile, budget=0.3))
+    names = [event for event, _ in events]
+    assert names[0] == "preliminary" and names[-1] == "complete"
+    assert names.count("recommendation") == 3
+    complete = events[-1][1]
+    assert complete.degraded
+    assert {rec.card_id for _, rec in events[1:-1]} == {rec.card_id for rec in complete.recommendations}
+
+
+def test_template_output_makes_no_llm_calls(make_orchestrator, profile):
+    client = StubClaudeClient()
+    orchestrator = make_orchestrator(client=client)
+    output = orchestrator._template_output(profile, orchestrator.snapshot(), Deadline(1.0), reason="test reason")
+
+    assert client.calls == {}
+    assert output.degraded
+    assert [rec.degraded_reason for rec in output.recommendations] == ["test reason"] * 3
+    assert "total" in output.timings
@@ -0,0 +1,131 @@
+"""Eligibility masks and signup bonus reachability"""
+import copy
+import numpy as np
+import pytest
+from src.agents.card_evaluator import CardEvaluatorAgent
+from src.config import SIGNUP_BONUS_DEFAULT_TIMEFRAME_MONTHS
+from src.data.catalog import CardCatalog
+from src.models.user_input import UserProfile
+from src.utils.eligibility import ProfileConstraints, eligible_cards
+
+BASE_CARD = {
+    "card_id": "base",
+    "card_name": "Base Card",
+    "issuer": "Test Bank",
+    "annual_fee": 0,
+    "signup_bonus": {"amount": 200, "currency": "cash", "spend_requirement": 500,
+                     "timeframe_months": 3, "estimated_value": 200.0},
+    "rewards": {"dining": 1.0, "groceries": 1.0, "travel": 1.0, "gas": 1.0,
+                "streaming": 1.0, "other": 1.0},
+    "rewards_type": "cash_back",
+    "point_value": 0.01,
+    "eligibility": {"credit_tier": "fair", "min_credit_score": 580},
+    "annual_credits": [],
+    "description": "Test card.",
+    "best_for": [],
+    "foreign_transaction_fee": 0.0,
+    "special_features": [],
+    "first_year_fee_waived": False,
+}
+
+
+def make_card(card_id, **overrides):
+    card = copy.deepcopy(BASE_CARD)
+    card["card_id"] = card_id
+    card["card_name"] = f"Card {card_id}"
+    for key, value in overrides.items():
+        if isinstance(value, dict):
+            card[key].update(value)
+        else:
+            card[key] = value
+    return card
+
+
+def make_profile(monthly_total=1000.0, **fields):
+    spending = {"dining": 0, "groceries": 0, "travel": 0, "gas": 0, "streaming": 0, "other": monthly_total}
+    return UserProfile(monthly_spending=spending, **{"credit_score": "excellent", **fields})
+
+
+@pytest.fixture
+def catalog():
+    return CardCatalog([
+        make_card("fair_card", eligibility={"min_credit_score": 580}),
+        make_card("fair_edge", eligibility={"min_credit_score": 669}),
+        make_card("good_card", eligibility={"min_credit_score": 670}),
+        make_card("excellent_card", eligibility={"min_credit_score": 740}),
+        make_card("no_score", eligibility={"min_credit_score": None}),
+        make_card("fee_card", annual_fee=95, eligibility={"min_credit_score": 580}),
+        make_card("travel_card", rewards_type="Travel", foreign_transaction_fee=3.0),
+        make_card("no_timeframe", signup_bonus={"spend_requirement": 3000, "timeframe_months": None}),
+        make_card("long_timeframe", signup_bonus={"spend_requirement": 3000, "timeframe_months": 6}),
+    ])
+
+
+def _eligible_ids(catalog, profile):
+    mask = ProfileConstraints([profile], catalog.columns.rewards_types).eligible(catalog.columns)
+    return {card_id for card_id, ok in zip(catalog.card_ids, mask[0]) if ok}
+
+
+def test_fair_tier_includes_boundary_and_excludes_higher_tiers(catalog):
+    ids = _eligible_ids(catalog, make_profile(credit_score="fair"))
+    assert {"fair_card", "fair_edge", "no_score"} <= ids
+    assert not {"good_card", "excellent_card"} & ids
+
+    # The list filter agrees with the vectorized mask
+    assert {c["card_id"] for c in eligible_cards(list(catalog), "fair")} == {
+        c for c in catalog.card_ids if c not in ("good_card", "excellent_card")
+    }
+
+
+def test_fee_cap_rewards_type_and_foreign_fees(catalog):
+    assert "fee_card" not in _eligible_ids(catalog, make_profile(max_annual_fee=0))
+    assert "fee_card" in _eligible_ids(catalog, make_profile(max_annual_fee=95))
+
+    # Rewards types compare case-insensitively
+    assert _eligible_ids(catalog, make_profile(preferred_rewards_type="travel")) == {"travel_card"}
+    assert "travel_card" not in _eligible_ids(catalog, make_profile(planning_to_travel=True))
+
+
+def test_unknown_rewards_type_gives_empty_result(catalog):
+    profile = make_profile(preferred_rewards_type="airline_miles")
+    assert _eligible_ids(catalog, profile) == set()
+
+    evaluations = CardEvaluatorAgent(catalog=catalog, batch_window_ms=0).evaluate_many([profile])
+    assert evaluations[0].top_cards == []
+
+
+def test_missing_timeframe_uses_default(catalog):
+    columns = catalog.columns
+    no_timeframe = catalog.row_of("no_timeframe")
+    long_timeframe = catalog.row_of("long_timeframe")
+    assert columns.timeframe_months[no_timeframe] == 0
+
+    # $3000 over the default 3 months needs $1000/month; 6 months needs $500/month
+    assert SIGNUP_BONUS_DEFAULT_TIMEFRAME_MONTHS == 3
+    profiles = [make_profile(999.0), make_profile(1000.0), make_profile(500.0)]
+    reachable = ProfileConstraints(profiles, columns.rewards_types).bonus_reachable(columns, enabled=True)
+    np.testing.assert_array_equal(reachable[:, no_timeframe], [False, True, False])
+    np.testing.assert_array_equal(reachable[:, long_timeframe], [True, True, True])
+
+
+def test_unreachable_bonus_is_dropped_from_value(catalog):
+    profile = make_profile(100.0)
+    reachable = CardEvaluatorAgent(catalog=catalog, batch_window_ms=0, bonus_reachability=True)
+    ignored = CardEvaluatorAgent(catalog=catalog, batch_window_ms=0, bonus_reachability=False)
+    with_check = {e.card_id: e for e in reachable.evaluate_many([profile], top_k=len(catalog))[0].top_cards}
+    without = {e.card_id: e for e in ignored.evaluate_many([profile], top_k=len(catalog))[0].top_cards}
+
+    assert not with_check["no_timeframe"].signup_bonus_reachable
+    assert with_check["no_timeframe"].signup_bonus_value == 0
+    assert without["no_timeframe"].signup_bonus_reachable
+    assert without["no_timeframe"].signup_bonus_value == 200.0
+
+
+def test_reachability_disabled_is_all_true(catalog):
+    constraints = ProfileConstraints([make_profile(0.0)], catalog.columns.rewards_types)
+    assert constraints.bonus_reachable(catalog.columns, enabled=False).all()
+
+
+def test_unknown_credit_tier_raises():
+    with pytest.raises(ValueError):
+        eligible_cards([BASE_CARD], "platinum")
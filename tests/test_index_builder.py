@@ -0,0 +1,60 @@
+"""Parallel vector DB builds match in-process builds byte for byte"""
+import json
+from functools import partial
+import pytest
+from src.benchmarks import hashing_embedder, scaled_cards
+from src.rag.hot_reload import MANIFEST_FILE
+from src.rag.index_builder import VectorDBBuilder
+
+DIMENSION = 64
+
+
+def _artifacts(directory):
+    """Every built file's bytes, except the manifest (it has a timestamp)"""
+    return {
+        path.name: path.read_bytes()
+        for path in sorted(directory.iterdir())
+        if path.is_file() and path.name != MANIFEST_FILE
+    }
+
+
+@pytest.fixture(scope="module")
+def cards():
+    return list(scaled_cards(60))
+
+
+def test_parallel_build_is_byte_identical_to_in_process(tmp_path, cards):
+    in_process = VectorDBBuilder(tmp_path / "serial", workers=0, batch_size=8,
+                                 embedder=hashing_embedder(DIMENSION))
+    parallel = VectorDBBuilder(tmp_path / "parallel", workers=2, batch_size=8,
+                               embedder_factory=partial(hashing_embedder, DIMENSION))
+    serial_stats = in_process.build(iter(cards))
+    parallel_stats = parallel.build(iter(cards))
+
+    assert parallel_stats["workers"] == 2
+    assert serial_stats["num_chunks"] == parallel_stats["num_chunks"] == len(cards)
+    assert _artifacts(tmp_path / "parallel") == _artifacts(tmp_path / "serial")
+    assert json.loads((tmp_path / "parallel" / MANIFEST_FILE).read_text())["num_chunks"] == len(cards)
+
+
+def test_batch_size_does_not_change_output(tmp_path, cards):
+    for name, batch_size in (("one_batch", len(cards)), ("small_batches", 7)):
+        VectorDBBuilder(tmp_path / name, workers=0, batch_size=batch_size,
+                        embedder=hashing_embedder(DIMENSION)).build(iter(cards))
+    assert _artifacts(tmp_path / "small_batches") == _artifacts(tmp_path / "one_batch")
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_empty_input_raises_and_leaves_no_manifest(tmp_path, workers):
+    builder = VectorDBBuilder(tmp_path / "db", workers=workers, batch_size=4,
+                              embedder=hashing_embedder(DIMENSION),
+                              embedder_factory=partial(hashing_embedder, DIMENSION))
+    with pytest.raises(ValueError, match="No cards to index"):
+        builder.build(iter([]))
+    assert not (tmp_path / "db" / MANIFEST_FILE).exists()
+
+
+@pytest.mark.parametrize("kwargs", [{"batch_size": 0}, {"workers": -1}])
+def test_invalid_settings_raise(tmp_path, kwargs):
+    with pytest.raises(ValueError):
+        VectorDBBuilder(tmp_path / "db", **kwargs)
@@ -0,0 +1,133 @@
+"""Micro-batching: batched calls match separate calls, errors stay per caller"""
+import threading
+import time
+import pytest
+from src.agents.card_evaluator import CardEvaluatorAgent
+from src.agents.spending_analyzer import SpendingAnalyzerAgent
+from src.data.catalog import CardCatalog
+from src.models.user_input import UserProfile
+from src.utils.microbatch import MicroBatcher
+
+
+def _call_together(fn, items):
+    """Call fn(item) for all items from separate threads at once; results (or exceptions) in item order"""
+    items = list(items)
+    results = [None] * len(items)
+    start = threading.Barrier(len(items))
+
+    def run(i, item):
+        start.wait()
+        try:
+            results[i] = fn(item)
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=run, args=(i, item)) for i, item in enumerate(items)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def _runner(batcher):
+    return lambda item: batcher.run(item, timeout=5)
+
+
+def test_concurrent_calls_run_as_one_batch():
+    calls = []
+
+    def square_all(items):
+        calls.append(list(items))
+        return [item * item for item in items]
+
+    batcher = MicroBatcher(square_all, window_ms=100, max_batch_size=64)
+    assert _call_together(_runner(batcher), list(range(8))) == [i * i for i in range(8)]
+    assert len(calls) == 1 and sorted(calls[0]) == list(range(8))
+    stats = batcher.stats.snapshot()
+    assert (stats["batches"], stats["items"], stats["max_batch_size"]) == (1, 8, 8)
+
+
+def test_max_batch_size_splits_batches():
+    batcher = MicroBatcher(lambda items: list(items), window_ms=100, max_batch_size=3)
+    assert _call_together(_runner(batcher), list(range(7))) == list(range(7))
+    assert batcher.stats.snapshot()["max_batch_size"] <= 3
+    assert batcher.stats.snapshot()["batches"] >= 3
+
+
+def test_exception_result_reaches_only_its_caller():
+    def checked(items):
+        return [ValueError(item) if item < 0 else item for item in items]
+
+    results = _call_together(_runner(MicroBatcher(checked, window_ms=100)), [1, -2, 3])
+    assert results[0] == 1 and results[2] == 3
+    assert isinstance(results[1], ValueError)
+
+
+def test_batch_fn_failure_reaches_every_caller():
+    def broken(items):
+        raise RuntimeError("batch failed")
+
+    results = _call_together(_runner(MicroBatcher(broken, window_ms=100)), [1, 2])
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+def test_worker_restarts_after_idle_exit():
+    batcher = MicroBatcher(lambda items: list(items), window_ms=1, idle_timeout=0.05)
+    assert batcher.run("first", timeout=5) == "first"
+    time.sleep(0.2)
+    assert batcher._thread is None
+    assert batcher.run("second", timeout=5) == "second"
+
+
+def _profiles():
+    amounts = [(200, 100, 900, 40, 15, 300), (800, 600, 50, 200, 30, 1200), (100, 100, 100, 100, 100, 100)]
+    categories = ("dining", "groceries", "travel", "gas", "streaming", "other")
+    return [
+        UserProfile(monthly_spending=dict(zip(categories, spend)), credit_score=tier, max_annual_fee=fee)
+        for spend, tier, fee in zip(amounts, ("excellent", "good", "fair"), (None, 95, 0))
+    ]
+
+
+def _as_dicts(record):
+    return [{field: getattr(e, field) for field in e.FIELDS} for e in record.top_cards]
+
+
+def test_batched_evaluations_match_separate_calls(small_catalog):
+    profiles = _profiles() * 3
+    analyzer = SpendingAnalyzerAgent()
+    summaries = [analyzer.summarize(p) for p in profiles]
+    separate = CardEvaluatorAgent(catalog=small_catalog, batch_window_ms=0)
+    batched = CardEvaluatorAgent(catalog=small_catalog, batch_window_ms=100)
+
+    expected = [separate.process(s, p) for s, p in zip(summaries, profiles)]
+    results = _call_together(lambda i: batched.process(summaries[i], profiles[i]), range(len(profiles)))
+
+    assert batched.batch_stats["batches"] == 1
+    for result, single in zip(results, expected):
+        assert result.total_cards_evaluated == single.total_cards_evaluated
+        assert _as_dicts(result) == [pytest.approx(d) for d in _as_dicts(single)]
+
+
+class _BrokenCatalog(CardCatalog):
+    @property
+    def columns(self):
+        raise RuntimeError("catalog unavailable")
+
+
+def test_failing_catalog_group_only_fails_its_callers(small_catalog):
+    broken = _BrokenCatalog(list(small_catalog))
+    evaluator = CardEvaluatorAgent(catalog=small_catalog, batch_window_ms=100)
+    profiles = _profiles()
+    items = [(profiles[0], small_catalog), (profiles[1], broken), (profiles[2], small_catalog), (profiles[0], broken)]
+
+    analyzer = SpendingAnalyzerAgent()
+    results = _call_together(
+        lambda item: evaluator.process(analyzer.summarize(item[0]), item[0], catalog=item[1]), items
+    )
+    assert evaluator.batch_stats["batches"] == 1
+    assert isinstance(results[1], RuntimeError) and isinstance(results[3], RuntimeError)
+    assert not isinstance(results[0], Exception) and not isinstance(results[2], Exception)
+    assert _as_dicts(results[0]) == [
+        pytest.approx(d) for d in _as_dicts(evaluator.evaluate_many([profiles[0]], catalog=small_catalog)[0])
+    ]
@@ -0,0 +1,75 @@
+"""Closed-form projection matches the per-year net value loop"""
+import numpy as np
+import pytest
+from src.utils.calculations import calculate_net_value
+from src.utils.projection import ValueProjection
+
+
+@pytest.fixture
+def components():
+    rng = np.random.default_rng(0)
+    shape = (40, 25)
+    return {
+        'annual_rewards': rng.uniform(0, 3000, shape),
+        'signup_bonus_value': rng.choice([0.0, 200.0, 750.0, 1500.0], shape),
+        'annual_fee': rng.choice([0.0, 95.0, 250.0, 695.0], shape),
+        'annual_credits_value': rng.choice([0.0, 100.0, 300.0], shape),
+    }
+
+
+def _loop_values(components, years):
+    """Cumulative values the way the evaluator used to compute them, year by year"""
+    return np.stack([calculate_net_value(**components, year=year) for year in range(1, years + 1)], axis=-1)
+
+
+@pytest.mark.parametrize("horizon_years", [1, 3, 5, 10])
+def test_project_matches_loop_without_discounting(components, horizon_years):
+    projection = ValueProjection(horizon_years=horizon_years, discount_rate=0.0, objective="horizon")
+    np.testing.assert_allclose(projection.project(**components), _loop_values(components, projection.years))
+
+
+def test_blended_score_matches_old_weights(components):
+    projection = ValueProjection(horizon_years=3, discount_rate=0.0, objective="blended",
+                                 blend_weights=(0.3, 0.4, 0.3))
+    values = _loop_values(components, 3)
+    expected = 0.3 * values[..., 0] + 0.4 * values[..., 1] + 0.3 * values[..., 2]
+    np.testing.assert_allclose(projection.score(**components), expected)
+
+
+@pytest.mark.parametrize("objective,year_weights", [
+    ("horizon", lambda v: v[..., 4]),
+    ("annualized", lambda v: v[..., 4] / 5),
+    ("year_2", lambda v: v[..., 1]),
+])
+def test_other_objectives_match_loop(components, objective, year_weights):
+    projection = ValueProjection(horizon_years=5, discount_rate=0.0, objective=objective)
+    np.testing.assert_allclose(projection.score(**components), year_weights(_loop_values(components, 5)))
+
+
+def test_score_equals_weighted_projection_with_discounting(components):
+    projection = ValueProjection(horizon_years=4, discount_rate=0.07, objective="blended",
+                                 blend_weights=(0.1, 0.2, 0.3, 0.4))
+    waived = np.ones_like(components['annual_fee'])
+    values = projection.project(**components, first_year_fee_waived=waived)
+    expected = values[..., :4] @ projection.weights
+    np.testing.assert_allclose(projection.score(**components, first_year_fee_waived=waived), expected)
+
+
+def test_waived_first_year_fee_refunds_year_one_only():
+    projection = ValueProjection(horizon_years=3, discount_rate=0.0, objective="horizon")
+    charged = projection.project(1000.0, 0.0, 95.0, 0.0, 0.0)
+    waived = projection.project(1000.0, 0.0, 95.0, 0.0, 1.0)
+    np.testing.assert_allclose(waived - charged, [95.0, 95.0, 95.0])
+    np.testing.assert_allclose(charged, [905.0, 1810.0, 2715.0])
+
+
+@pytest.mark.parametrize("kwargs", [
+    {'horizon_years': 0},
+    {'discount_rate': -1.0},
+    {'objective': 'lifetime'},
+    {'objective': 'year_4', 'horizon_years': 3},
+    {'objective': 'blended', 'horizon_years': 2, 'blend_weights': (0.3, 0.4, 0.3)},
+])
+def test_invalid_configuration_raises(kwargs):
+    with pytest.raises(ValueError):
+        ValueProjection(**kwargs)
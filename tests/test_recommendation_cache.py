@@ -0,0 +1,111 @@
+"""Recommendation cache: bucket hits, re-pricing and differed lookups"""
+import copy
+import pytest
+from src.agents.recommendation_cache import RecommendationCache
+from src.agents.recommendation_synthesizer import build_financial_summary, build_long_term_projection
+from src.models.agent_outputs import RecommendationOutput
+from src.models.user_input import UserProfile
+
+
+def _profile(**spending):
+    base = {"dining": 520, "groceries": 420, "travel": 320, "gas": 110, "streaming": 30, "other": 620}
+    return UserProfile(monthly_spending={**base, **spending}, credit_score="excellent")
+
+
+# Same spending buckets as _profile(), different amounts
+SAME_BUCKET = {"dining": 560, "groceries": 440, "travel": 340, "gas": 120, "streaming": 35, "other": 700}
+
+
+@pytest.fixture
+def cache():
+    return RecommendationCache(max_entries=10, ttl=60)
+
+
+def _evaluate(orchestrator, user_profile):
+    spending_summary = orchestrator.spending_analyzer.summarize(user_profile)
+    evaluations = orchestrator.card_evaluator.process(spending_summary, user_profile)
+    return spending_summary, evaluations
+
+
+def test_bucket_hit_reprices_financial_summary(make_orchestrator, cache):
+    orchestrator = make_orchestrator(cache=cache)
+    first, second = _profile(), _profile(**SAME_BUCKET)
+    assert cache.key_for(first) == cache.key_for(second)
+
+    orchestrator.process(first, budget=0)
+    calls = dict(orchestrator.spending_analyzer.claude_client.calls)
+    output = orchestrator.process(second, budget=0)
+
+    assert cache.stats()["hits"] == 1
+    # No LLM call for the second user
+    assert orchestrator.spending_analyzer.claude_client.calls == calls
+
+    _, evaluations = _evaluate(orchestrator, second)
+    for recommendation, evaluation in zip(output.recommendations, evaluations.top_cards):
+        assert recommendation.card_id == evaluation.card_id
+        assert recommendation.financial_summary == build_financial_summary(evaluation)
+        assert recommendation.long_term_projection == build_long_term_projection(evaluation)
+
+
+def test_different_top_cards_count_as_differed(make_orchestrator, cache):
+    orchestrator = make_orchestrator()
+    user_profile = _profile()
+    spending_summary, evaluations = _evaluate(orchestrator, user_profile)
+    key = cache.key_for(user_profile)
+    output = orchestrator.recommendation_synthesizer.finalize(
+        [orchestrator.recommendation_synthesizer.template_recommendation(
+            rank, spending_summary, evaluation, orchestrator.catalog.get(evaluation.card_id), reason="test"
+        ) for rank, evaluation in enumerate(evaluations.top_cards[:3], 1)],
+        spending_summary
+    )
+    cache.store(key, output, spending_summary, evaluations)
+    assert cache.lookup(key, evaluations, spending_summary) is not None
+
+    reordered = copy.copy(evaluations)
+    reordered.top_cards = [evaluations.top_cards[1], evaluations.top_cards[0]] + evaluations.top_cards[2:]
+    assert cache.lookup(key, reordered, spending_summary) is None
+
+    unreachable = copy.copy(evaluations)
+    unreachable.top_cards = [copy.copy(e) for e in evaluations.top_cards]
+    unreachable.top_cards[0].signup_bonus_reachable = not evaluations.top_cards[0].signup_bonus_reachable
+    assert cache.lookup(key, unreachable, spending_summary) is None
+
+    other_categories = spending_summary.model_copy(update={"top_categories": ["gas"]})
+    assert cache.lookup(key, evaluations, other_categories) is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["differed"], stats["misses"]) == (1, 3, 0)
+    assert stats["differed_rate"] == 0.75
+
+
+def test_expired_entry_is_a_miss(make_orchestrator, cache):
+    orchestrator = make_orchestrator(cache=cache)
+    user_profile = _profile()
+    orchestrator.process(user_profile, budget=0)
+    key = cache.key_for(user_profile, version=orchestrator.snapshot().version)
+    cache._entries[key].created_at -= cache.ttl + 1
+
+    spending_summary, evaluations = _evaluate(orchestrator, user_profile)
+    assert cache.lookup(key, evaluations, spending_summary) is None
+    assert cache.stats()["misses"] == 2 and cache.stats()["entries"] == 0
+
+
+def test_degraded_output_is_not_stored(make_orchestrator, cache):
+    orchestrator = make_orchestrator(latency=1.0, cache=cache, hang=True)
+    output = orchestrator.process(_profile(), budget=0.3)
+    assert output.degraded
+    assert cache.stats()["entries"] == 0
+
+
+def test_lru_eviction(make_orchestrator):
+    orchestrator = make_orchestrator()
+    cache = RecommendationCache(max_entries=2, ttl=60)
+    profiles = [_profile(other=amount) for amount in (100, 1000, 4000)]
+    keys = [cache.key_for(p) for p in profiles]
+    assert len(set(keys)) == 3
+
+    for user_profile, key in zip(profiles, keys):
+        spending_summary, evaluations = _evaluate(orchestrator, user_profile)
+        cache.store(key, RecommendationOutput(recommendations=[], portfolio_strategy=""),
+                    spending_summary, evaluations)
+    assert list(cache._entries) == keys[1:]
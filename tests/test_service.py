@@ -0,0 +1,93 @@
+"""HTTP service: request parsing, error mapping and latency metrics"""
+import json
+import socket
+import threading
+import time
+import pytest
+from src.service.app import RecommendationService, create_server
+
+
+@pytest.fixture
+def service(make_orchestrator):
+    return RecommendationService(make_orchestrator(), max_concurrency=2, queue_timeout=1.0)
+
+
+@pytest.fixture
+def server(service):
+    server = create_server(service, host="127.0.0.1", port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _raw_request(server, request: bytes) -> bytes:
+    """Send raw bytes and read until the server closes the connection"""
+    with socket.create_connection(server.server_address, timeout=5) as sock:
+        sock.sendall(request)
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                return b"".join(chunks)
+            chunks.append(chunk)
+
+
+@pytest.mark.parametrize("content_length", [b"abc", b"-1", b"1.5"])
+def test_invalid_content_length_gets_400(server, content_length):
+    response = _raw_request(
+        server, b"POST /evaluate HTTP/1.1\r\nHost: x\r\nContent-Length: " + content_length + b"\r\n\r\n{}"
+    )
+    status_line, _, rest = response.partition(b"\r\n")
+    assert status_line.split()[1] == b"400"
+    assert json.loads(rest.split(b"\r\n\r\n", 1)[1]) == {"error": "Invalid Content-Length header"}
+
+
+def test_oversized_body_gets_413(server):
+    response = _raw_request(server, b"POST /evaluate HTTP/1.1\r\nHost: x\r\nContent-Length: 99999999\r\n\r\n")
+    assert response.split()[1] == b"413"
+
+
+def test_get_route_errors_become_json_500(service):
+    def broken_snapshot():
+        raise RuntimeError("snapshot failed")
+
+    service.orchestrator.snapshot = broken_snapshot
+    status, payload = service.handle("GET", "/readyz", b"")
+    assert status == 500
+    assert payload == {"error": "RuntimeError: snapshot failed"}
+
+
+def test_post_errors_map_to_statuses(service):
+    assert service.handle("POST", "/evaluate", b"")[0] == 400
+    status, payload = service.handle("POST", "/evaluate", b'{"credit_score": "perfect"}')
+    assert status == 400 and payload["error"] == "Invalid request"
+    assert service.handle("GET", "/nowhere", b"")[0] == 404
+    assert service.in_flight == 0
+
+
+def test_stream_latency_is_observed_at_first_event(service, profile):
+    from src.service.app import HTTP_REQUEST_SECONDS
+    real_stream = service.orchestrator.stream
+
+    def slow_stream(user_profile, budget=None):
+        time.sleep(0.2)
+        yield from real_stream(user_profile, budget)
+
+    service.orchestrator.stream = slow_stream
+    before = HTTP_REQUEST_SECONDS.snapshot(route="/recommend/stream")
+    status, events = service.handle("POST", "/recommend/stream", profile.model_dump_json().encode())
+    assert status == 200
+    assert HTTP_REQUEST_SECONDS.snapshot(route="/recommend/stream")["count"] == before["count"]
+
+    event, _ = next(events)
+    after = HTTP_REQUEST_SECONDS.snapshot(route="/recommend/stream")
+    assert event == "preliminary"
+    assert after["count"] == before["count"] + 1
+    assert after["sum"] - before["sum"] >= 0.2
+
+    # Later events and closing the stream don't observe again
+    assert [event for event, _ in events][-1] == "complete"
+    assert HTTP_REQUEST_SECONDS.snapshot(route="/recommend/stream")["count"] == after["count"]
+    assert service.in_flight == 0
@@ -0,0 +1,141 @@
+"""Single-flight coalescing of requests and LLM calls"""
+import threading
+import time
+import types
+import httpx
+import pytest
+from anthropic import APITimeoutError
+from src.api.claude_client import ClaudeClient
+from src.utils.single_flight import SingleFlight
+
+
+def _run_concurrently(*calls, stagger: float = 0.05):
+    """Start each (name, fn) in its own thread, stagger seconds apart; name -> result or exception"""
+    results = {}
+
+    def run(name, fn):
+        try:
+            results[name] = fn()
+        except Exception as e:
+            results[name] = e
+
+    threads = []
+    for name, fn in calls:
+        thread = threading.Thread(target=run, args=(name, fn))
+        thread.start()
+        threads.append(thread)
+        time.sleep(stagger)
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_waiters_share_result_and_exception():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def slow():
+        release.wait(5)
+        return "value"
+
+    threading.Timer(0.2, release.set).start()
+    results = _run_concurrently(("a", lambda: flight.do("k", slow)), ("b", lambda: flight.do("k", slow)))
+    assert results == {"a": "value", "b": "value"}
+    assert flight.stats()["executions"] == 1 and flight.stats()["coalesced"] == 1
+
+    def fail():
+        time.sleep(0.2)
+        raise RuntimeError("boom")
+
+    results = _run_concurrently(("a", lambda: flight.do("k", fail)), ("b", lambda: flight.do("k", fail)))
+    assert all(isinstance(e, RuntimeError) for e in results.values())
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_waiter_stops_at_its_own_timeout():
+    flight = SingleFlight()
+    results = _run_concurrently(
+        ("leader", lambda: flight.do("k", lambda: time.sleep(0.5) or "done")),
+        ("waiter", lambda: flight.do("k", lambda: "unused", timeout=0.05))
+    )
+    assert results["leader"] == "done"
+    assert isinstance(results["waiter"], TimeoutError)
+
+
+def test_requests_with_different_budgets_do_not_share_a_degraded_run(make_orchestrator, profile):
+    orchestrator = make_orchestrator(latency=1.0, hang=True)
+    results = _run_concurrently(
+        ("leader", lambda: orchestrator.process(profile, budget=0.3)),
+        ("no_deadline", lambda: orchestrator.process(profile, budget=0))
+    )
+    assert results["leader"].degraded
+    assert not results["no_deadline"].degraded
+    assert orchestrator.single_flight_stats()["requests"]["coalesced"] == 0
+
+
+def test_coalesced_requests_get_independent_copies(make_orchestrator, profile):
+    orchestrator = make_orchestrator(latency=0.2)
+    results = _run_concurrently(
+        ("leader", lambda: orchestrator.process(profile, budget=0)),
+        ("waiter", lambda: orchestrator.process(profile, budget=0))
+    )
+    leader, waiter = results["leader"], results["waiter"]
+    assert orchestrator.single_flight_stats()["requests"]["coalesced"] == 1
+    assert leader is not waiter
+    assert leader.model_dump(exclude={"timings"}) == waiter.model_dump(exclude={"timings"})
+    # The waiter ran no stages itself: its timings are its own wait
+    assert set(waiter.timings) == {"total"}
+
+    waiter.recommendations[0].card_name = "changed"
+    assert leader.recommendations[0].card_name != "changed"
+
+
+class _FakeMessages:
+    """messages.create that times out when given less than call_seconds"""
+
+    def __init__(self, call_seconds: float):
+        self.call_seconds = call_seconds
+        self.timeouts = []
+
+    def create(self, timeout=None, **kwargs):
+        self.timeouts.append(timeout)
+        if timeout is not None and timeout < self.call_seconds:
+            time.sleep(timeout)
+            raise APITimeoutError(request=httpx.Request("POST", "https://api.anthropic.com/v1/messages"))
+        time.sleep(self.call_seconds)
+        return types.SimpleNamespace(content=[types.SimpleNamespace(text="ok")], usage=None)
+
+
+@pytest.fixture
+def fake_client():
+    client = ClaudeClient(api_key="test")
+    client.client = types.SimpleNamespace(messages=_FakeMessages(call_seconds=0.3))
+    return client
+
+
+def test_leader_timeout_is_not_shared_with_longer_waiter(fake_client):
+    call = fake_client.call
+    results = _run_concurrently(
+        ("short", lambda: call("model", "system", "user", 10, timeout=0.1)),
+        ("long", lambda: call("model", "system", "user", 10, timeout=2.0)),
+        stagger=0.02
+    )
+    assert isinstance(results["short"], APITimeoutError)
+    assert results["long"] == "ok"
+    # The waiter retried with what was left of its own timeout
+    assert len(fake_client.client.messages.timeouts) == 2
+    assert fake_client.client.messages.timeouts[1] < 2.0
+
+
+def test_shorter_waiter_gives_up_at_its_own_timeout(fake_client):
+    call = fake_client.call
+    started = time.monotonic()
+    results = _run_concurrently(
+        ("long", lambda: call("model", "system", "user", 10, timeout=2.0)),
+        ("short", lambda: call("model", "system", "user", 10, timeout=0.05)),
+        stagger=0.02
+    )
+    assert results["long"] == "ok"
+    assert isinstance(results["short"], TimeoutError)
+    assert fake_client.client.messages.timeouts == [2.0]
+    assert time.monotonic() - started < 1.0